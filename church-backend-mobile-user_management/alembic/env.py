@@ -16,19 +16,19 @@ from pathlib import Path
 # Add the project root to the path
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
-from app.database import Base
-from app.models import User, UserManagement, Role, Sermon, Series, Devotional, ExistingSeries  # Import all models
+from app.config import settings
+from app.database import Base, sync_database_url
+from app.models import User, UserManagement, Role, Sermon, Series, Devotional, ExistingSeries, TokenEpoch, RefreshToken, OTPCode  # Import all models
+from app.models.types import GUID
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
 
-# Optionally override sqlalchemy.url from environment variable or .env file
-# This allows using the same DATABASE_URL as the application
-# Uncomment the following lines if you want to use .env file for database URL:
-# from app.config import settings
-# if settings.database_url:
-#     config.set_main_option("sqlalchemy.url", settings.database_url)
+# Migrate the database the application uses (DATABASE_URL from the environment
+# or .env), through the blocking driver for the same backend.
+# "%" is escaped for the ini-file interpolation.
+config.set_main_option("sqlalchemy.url", sync_database_url(settings.database_url).replace("%", "%%"))
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
@@ -45,6 +45,31 @@ target_metadata = Base.metadata
 # ... etc.
 
 
+def render_item(type_, obj, autogen_context):
+    """Render app column types in autogenerated migrations with their import."""
+    if type_ == "type" and isinstance(obj, GUID):
+        autogen_context.imports.add("from app.models.types import GUID")
+        return "GUID()"
+    return False
+
+
+def configure_options(dialect_name: str) -> dict:
+    """context.configure() options shared by offline and online runs.
+
+    Each migration commits on its own, so helpers in app.utils.migrations can
+    step outside the transaction (CREATE INDEX CONCURRENTLY, batched
+    backfills). SQLite cannot ALTER most things in place: autogenerate emits
+    batch operations (copy-and-move) there.
+    """
+    return {
+        "target_metadata": target_metadata,
+        "compare_type": True,
+        "render_item": render_item,
+        "render_as_batch": dialect_name == "sqlite",
+        "transaction_per_migration": True,
+    }
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -60,9 +85,9 @@ def run_migrations_offline() -> None:
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
         url=url,
-        target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        **configure_options(url.split(":", 1)[0].split("+")[0]),
     )
 
     with context.begin_transaction():
@@ -83,8 +108,13 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
+        if connection.dialect.name == "postgresql":
+            # Session-wide: DDL waiting on a busy table fails fast (retry the
+            # deploy later) instead of blocking all traffic queued behind it
+            connection.exec_driver_sql(f"SET lock_timeout = {settings.migration_lock_timeout_ms}")
+            connection.commit()
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, **configure_options(connection.dialect.name)
         )
 
         with context.begin_transaction():
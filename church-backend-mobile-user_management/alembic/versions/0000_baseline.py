@@ -0,0 +1,236 @@
+"""baseline
+
+The schema as ``Base.metadata.create_all`` built it before migrations were
+introduced (VARCHAR(36) IDs), so that ``alembic upgrade head`` can build a
+database from nothing. Tables that already exist are left alone: databases
+created by create_all can run ``alembic upgrade head`` directly (see
+MIGRATIONS.md).
+
+Revision ID: 0000
+Revises:
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0000"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Several tables share the PostgreSQL type: it is created once, up front
+USER_ROLE = postgresql.ENUM(
+    "SUPERADMIN", "ADMIN", "PASTOR_STAFF", "TEACHING_TEAM", "COMMUNICATIONS_TEAM", "SMALL_GROUP_LEADER",
+    name="userrole",
+    create_type=False,
+)
+
+# In dependency order; downgrade drops them in reverse
+TABLES = [
+    "users", "role", "user_management", "sermons", "series", "series_sermons", "devotionals",
+    "existing_series", "token_epochs", "refresh_tokens", "otp_codes",
+]
+
+
+def _create_users() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("first_name", sa.String(255), nullable=False),
+        sa.Column("last_name", sa.String(255), nullable=False),
+        sa.Column("hashed_password", sa.String(255), nullable=False),
+        sa.Column("role", USER_ROLE, nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("is_verified", sa.Boolean(), nullable=True),
+        sa.Column("otp_code", sa.String(6), nullable=True),
+        sa.Column("otp_expires_at", sa.DateTime(), nullable=True),
+        sa.Column("created_by_id", sa.String(36), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_index("ix_users_role", "users", ["role"])
+
+
+def _create_role() -> None:
+    op.create_table(
+        "role",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("role", USER_ROLE, nullable=False),
+        sa.Column("permissions", sa.Text(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+    )
+    op.create_index("ix_role_id", "role", ["id"])
+    op.create_index("ix_role_role", "role", ["role"], unique=True)
+
+
+def _create_user_management() -> None:
+    op.create_table(
+        "user_management",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("first_name", sa.String(255), nullable=False),
+        sa.Column("last_name", sa.String(255), nullable=False),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("hashed_password", sa.String(255), nullable=True),
+        sa.Column("role", USER_ROLE, nullable=False),
+        sa.Column("role_id", sa.String(36), sa.ForeignKey("role.id"), nullable=True),
+        sa.Column("permissions", sa.Text(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+    )
+    op.create_index("ix_user_management_id", "user_management", ["id"])
+    op.create_index("ix_user_management_email", "user_management", ["email"], unique=True)
+    op.create_index("ix_user_management_role", "user_management", ["role"])
+    op.create_index("ix_user_management_role_id", "user_management", ["role_id"])
+
+
+def _create_sermons() -> None:
+    op.create_table(
+        "sermons",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("time", sa.Time(), nullable=True),
+        sa.Column("speaker", sa.String(255), nullable=False),
+        sa.Column("passage", sa.String(255), nullable=False),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("created_by_id", sa.String(36), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_sermons_id", "sermons", ["id"])
+    op.create_index("ix_sermons_date", "sermons", ["date"])
+
+
+def _create_series() -> None:
+    op.create_table(
+        "series",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("from_date", sa.Date(), nullable=False),
+        sa.Column("to_date", sa.Date(), nullable=False),
+        sa.Column("passage", sa.String(255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("created_by_id", sa.String(36), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_series_id", "series", ["id"])
+    op.create_index("ix_series_from_date", "series", ["from_date"])
+    op.create_index("ix_series_to_date", "series", ["to_date"])
+
+
+def _create_series_sermons() -> None:
+    op.create_table(
+        "series_sermons",
+        sa.Column("series_id", sa.String(36), sa.ForeignKey("series.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("sermon_id", sa.String(36), sa.ForeignKey("sermons.id", ondelete="CASCADE"), primary_key=True),
+    )
+
+
+def _create_devotionals() -> None:
+    op.create_table(
+        "devotionals",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("passage", sa.String(255), nullable=False),
+        sa.Column("leader", sa.String(255), nullable=False),
+        sa.Column("sermon_id", sa.String(36), sa.ForeignKey("sermons.id"), nullable=True),
+        sa.Column("created_by_id", sa.String(36), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_devotionals_id", "devotionals", ["id"])
+    op.create_index("ix_devotionals_date", "devotionals", ["date"])
+
+
+def _create_existing_series() -> None:
+    op.create_table(
+        "existing_series",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("sermon_id", sa.String(36), sa.ForeignKey("sermons.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("series_id", sa.String(36), sa.ForeignKey("series.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("created_by_id", sa.String(36), sa.ForeignKey("users.id"), nullable=True),
+        sa.UniqueConstraint("sermon_id", "series_id", name="uq_existing_series_sermon_series"),
+    )
+    op.create_index("ix_existing_series_id", "existing_series", ["id"])
+    op.create_index("ix_existing_series_sermon_id", "existing_series", ["sermon_id"])
+    op.create_index("ix_existing_series_series_id", "existing_series", ["series_id"])
+
+
+def _create_token_epochs() -> None:
+    op.create_table(
+        "token_epochs",
+        sa.Column("user_id", sa.String(36), primary_key=True),
+        sa.Column("epoch", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+
+
+def _create_refresh_tokens() -> None:
+    op.create_table(
+        "refresh_tokens",
+        sa.Column("token_hash", sa.String(64), primary_key=True),
+        sa.Column("family_id", sa.String(36), nullable=False),
+        sa.Column("user_id", sa.String(36), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.Column("used_at", sa.DateTime(), nullable=True),
+        sa.Column("revoked_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_refresh_tokens_family_id", "refresh_tokens", ["family_id"])
+    op.create_index("ix_refresh_tokens_user_id", "refresh_tokens", ["user_id"])
+    op.create_index("ix_refresh_tokens_expires_at", "refresh_tokens", ["expires_at"])
+
+
+def _create_otp_codes() -> None:
+    op.create_table(
+        "otp_codes",
+        sa.Column("email", sa.String(255), primary_key=True),
+        sa.Column("code_hash", sa.String(64), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_otp_codes_expires_at", "otp_codes", ["expires_at"])
+
+
+CREATE = {
+    "users": _create_users,
+    "role": _create_role,
+    "user_management": _create_user_management,
+    "sermons": _create_sermons,
+    "series": _create_series,
+    "series_sermons": _create_series_sermons,
+    "devotionals": _create_devotionals,
+    "existing_series": _create_existing_series,
+    "token_epochs": _create_token_epochs,
+    "refresh_tokens": _create_refresh_tokens,
+    "otp_codes": _create_otp_codes,
+}
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        USER_ROLE.create(op.get_bind(), checkfirst=True)
+    existing = set() if op.get_context().as_sql else set(sa.inspect(op.get_bind()).get_table_names())
+    for table in TABLES:
+        if table not in existing:
+            CREATE[table]()
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.drop_table(table)
+    if op.get_bind().dialect.name == "postgresql":
+        USER_ROLE.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,130 @@
+"""native uuid keys
+
+Store every ID column as a native UUID (PostgreSQL ``uuid``) or a 16-byte BLOB
+(SQLite) instead of VARCHAR(36), matching app.models.types.GUID. Existing
+values are converted in place; rows keep their IDs, new rows get UUIDv7 keys.
+
+Revision ID: 0001
+Revises: 0000
+Create Date: 2026-10-16 00:00:00
+
+"""
+import uuid
+from typing import Dict, List, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = "0000"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+UUID_COLUMNS: Dict[str, List[str]] = {
+    "users": ["id", "created_by_id"],
+    "role": ["id"],
+    "user_management": ["id", "role_id"],
+    "sermons": ["id", "created_by_id"],
+    "series": ["id", "created_by_id"],
+    "series_sermons": ["series_id", "sermon_id"],
+    "devotionals": ["id", "sermon_id", "created_by_id"],
+    "existing_series": ["id", "sermon_id", "series_id", "created_by_id"],
+    "token_epochs": ["user_id"],
+    "refresh_tokens": ["family_id", "user_id"],
+}
+
+
+def _present_columns() -> Dict[str, List[str]]:
+    """UUID_COLUMNS limited to the tables and columns this database has."""
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    present = {}
+    for table, columns in UUID_COLUMNS.items():
+        if table in tables:
+            existing = {column["name"] for column in inspector.get_columns(table)}
+            present[table] = [column for column in columns if column in existing]
+    return present
+
+
+def _foreign_keys(columns: Dict[str, List[str]]) -> List[tuple]:
+    """(table, foreign key) pairs touching the converted columns."""
+    inspector = sa.inspect(op.get_bind())
+    found = []
+    for table, names in columns.items():
+        for fk in inspector.get_foreign_keys(table):
+            if set(fk["constrained_columns"]) & set(names):
+                found.append((table, fk))
+    return found
+
+
+def _alter_postgresql(columns: Dict[str, List[str]], type_, using: str) -> None:
+    # Foreign keys cannot span the type change: drop them, convert, re-create
+    foreign_keys = _foreign_keys(columns)
+    for table, fk in foreign_keys:
+        op.drop_constraint(fk["name"], table, type_="foreignkey")
+    for table, names in columns.items():
+        for name in names:
+            op.alter_column(table, name, type_=type_, postgresql_using=using.format(column=name))
+    for table, fk in foreign_keys:
+        op.create_foreign_key(
+            fk["name"], table, fk["referred_table"], fk["constrained_columns"], fk["referred_columns"],
+            ondelete=fk.get("options", {}).get("ondelete"),
+        )
+
+
+def _to_blob(value):
+    if isinstance(value, (bytes, bytearray)) and len(value) == 16:
+        return bytes(value)
+    if isinstance(value, (bytes, bytearray)):
+        value = value.decode("ascii")
+    return uuid.UUID(value).bytes
+
+
+def _to_text(value):
+    if isinstance(value, (bytes, bytearray)) and len(value) == 16:
+        return str(uuid.UUID(bytes=bytes(value)))
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode("ascii")
+    return value
+
+
+def _alter_sqlite(columns: Dict[str, List[str]], type_, existing_type, convert) -> None:
+    """Rewrite the stored values, then rebuild each table with the new column types.
+
+    Values are converted first: SQLite keeps a BLOB as a BLOB (and text as text)
+    whatever the column's declared type, so the CAST the rebuild applies leaves
+    already-converted values untouched.
+    """
+    bind = op.get_bind()
+    for table, names in columns.items():
+        for name in names:
+            values = bind.execute(
+                sa.text(f'SELECT DISTINCT "{name}" FROM "{table}" WHERE "{name}" IS NOT NULL')
+            ).scalars().all()
+            updates = [{"old": value, "new": convert(value)} for value in values]
+            if updates:
+                bind.execute(sa.text(f'UPDATE "{table}" SET "{name}" = :new WHERE "{name}" = :old'), updates)
+
+        with op.batch_alter_table(table, recreate="always") as batch:
+            for name in names:
+                batch.alter_column(name, type_=type_, existing_type=existing_type)
+
+
+def upgrade() -> None:
+    columns = _present_columns()
+    if op.get_bind().dialect.name == "postgresql":
+        _alter_postgresql(columns, postgresql.UUID(as_uuid=True), "{column}::uuid")
+    else:
+        _alter_sqlite(columns, sa.LargeBinary(16), sa.String(36), _to_blob)
+
+
+def downgrade() -> None:
+    columns = _present_columns()
+    if op.get_bind().dialect.name == "postgresql":
+        _alter_postgresql(columns, sa.String(36), "{column}::text")
+    else:
+        _alter_sqlite(columns, sa.String(36), sa.LargeBinary(16), _to_text)
@@ -0,0 +1,54 @@
+"""access path indexes
+
+Indexes for the predicates the API actually runs:
+
+- foreign keys that were unindexed: devotionals.sermon_id,
+  sermons.created_by_id, series.created_by_id
+- series_sermons (sermon_id, series_id): the primary key leads with
+  series_id, so lookups by sermon had to scan the table
+- user_management (role, email): listing by role, ordered by email
+- users (role, created_at): admin listings, newest first
+
+Check the resulting plans with tests/test_query_plans.py. On PostgreSQL the
+indexes are built CONCURRENTLY, without blocking writes to the tables.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.migrations import create_index, drop_index
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, columns)
+INDEXES = [
+    ("ix_devotionals_sermon_id", "devotionals", ["sermon_id"]),
+    ("ix_sermons_created_by_id", "sermons", ["created_by_id"]),
+    ("ix_series_created_by_id", "series", ["created_by_id"]),
+    ("ix_series_sermons_sermon_id_series_id", "series_sermons", ["sermon_id", "series_id"]),
+    ("ix_user_management_role_email", "user_management", ["role", "email"]),
+    ("ix_users_role_created_at", "users", ["role", "created_at"]),
+]
+
+
+def upgrade() -> None:
+    # Databases built with create_all from current models already have them
+    for name, table, columns in INDEXES:
+        create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        drop_index(name, table)
@@ -0,0 +1,55 @@
+"""keyset pagination indexes
+
+List endpoints page on (sort column, id) with a row-value comparison such as
+``(date, id) < (:date, :id)``. Extending each sort index with the id lets the
+database seek to the cursor and read the page straight off the index, with no
+sort step for the id tie-breaker (built CONCURRENTLY on PostgreSQL):
+
+- sermons (date) -> (date, id)
+- devotionals (date) -> (date, id)
+- series (from_date) -> (from_date, id)
+- users (role, created_at) -> (role, created_at, id)
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.migrations import create_index, drop_index
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (old index, new index, table, old columns, new columns)
+INDEXES = [
+    ("ix_sermons_date", "ix_sermons_date_id", "sermons", ["date"], ["date", "id"]),
+    ("ix_devotionals_date", "ix_devotionals_date_id", "devotionals", ["date"], ["date", "id"]),
+    ("ix_series_from_date", "ix_series_from_date_id", "series", ["from_date"], ["from_date", "id"]),
+    (
+        "ix_users_role_created_at", "ix_users_role_created_at_id", "users",
+        ["role", "created_at"], ["role", "created_at", "id"],
+    ),
+]
+
+
+def upgrade() -> None:
+    # Create the replacement first so the listing is never left unindexed
+    for old, new, table, _, columns in INDEXES:
+        create_index(new, table, columns)
+        drop_index(old, table)
+
+
+def downgrade() -> None:
+    for old, new, table, columns, _ in reversed(INDEXES):
+        create_index(old, table, columns)
+        drop_index(new, table)
@@ -0,0 +1,54 @@
+"""counters
+
+Materialized row counts for the /count endpoints (app.utils.counters), seeded
+from the current tables. The application keeps them up to date and a periodic
+job reconciles them with count(*).
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16 00:00:00
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# counter name -> count query
+SEED = {
+    "sermons": "SELECT count(*) FROM sermons",
+    "series": "SELECT count(*) FROM series",
+    "devotionals": "SELECT count(*) FROM devotionals",
+    "admins": "SELECT count(*) FROM users WHERE role = 'ADMIN'",
+}
+
+
+def upgrade() -> None:
+    counters = op.create_table(
+        "counters",
+        sa.Column("name", sa.String(64), primary_key=True),
+        sa.Column("value", sa.BigInteger(), nullable=False),
+        sa.Column("reconciled_at", sa.DateTime(), nullable=True),
+    )
+    bind = op.get_bind()
+    now = datetime.utcnow()
+    op.bulk_insert(
+        counters,
+        [
+            {"name": name, "value": bind.execute(sa.text(query)).scalar(), "reconciled_at": now}
+            for name, query in SEED.items()
+        ],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("counters")
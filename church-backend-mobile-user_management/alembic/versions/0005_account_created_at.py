@@ -0,0 +1,40 @@
+"""account created_at
+
+The login email filter (app/auth/email_filter.py) picks up new accounts with
+``created_at > :last_seen`` instead of re-reading every email:
+
+- user_management gets a ``created_at`` column (nullable: existing rows have
+  no creation time, and are loaded by the filter's full build anyway)
+- both tables get an index on ``created_at`` (built CONCURRENTLY on PostgreSQL)
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.migrations import create_index, drop_index
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("user_management", sa.Column("created_at", sa.DateTime(), nullable=True))
+    create_index("ix_user_management_created_at", "user_management", ["created_at"])
+    create_index("ix_users_created_at", "users", ["created_at"])
+
+
+def downgrade() -> None:
+    drop_index("ix_users_created_at", "users")
+    drop_index("ix_user_management_created_at", "user_management")
+    with op.batch_alter_table("user_management") as batch:
+        batch.drop_column("created_at")
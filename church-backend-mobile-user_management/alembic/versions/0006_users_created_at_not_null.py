@@ -0,0 +1,43 @@
+"""users.created_at not null
+
+Admin listings page on ``(created_at, id)`` (app.utils.pagination). A NULL
+``created_at`` never satisfies the keyset condition, so such rows dropped out
+of every page after the first. The application has always set the column;
+rows that still lack it take their ``updated_at`` (or the Unix epoch, sorting
+them last), then the column becomes NOT NULL.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-16 00:00:00
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.migrations import backfill
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    backfill(
+        "users",
+        "created_at = COALESCE(updated_at, :epoch)",
+        "created_at IS NULL",
+        params={"epoch": datetime(1970, 1, 1)},
+    )
+    with op.batch_alter_table("users") as batch:
+        batch.alter_column("created_at", existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("users") as batch:
+        batch.alter_column("created_at", existing_type=sa.DateTime(), nullable=True)
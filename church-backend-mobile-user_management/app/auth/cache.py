@@ -0,0 +1,99 @@
+"""
+Principal Cache
+
+Bounded in-process cache of authenticated principals keyed by token ``sub``.
+Entries expire after a TTL and the least recently used entry is evicted when
+the cache is full. Negative lookups (unknown or inactive subjects) are cached
+too, so a stream of requests with a stale token does not hit the database.
+
+Only column values are cached, never live ORM objects. On a hit the snapshot is
+re-attached to the request's session without a query, so routes can still
+modify and commit ``current_user`` as before.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from ..config import settings
+
+
+def snapshot_principal(principal) -> Tuple[type, Dict[str, Any]]:
+    """Capture the model class and column values of a User/UserManagement row."""
+    model = type(principal)
+    values = {attr.key: getattr(principal, attr.key) for attr in inspect(model).column_attrs}
+    return model, values
+
+
+async def attach_principal(db: AsyncSession, model: type, values: Dict[str, Any]):
+    """Rebuild a persistent instance from column values without querying the database."""
+    principal = model(**values)
+    make_transient_to_detached(principal)
+    return await db.merge(principal, load=False)
+
+
+class PrincipalCache:
+    """TTL + LRU cache of principal snapshots keyed by user ID."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Optional[Tuple[type, Dict[str, Any]]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    async def get(self, db: AsyncSession, key: str):
+        """Look up a principal.
+
+        Returns ``(hit, principal)``. On a hit ``principal`` is attached to ``db``,
+        or is None for a cached negative lookup.
+        """
+        if not self.enabled:
+            return False, None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, snapshot = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+        if snapshot is None:
+            return True, None
+        model, values = snapshot
+        return True, await attach_principal(db, model, values)
+
+    def put(self, key: str, principal) -> None:
+        """Cache a resolved principal, or None to record a negative lookup."""
+        if not self.enabled:
+            return
+        snapshot = snapshot_principal(principal) if principal is not None else None
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, snapshot)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *keys: str) -> None:
+        """Drop cached entries, e.g. after a user is updated, deactivated or deleted."""
+        with self._lock:
+            for key in keys:
+                self._entries.pop(str(key), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+principal_cache = PrincipalCache(
+    max_entries=settings.principal_cache_max_entries,
+    ttl_seconds=settings.principal_cache_ttl_seconds,
+)
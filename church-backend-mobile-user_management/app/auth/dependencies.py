@@ -1,46 +1,95 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_db
-from ..models.user import User
-from ..models.user_management import UserManagement
+from ..database import get_db, release_connection
 from ..schemas.enums import UserRole
-from .security import decode_token
+from .cache import principal_cache
+from .epochs import get_token_epoch
+from .principals import resolve_principal
+from .security import decode_token, parse_permissions
 
 security = HTTPBearer()
 
 
-def get_current_user(
-    db: Session = Depends(get_db),
+async def get_token_claims(
+    db: AsyncSession = Depends(get_db),
     credentials: HTTPAuthorizationCredentials = Depends(security)
-):
-    """Get current authenticated user from either users or user_management table."""
-    token = credentials.credentials
-    token_data = decode_token(token)
-    if not token_data:
+) -> dict:
+    """Decode the bearer token and check it has not been revoked.
+
+    Revocation is a comparison against the user's cached token epoch, so this
+    normally costs no database round trip.
+    """
+    token_data = decode_token(credentials.credentials)
+    if not token_data or token_data.get("type") == "refresh":
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
 
+    if token_data.get("ep", 0) != await get_token_epoch(db, token_data["sub"]):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked")
+    await release_connection(db)
+    return token_data
+
+
+async def load_current_user(db: AsyncSession, token_data: dict):
+    """Resolve the principal named by already-validated token claims."""
     user_id = token_data["sub"]
-    
-    # First check users table
-    user = db.query(User).filter(User.id == user_id).first()
-    if user and user.is_active:
-        return user
-    
-    # Then check user_management table
-    user_mgmt = db.query(UserManagement).filter(UserManagement.id == user_id).first()
-    if user_mgmt and user_mgmt.is_active:
-        return user_mgmt
-    
-    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Inactive or missing user")
+
+    # Serve from the principal cache when possible (no database round trip)
+    hit, principal = await principal_cache.get(db, user_id)
+    if not hit:
+        # Single query across users and user_management
+        resolved = await resolve_principal(db, user_id=user_id, active_only=True)
+        principal = resolved.user if resolved else None
+
+        # Negative results are cached as well
+        principal_cache.put(user_id, principal)
+
+        # Don't hold a connection while the route reads from another session (get_read_db)
+        await release_connection(db)
+
+    if principal is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Inactive or missing user")
+    return principal
+
+
+async def get_current_user(
+    db: AsyncSession = Depends(get_db),
+    token_data: dict = Depends(get_token_claims),
+):
+    """Get current authenticated user from either users or user_management table."""
+    return await load_current_user(db, token_data)
 
 
 def require_roles(*roles: UserRole):
-    def role_checker(current_user = Depends(get_current_user)):
+    allowed = {role.value for role in roles}
+
+    async def role_checker(
+        db: AsyncSession = Depends(get_db),
+        token_data: dict = Depends(get_token_claims),
+    ):
+        # Authorize from the token's role claim before loading the user
+        if token_data.get("role") not in allowed:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
+        current_user = await load_current_user(db, token_data)
         if current_user.role not in roles:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
         return current_user
 
     return role_checker
 
+
+def require_permissions(*permissions: str):
+    """Authorize from the token's permission claim alone (no user lookup).
+
+    Returns the token claims. Changing a user's role or permissions bumps
+    their token epoch, so stale claims are rejected by get_token_claims.
+    """
+    required = set(permissions)
+
+    async def permission_checker(token_data: dict = Depends(get_token_claims)):
+        if not required <= parse_permissions(token_data.get("perms")):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
+        return token_data
+
+    return permission_checker
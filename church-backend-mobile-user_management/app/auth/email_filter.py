@@ -0,0 +1,174 @@
+"""
+Known Email Filter
+
+A Bloom filter of every email in ``users`` and ``user_management``, so logins
+for unknown emails (the bulk of a credential-stuffing burst) are rejected
+without a query. A Bloom filter can report false positives (those fall through
+to the normal lookup) but never false negatives for emails it was given.
+
+- Built at startup. Emails of rows inserted or updated by this worker are
+  added immediately through mapper events.
+- Accounts created by other workers are picked up by a short incremental
+  refresh (``created_at`` newer than the last one seen, every
+  ``EMAIL_FILTER_REFRESH_INTERVAL_SECONDS``). Until then another worker
+  rejects their logins, which is why the filter is off by default: enable it
+  with a single worker, or when that delay is acceptable.
+- An occasional full rebuild forgets deleted emails and picks up emails
+  renamed by other workers.
+- Until the first build completes, every email is treated as possibly known.
+"""
+import hashlib
+import math
+import threading
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+from sqlalchemy import event, select, union_all
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models.user import User
+from ..models.user_management import UserManagement
+
+
+def _normalize(email: str) -> bytes:
+    # Lowercasing can only add false positives, so it is safe whatever the DB collation
+    return email.strip().lower().encode("utf-8")
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter using double hashing over a BLAKE2b digest."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(1, capacity)
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: bytes) -> Iterable[int]:
+        digest = hashlib.blake2b(item, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, item: bytes) -> bool:
+        """Add ``item``; False if it was (probably) there already."""
+        added = False
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not self._bits[position >> 3] & mask:
+                self._bits[position >> 3] |= mask
+                added = True
+        return added
+
+    def __contains__(self, item: bytes) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+# Rows read again by each refresh, in case an older insert committed after the last one
+_REFRESH_OVERLAP = timedelta(seconds=30)
+
+
+class KnownEmails:
+    """Swappable Bloom filter of account emails."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._filter: Optional[BloomFilter] = None
+        # Emails added while a rebuild is reading the tables
+        self._pending: Optional[List[bytes]] = None
+        # Newest created_at loaded so far, and how many more emails fit in the filter
+        self._seen_until: Optional[datetime] = None
+        self._room = 0
+        self._lock = threading.Lock()
+
+    def might_exist(self, email: str) -> bool:
+        bloom = self._filter
+        return bloom is None or _normalize(email) in bloom
+
+    def add(self, email: Optional[str]) -> None:
+        if email:
+            self._add_items([_normalize(email)])
+
+    def _add_items(self, items: List[bytes]) -> None:
+        with self._lock:
+            if self._filter is not None:
+                # Emails already in the filter (re-read overlap, updates) take no room
+                self._room -= sum(self._filter.add(item) for item in items)
+            if self._pending is not None:
+                self._pending.extend(items)
+
+    def _saw(self, created_at: Optional[datetime]) -> None:
+        if created_at is not None and (self._seen_until is None or created_at > self._seen_until):
+            self._seen_until = created_at
+
+    async def rebuild(self) -> int:
+        """Rebuild from both tables and swap it in. Returns the number of emails loaded."""
+        with self._lock:
+            self._pending = []
+        try:
+            started = datetime.utcnow()
+            async with SessionLocal() as db:
+                query = union_all(
+                    select(User.email, User.created_at),
+                    select(UserManagement.email, UserManagement.created_at),
+                )
+                rows = (await db.execute(query)).all()
+
+            # Leave room to grow until the next rebuild
+            capacity = max(self.capacity, 2 * len(rows))
+            bloom = BloomFilter(capacity, self.error_rate)
+            loaded = sum(bloom.add(_normalize(email)) for email, _ in rows)
+            # Even an empty table has been read up to now
+            self._saw(started)
+            for _, created_at in rows:
+                self._saw(created_at)
+
+            with self._lock:
+                loaded += sum(bloom.add(item) for item in self._pending)
+                self._filter = bloom
+                self._room = capacity - loaded
+            return len(rows)
+        finally:
+            with self._lock:
+                self._pending = None
+
+    async def refresh(self) -> int:
+        """Add the emails of accounts created since the last build or refresh.
+
+        Reads only the new rows (plus a short overlap for transactions that
+        committed late; emails read again take no room). Falls back to a full rebuild before the first build,
+        and once the filter has no room left. Returns the number of emails read.
+        """
+        if self._filter is None or self._room <= 0:
+            return await self.rebuild()
+
+        started = datetime.utcnow()
+        since = self._seen_until - _REFRESH_OVERLAP
+        query = union_all(*(
+            select(model.email, model.created_at).where(model.created_at > since)
+            for model in (User, UserManagement)
+        ))
+        async with SessionLocal() as db:
+            rows = (await db.execute(query)).all()
+
+        self._add_items([_normalize(email) for email, _ in rows])
+        self._saw(started)
+        for _, created_at in rows:
+            self._saw(created_at)
+        return len(rows)
+
+
+known_emails = KnownEmails(
+    capacity=settings.email_filter_capacity,
+    error_rate=settings.email_filter_error_rate,
+)
+
+
+@event.listens_for(User, "after_insert")
+@event.listens_for(User, "after_update")
+@event.listens_for(UserManagement, "after_insert")
+@event.listens_for(UserManagement, "after_update")
+def _track_email(mapper, connection, target):
+    known_emails.add(target.email)
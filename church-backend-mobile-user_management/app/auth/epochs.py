@@ -0,0 +1,95 @@
+"""
+Token Epochs
+
+Access and refresh tokens carry the user's token epoch (``ep`` claim). A token
+is only accepted while its epoch matches the current one, so bumping the epoch
+revokes everything issued before. Current epochs are cached per worker for
+``token_epoch_cache_ttl_seconds``; other workers see a bump once their cached
+copy expires.
+"""
+import threading
+import time
+from typing import Dict, Iterable, Tuple
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..models.token_epoch import TokenEpoch
+
+
+class TokenEpochCache:
+    """TTL cache of user ID -> current token epoch."""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    async def get(self, db: AsyncSession, user_id: str) -> int:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+        epoch = (await db.execute(select(TokenEpoch.epoch).where(TokenEpoch.user_id == user_id))).scalar()
+        epoch = epoch or 0
+        if self.ttl_seconds > 0:
+            with self._lock:
+                self._entries[user_id] = (now + self.ttl_seconds, epoch)
+        return epoch
+
+    def invalidate(self, *user_ids: str) -> None:
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(str(user_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+token_epochs = TokenEpochCache(ttl_seconds=settings.token_epoch_cache_ttl_seconds)
+
+
+async def get_token_epoch(db: AsyncSession, user_id: str) -> int:
+    """Return the user's current token epoch (0 if it was never bumped)."""
+    return await token_epochs.get(db, str(user_id))
+
+
+async def bump_token_epoch(db: AsyncSession, user_id: str) -> None:
+    """Revoke all tokens issued to ``user_id`` so far.
+
+    Runs inside the caller's transaction; the caller commits.
+    """
+    user_id = str(user_id)
+    result = await db.execute(
+        update(TokenEpoch)
+        .where(TokenEpoch.user_id == user_id)
+        .values(epoch=TokenEpoch.epoch + 1)
+    )
+    if result.rowcount == 0:
+        db.add(TokenEpoch(user_id=user_id, epoch=1))
+    token_epochs.invalidate(user_id)
+
+
+async def bump_token_epochs(db: AsyncSession, user_ids: Iterable[str]) -> None:
+    """bump_token_epoch for several users: one UPDATE and at most one INSERT.
+
+    Runs inside the caller's transaction; the caller commits.
+    """
+    user_ids = {str(user_id) for user_id in user_ids}
+    if not user_ids:
+        return
+    existing = set((await db.scalars(select(TokenEpoch.user_id).where(TokenEpoch.user_id.in_(user_ids)))).all())
+    if existing:
+        await db.execute(
+            update(TokenEpoch)
+            .where(TokenEpoch.user_id.in_(existing))
+            .values(epoch=TokenEpoch.epoch + 1)
+        )
+    missing = user_ids - existing
+    if missing:
+        await db.execute(insert(TokenEpoch), [{"user_id": user_id, "epoch": 1} for user_id in missing])
+    token_epochs.invalidate(*user_ids)
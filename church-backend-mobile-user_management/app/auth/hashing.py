@@ -0,0 +1,103 @@
+"""
+Password Hashing Engine
+
+bcrypt is CPU-bound and holds the GIL, so running it inside the request thread
+pool lets a burst of logins stall every other endpoint. Hashing is dispatched
+to a dedicated process pool instead and awaited by the async handlers.
+
+The number of in-flight jobs is bounded. Once the limit is reached new requests
+are rejected with 503 (and a Retry-After header) rather than queued without limit.
+
+Every server worker starts its own pool. By default the pools share the
+machine's CPUs between the ``WEB_CONCURRENCY`` workers instead of each taking
+one process per CPU.
+"""
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
+
+from ..config import settings
+from .security import (
+    configure_password_context, get_bcrypt_rounds, get_bcrypt_tolerance, get_password_hash,
+    verify_and_update_password, verify_password,
+)
+
+
+class PasswordHasher:
+    """Bounded process pool for bcrypt hashing and verification."""
+
+    def __init__(self, workers: Optional[int], max_pending: int, server_workers: int = 1):
+        if workers is None:
+            workers = max(1, (os.cpu_count() or 1) // max(1, server_workers))
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def start(self) -> None:
+        """Start the worker processes (no-op when hashing runs in the thread pool)."""
+        if self._executor is None and self.workers > 0:
+            # Workers use the same bcrypt cost as this process, even if calibrated at startup
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=configure_password_context,
+                initargs=(get_bcrypt_rounds(), get_bcrypt_tolerance()),
+            )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _run(self, fn, *args):
+        if self._pending >= self.max_pending:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please try again shortly",
+                headers={"Retry-After": "1"},
+            )
+        self._pending += 1
+        try:
+            self.start()
+            if self._executor is None:
+                return await run_in_threadpool(fn, *args)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+        except BrokenProcessPool:
+            # A worker died; drop the pool so the next call starts a fresh one
+            self.shutdown()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please try again shortly",
+                headers={"Retry-After": "1"},
+            )
+        finally:
+            self._pending -= 1
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against a hash off the event loop."""
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str):
+        """Verify a password; also return a rehash when the stored cost is outdated."""
+        return await self._run(verify_and_update_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        """Hash a password off the event loop."""
+        return await self._run(get_password_hash, password)
+
+
+password_hasher = PasswordHasher(
+    workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+    server_workers=settings.web_concurrency,
+)
@@ -0,0 +1,113 @@
+"""
+JWT Signing Keys
+
+With the default HS256 algorithm every node that verifies tokens also holds the
+signing secret. Setting ``JWT_ALGORITHM`` to an asymmetric algorithm (ES256,
+RS256, ...) switches to a key set loaded from ``JWT_KEYS_DIR``:
+
+- ``<kid>.pem``      private key: this node can sign and verify
+- ``<kid>.pub.pem``  public key only: this node can verify (replicas, gateways)
+
+Tokens are signed with ``JWT_ACTIVE_KID`` and carry it in the ``kid`` header.
+To rotate, add the new key, switch the active kid, and remove the old key
+once the tokens it signed have expired. Public keys are published as a JWKS
+document at ``/.well-known/jwks.json``.
+
+Example key (ES256):
+    openssl ecparam -name prime256v1 -genkey -noout | openssl pkcs8 -topk8 -nocrypt -out keys/2025-01.pem
+
+EdDSA is not offered: python-jose does not implement it.
+"""
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from jose import jwk
+from jose.exceptions import JWTError
+
+from ..config import settings
+
+# Minimum seconds between key directory rescans triggered by an unknown kid
+RELOAD_INTERVAL_SECONDS = 30
+
+
+class KeySet:
+    """Parsed signing/verification keys, cached by key ID."""
+
+    def __init__(self, algorithm: str, keys_dir: Optional[str], active_kid: Optional[str]):
+        self.algorithm = algorithm
+        self.keys_dir = Path(keys_dir) if keys_dir else None
+        self.active_kid = active_kid
+        self._signing: Dict[str, object] = {}
+        self._verifying: Dict[str, object] = {}
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def asymmetric(self) -> bool:
+        return not self.algorithm.upper().startswith("HS")
+
+    def load(self) -> None:
+        """(Re)read every key in the keys directory."""
+        if not self.asymmetric:
+            return
+        if self.keys_dir is None or not self.keys_dir.is_dir():
+            raise RuntimeError(f"JWT_KEYS_DIR must point to a key directory when using {self.algorithm}")
+
+        signing: Dict[str, object] = {}
+        verifying: Dict[str, object] = {}
+        for path in sorted(self.keys_dir.glob("*.pem")):
+            key = jwk.construct(path.read_text(), self.algorithm)
+            if path.name.endswith(".pub.pem"):
+                verifying[path.name[:-len(".pub.pem")]] = key
+            else:
+                kid = path.stem
+                signing[kid] = key
+                verifying[kid] = key.public_key()
+
+        with self._lock:
+            self._signing = signing
+            self._verifying = verifying
+            self._loaded_at = time.monotonic()
+
+    def signing_key(self) -> Tuple[Optional[str], object]:
+        """Return ``(kid, key)`` to sign new tokens with."""
+        if not self.asymmetric:
+            return None, settings.jwt_secret_key
+        key = self._signing.get(self.active_kid)
+        if key is None:
+            raise RuntimeError(f"No private key for JWT_ACTIVE_KID={self.active_kid!r} in {self.keys_dir}")
+        return self.active_kid, key
+
+    def verification_key(self, kid: Optional[str]):
+        """Return the key that verifies tokens signed with ``kid``."""
+        if not self.asymmetric:
+            return settings.jwt_secret_key
+        if kid is None:
+            raise JWTError("Token has no key ID")
+        key = self._verifying.get(kid)
+        if key is None and time.monotonic() - self._loaded_at > RELOAD_INTERVAL_SECONDS:
+            # A key may have been added since startup (rotation)
+            self.load()
+            key = self._verifying.get(kid)
+        if key is None:
+            raise JWTError(f"Unknown key ID {kid!r}")
+        return key
+
+    def jwks(self) -> dict:
+        """Public keys as a JSON Web Key Set."""
+        keys = []
+        for kid, key in self._verifying.items():
+            entry = key.to_dict()
+            entry.update({"kid": kid, "use": "sig", "alg": self.algorithm})
+            keys.append(entry)
+        return {"keys": keys}
+
+
+signing_keys = KeySet(
+    algorithm=settings.jwt_algorithm,
+    keys_dir=settings.jwt_keys_dir,
+    active_kid=settings.jwt_active_kid,
+)
+signing_keys.load()
@@ -0,0 +1,156 @@
+"""
+OTP Store
+
+One live code per email with an expiry and a failed-attempt counter. Codes are
+stored as an HMAC, never in plain text, and outside the users table so OTP
+churn does not write to user rows.
+
+Backends (``OTP_STORE_BACKEND``):
+
+- ``database``  otp_codes table, shared by every worker (default)
+- ``memory``    a dict in this worker; only for single-worker deployments
+
+Expired codes are deleted by a periodic sweeper.
+"""
+import hashlib
+import hmac
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Tuple
+
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models.otp_code import OTPCode
+from .security import generate_otp
+
+
+def _normalize(email: str) -> str:
+    return email.strip().lower()
+
+
+def hash_otp(email: str, code: str) -> str:
+    message = f"{_normalize(email)}:{code}".encode("utf-8")
+    return hmac.new(settings.jwt_secret_key.encode("utf-8"), message, hashlib.sha256).hexdigest()
+
+
+def _expires_at() -> datetime:
+    return datetime.utcnow() + timedelta(minutes=settings.otp_validity_minutes)
+
+
+class MemoryOTPStore:
+    """Codes kept in this worker's memory."""
+
+    def __init__(self, max_attempts: int):
+        self.max_attempts = max_attempts
+        # email -> (code_hash, expires_at, attempts)
+        self._codes: Dict[str, Tuple[str, datetime, int]] = {}
+        self._lock = threading.Lock()
+
+    async def issue(self, db: AsyncSession, email: str) -> str:
+        code = generate_otp()
+        with self._lock:
+            self._codes[_normalize(email)] = (hash_otp(email, code), _expires_at(), 0)
+        return code
+
+    async def verify(self, db: AsyncSession, email: str, code: str) -> bool:
+        key = _normalize(email)
+        with self._lock:
+            entry = self._codes.get(key)
+            if entry is None:
+                return False
+            code_hash, expires_at, attempts = entry
+            if expires_at <= datetime.utcnow():
+                del self._codes[key]
+                return False
+            if hmac.compare_digest(code_hash, hash_otp(email, code or "")):
+                del self._codes[key]
+                return True
+            if attempts + 1 >= self.max_attempts:
+                del self._codes[key]
+            else:
+                self._codes[key] = (code_hash, expires_at, attempts + 1)
+            return False
+
+    async def sweep(self) -> int:
+        now = datetime.utcnow()
+        with self._lock:
+            expired = [key for key, entry in self._codes.items() if entry[1] <= now]
+            for key in expired:
+                del self._codes[key]
+        return len(expired)
+
+
+class DatabaseOTPStore:
+    """Codes kept in the otp_codes table."""
+
+    def __init__(self, max_attempts: int, sweep_batch_size: int = 1000):
+        self.max_attempts = max_attempts
+        self.sweep_batch_size = sweep_batch_size
+
+    async def issue(self, db: AsyncSession, email: str) -> str:
+        """Replace the email's code. Runs inside the caller's transaction; the caller commits."""
+        code = generate_otp()
+        key = _normalize(email)
+        values = dict(code_hash=hash_otp(email, code), expires_at=_expires_at(), attempts=0,
+                      created_at=datetime.utcnow())
+        result = await db.execute(update(OTPCode).where(OTPCode.email == key).values(**values))
+        if result.rowcount == 0:
+            db.add(OTPCode(email=key, **values))
+        return code
+
+    async def verify(self, db: AsyncSession, email: str, code: str) -> bool:
+        """Check and consume a code.
+
+        Success is a single conditional DELETE that becomes part of the caller's
+        transaction. Failed attempts are counted and committed right away, since
+        the caller normally rejects the request without committing.
+        """
+        key = _normalize(email)
+        now = datetime.utcnow()
+        result = await db.execute(
+            delete(OTPCode).where(
+                OTPCode.email == key,
+                OTPCode.code_hash == hash_otp(email, code or ""),
+                OTPCode.expires_at > now,
+            )
+        )
+        if result.rowcount == 1:
+            return True
+
+        await db.execute(update(OTPCode).where(OTPCode.email == key).values(attempts=OTPCode.attempts + 1))
+        await db.execute(
+            delete(OTPCode).where(
+                OTPCode.email == key,
+                or_(OTPCode.attempts >= self.max_attempts, OTPCode.expires_at <= now),
+            )
+        )
+        await db.commit()
+        return False
+
+    async def sweep(self) -> int:
+        """Delete expired codes in batches. Returns the number of rows removed."""
+        removed = 0
+        async with SessionLocal() as db:
+            while True:
+                batch = select(OTPCode.email).where(
+                    OTPCode.expires_at <= datetime.utcnow()
+                ).limit(self.sweep_batch_size)
+                result = await db.execute(delete(OTPCode).where(OTPCode.email.in_(batch.scalar_subquery())))
+                await db.commit()
+                removed += result.rowcount
+                if result.rowcount < self.sweep_batch_size:
+                    return removed
+
+
+def create_otp_store():
+    if settings.otp_store_backend == "memory":
+        return MemoryOTPStore(max_attempts=settings.otp_max_attempts)
+    if settings.otp_store_backend != "database":
+        raise RuntimeError(f"Unknown OTP_STORE_BACKEND {settings.otp_store_backend!r}")
+    return DatabaseOTPStore(max_attempts=settings.otp_max_attempts)
+
+
+otp_store = create_otp_store()
@@ -0,0 +1,154 @@
+"""
+Principal Resolution
+
+Accounts live in two tables: ``users`` (superadmin/admin) and ``user_management``
+(users created by the Lead Pastor). Looking a principal up used to cost one query
+per table. This module resolves both tables in a single round trip with a
+UNION ALL over their indexed ``id``/``email`` columns, padding the columns a
+table does not have with typed NULLs, and rebuilds the matching ORM instance
+from the row. Token-issuing paths can also fetch the account's role
+permissions and token epoch in the same query.
+"""
+from typing import List, NamedTuple, Optional, Union
+
+from sqlalchemy import cast, func, literal_column, null, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.role import Role
+from ..models.token_epoch import TokenEpoch
+from ..models.user import User
+from ..models.user_management import UserManagement
+from .cache import attach_principal
+
+# Source table names, in lookup priority order
+USERS = "users"
+USER_MANAGEMENT = "user_management"
+
+_SOURCES = ((USERS, User), (USER_MANAGEMENT, UserManagement))
+
+
+class Principal(NamedTuple):
+    """A resolved account, the table it came from and (optionally) its token claims."""
+    user: Union[User, UserManagement]
+    source: str
+    permissions: Optional[str] = None
+    token_epoch: int = 0
+
+
+def _column_keys() -> List[str]:
+    keys: List[str] = []
+    for _, model in _SOURCES:
+        for column in model.__table__.columns:
+            if column.key not in keys:
+                keys.append(column.key)
+    return keys
+
+
+_COLUMN_KEYS = _column_keys()
+_COLUMN_TYPES = {
+    column.key: column.type
+    for _, model in reversed(_SOURCES)
+    for column in model.__table__.columns
+}
+
+
+def _select_for(
+    priority: int,
+    source: str,
+    model,
+    user_id: Optional[str],
+    email: Optional[str],
+    active_only: bool,
+    with_claims: bool,
+):
+    table = model.__table__
+    epochs = TokenEpoch.__table__
+    # users rows take their permissions from the role table;
+    # user_management rows carry their own copy
+    join_role = with_claims and "permissions" not in table.columns
+    columns = [
+        # Rendered inline so the UNION's column types are known to every driver
+        literal_column(str(priority)).label("priority"),
+        literal_column(f"'{source}'").label("source"),
+    ]
+    for key in _COLUMN_KEYS:
+        if key in table.columns:
+            columns.append(table.columns[key].label(key))
+        elif key == "permissions" and join_role:
+            columns.append(Role.__table__.c.permissions.label(key))
+        else:
+            columns.append(cast(null(), _COLUMN_TYPES[key]).label(key))
+
+    if with_claims:
+        columns.append(func.coalesce(epochs.c.epoch, 0).label("token_epoch"))
+
+    stmt = select(*columns)
+    if with_claims:
+        source_table = table.outerjoin(epochs, epochs.c.user_id == table.c.id)
+        if join_role:
+            source_table = source_table.outerjoin(Role.__table__, Role.__table__.c.role == table.c.role)
+        stmt = stmt.select_from(source_table)
+    if user_id is not None:
+        stmt = stmt.where(table.c.id == user_id)
+    if email is not None:
+        stmt = stmt.where(table.c.email == email)
+    if active_only:
+        stmt = stmt.where(table.c.is_active.is_(True))
+    return stmt
+
+
+def _build_query(user_id: Optional[str], email: Optional[str], active_only: bool, with_claims: bool):
+    if user_id is None and email is None:
+        raise ValueError("user_id or email is required")
+    selects = [
+        _select_for(priority, source, model, user_id, email, active_only, with_claims)
+        for priority, (source, model) in enumerate(_SOURCES)
+    ]
+    query = union_all(*selects).subquery()
+    return select(query).order_by(query.c.priority)
+
+
+async def resolve_principals(
+    db: AsyncSession,
+    *,
+    user_id: Optional[str] = None,
+    email: Optional[str] = None,
+    active_only: bool = False,
+    with_claims: bool = False,
+) -> List[Principal]:
+    """Return every account matching ``user_id``/``email`` across both tables.
+
+    Results are ordered ``users`` first, then ``user_management``, and are
+    attached to ``db`` so callers can modify and commit them. With
+    ``with_claims`` each result also carries its role permissions and token
+    epoch, as needed to issue tokens.
+    """
+    query = _build_query(user_id, email, active_only, with_claims)
+    rows = (await db.execute(query)).mappings().all()
+    principals = []
+    for row in rows:
+        model = User if row["source"] == USERS else UserManagement
+        values = {column.key: row[column.key] for column in model.__table__.columns}
+        if with_claims:
+            principal = Principal(
+                await attach_principal(db, model, values), row["source"], row["permissions"], row["token_epoch"]
+            )
+        else:
+            principal = Principal(await attach_principal(db, model, values), row["source"])
+        principals.append(principal)
+    return principals
+
+
+async def resolve_principal(
+    db: AsyncSession,
+    *,
+    user_id: Optional[str] = None,
+    email: Optional[str] = None,
+    active_only: bool = False,
+    with_claims: bool = False,
+) -> Optional[Principal]:
+    """Return the highest-priority matching account, or None."""
+    principals = await resolve_principals(
+        db, user_id=user_id, email=email, active_only=active_only, with_claims=with_claims
+    )
+    return principals[0] if principals else None
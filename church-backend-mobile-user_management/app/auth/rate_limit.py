@@ -0,0 +1,195 @@
+"""
+Rate Limiting
+
+Token buckets keyed by client IP and by the email in the request body. Each
+bucket holds up to ``burst`` requests and refills at ``per_minute``. Limits are
+attached as route dependencies so rejected requests never reach the database,
+bcrypt or SMTP.
+
+Storage is pluggable (``RATE_LIMIT_BACKEND``):
+
+- ``memory``  buckets live in this worker, in lock-sharded dicts (default)
+- ``redis``   buckets are shared by every worker through ``RATE_LIMIT_REDIS_URL``
+              (requires the ``redis`` package)
+"""
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+
+from ..config import settings
+
+
+@dataclass(frozen=True)
+class Limit:
+    """Bucket size and refill rate."""
+
+    burst: int
+    per_minute: float
+
+    @property
+    def rate(self) -> float:
+        """Tokens added per second."""
+        return self.per_minute / 60.0
+
+
+class MemoryBackend:
+    """In-process buckets, sharded to keep lock contention low.
+
+    Each shard keeps its buckets in least-recently-used order and evicts from
+    the old end once it holds ``max_entries_per_shard``, so a flood of new keys
+    costs O(1) per request.
+    """
+
+    def __init__(self, shards: int = 16, max_entries_per_shard: int = 10000):
+        self.max_entries_per_shard = max_entries_per_shard
+        # key -> (tokens, updated_at), least recently used first
+        self._shards: List[Tuple[threading.Lock, "OrderedDict[str, Tuple[float, float]]"]] = [
+            (threading.Lock(), OrderedDict()) for _ in range(max(1, shards))
+        ]
+
+    async def acquire(self, key: str, limit: Limit) -> float:
+        """Take one token. Returns 0 if allowed, else seconds until a token is available."""
+        lock, buckets = self._shards[hash(key) % len(self._shards)]
+        now = time.monotonic()
+        with lock:
+            entry = buckets.get(key)
+            if entry is None:
+                tokens = float(limit.burst)
+            else:
+                tokens = min(limit.burst, entry[0] + (now - entry[1]) * limit.rate)
+
+            wait = 0.0
+            if tokens < 1:
+                wait = (1 - tokens) / limit.rate
+            else:
+                tokens -= 1
+            buckets[key] = (tokens, now)
+            buckets.move_to_end(key)
+            while len(buckets) > self.max_entries_per_shard:
+                buckets.popitem(last=False)
+            return wait
+
+    def clear(self) -> None:
+        for lock, buckets in self._shards:
+            with lock:
+                buckets.clear()
+
+
+# KEYS[1] bucket key; ARGV: burst, rate (tokens/s), now (s)
+_REDIS_TOKEN_BUCKET = """
+local burst = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens < 1 then
+    wait = (1 - tokens) / rate
+else
+    tokens = tokens - 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil((burst - tokens) / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisBackend:
+    """Buckets shared across workers, updated atomically by a Lua script."""
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        try:
+            import redis.asyncio as redis
+        except ImportError as exc:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires the 'redis' package") from exc
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+        self._script = self._client.register_script(_REDIS_TOKEN_BUCKET)
+
+    async def acquire(self, key: str, limit: Limit) -> float:
+        wait = await self._script(keys=[self.prefix + key], args=[limit.burst, limit.rate, time.time()])
+        return float(wait)
+
+    def clear(self) -> None:
+        pass
+
+
+def create_backend():
+    if settings.rate_limit_backend == "redis":
+        if not settings.rate_limit_redis_url:
+            raise RuntimeError("RATE_LIMIT_REDIS_URL must be set when RATE_LIMIT_BACKEND=redis")
+        return RedisBackend(settings.rate_limit_redis_url)
+    if settings.rate_limit_backend != "memory":
+        raise RuntimeError(f"Unknown RATE_LIMIT_BACKEND {settings.rate_limit_backend!r}")
+    return MemoryBackend()
+
+
+rate_limit_backend = create_backend()
+
+
+def client_ip(request: Request) -> str:
+    if settings.rate_limit_trust_forwarded_for:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+async def _request_email(request: Request) -> Optional[str]:
+    """Email from the JSON body, if any (the body is cached, so the endpoint can still read it)."""
+    try:
+        body = json.loads(await request.body())
+    except ValueError:
+        return None
+    email = body.get("email") if isinstance(body, dict) else None
+    return email.strip().lower() if isinstance(email, str) else None
+
+
+def rate_limit(scope: str, per_ip: Limit, per_email: Optional[Limit] = None):
+    """Dependency factory limiting ``scope`` per client IP and per request email.
+
+    Use it in the route's ``dependencies=[...]`` so it runs before the
+    endpoint's other dependencies.
+    """
+
+    async def limiter(request: Request) -> None:
+        if not settings.rate_limit_enabled:
+            return
+
+        wait = await rate_limit_backend.acquire(f"{scope}:ip:{client_ip(request)}", per_ip)
+        if not wait and per_email is not None:
+            email = await _request_email(request)
+            if email:
+                wait = await rate_limit_backend.acquire(f"{scope}:email:{email}", per_email)
+
+        if wait:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests. Please try again later.",
+                headers={"Retry-After": str(max(1, math.ceil(wait)))},
+            )
+
+    return limiter
+
+
+# Password logins (bcrypt): /auth/login and /auth/superadmin/login share buckets
+login_rate_limit = rate_limit(
+    "login",
+    per_ip=Limit(settings.login_rate_limit_ip_burst, settings.login_rate_limit_ip_per_minute),
+    per_email=Limit(settings.login_rate_limit_email_burst, settings.login_rate_limit_email_per_minute),
+)
+
+# Admin signup and OTP endpoints (SMTP, OTP guessing)
+otp_rate_limit = rate_limit(
+    "otp",
+    per_ip=Limit(settings.otp_rate_limit_ip_burst, settings.otp_rate_limit_ip_per_minute),
+    per_email=Limit(settings.otp_rate_limit_email_burst, settings.otp_rate_limit_email_per_minute),
+)
@@ -0,0 +1,162 @@
+"""
+Refresh Token Families
+
+Every login starts a token family. Each refresh token is single use: exchanging
+it marks it used and issues the next token in the same family. Presenting a
+token that was already used means it was copied, so the whole family is
+revoked and the user has to log in again. Logout revokes the family too.
+
+The exchange is one conditional UPDATE on the primary key (a hash of the token
+ID). Recently revoked families are also remembered in memory, so replayed
+tokens are rejected without touching the database. Expired rows are deleted in
+batches by a periodic job.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import uuid4
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models.refresh_token import RefreshToken
+from ..utils.ids import new_id
+from .security import create_refresh_token
+
+
+def hash_token_id(token_id: str) -> str:
+    return hashlib.sha256(token_id.encode("utf-8")).hexdigest()
+
+
+class RevokedFamilies:
+    """Bounded, expiring set of revoked family IDs."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, family_id: str) -> None:
+        with self._lock:
+            self._entries[family_id] = time.monotonic() + self.ttl_seconds
+            self._entries.move_to_end(family_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __contains__(self, family_id: str) -> bool:
+        with self._lock:
+            expires_at = self._entries.get(family_id)
+            if expires_at is None:
+                return False
+            if expires_at <= time.monotonic():
+                del self._entries[family_id]
+                return False
+            return True
+
+
+# Tokens expire after refresh_token_expire_days, so there is no point remembering longer
+revoked_families = RevokedFamilies(
+    max_entries=settings.revoked_family_cache_max_entries,
+    ttl_seconds=settings.refresh_token_expire_days * 86400,
+)
+
+
+def issue_refresh_token(
+    db: AsyncSession,
+    user_id: str,
+    role: str,
+    epoch: int = 0,
+    family_id: Optional[str] = None,
+) -> str:
+    """Create and record a refresh token. Starts a new family unless ``family_id`` is given.
+
+    Runs inside the caller's transaction; the caller commits.
+    """
+    token_id = str(uuid4())
+    family_id = family_id or new_id()
+    expires_delta = timedelta(days=settings.refresh_token_expire_days)
+    db.add(RefreshToken(
+        token_hash=hash_token_id(token_id),
+        family_id=family_id,
+        user_id=str(user_id),
+        expires_at=datetime.utcnow() + expires_delta,
+    ))
+    return create_refresh_token(
+        subject=str(user_id),
+        role=role,
+        expires_delta=expires_delta,
+        epoch=epoch,
+        token_id=token_id,
+        family_id=family_id,
+    )
+
+
+async def revoke_refresh_family(db: AsyncSession, family_id: str) -> None:
+    """Revoke every token in a family. Commits."""
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    )
+    await db.commit()
+    revoked_families.add(family_id)
+
+
+async def consume_refresh_token(db: AsyncSession, payload: dict) -> bool:
+    """Mark a verified refresh token as used.
+
+    Returns False if the token is unknown, expired, revoked or already used. In
+    the last case the whole family is revoked (reuse detection). The successful
+    path is a single UPDATE by primary key; the caller commits.
+    """
+    token_id = payload.get("jti")
+    family_id = payload.get("fam")
+    if not token_id or not family_id or family_id in revoked_families:
+        return False
+
+    token_hash = hash_token_id(token_id)
+    now = datetime.utcnow()
+    result = await db.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.token_hash == token_hash,
+            RefreshToken.used_at.is_(None),
+            RefreshToken.revoked_at.is_(None),
+            RefreshToken.expires_at > now,
+        )
+        .values(used_at=now)
+    )
+    if result.rowcount == 1:
+        return True
+
+    # Failure path only: was this an already-used token being replayed?
+    row = (await db.execute(
+        select(RefreshToken.used_at, RefreshToken.revoked_at).where(RefreshToken.token_hash == token_hash)
+    )).first()
+    if row is not None and row.used_at is not None and row.revoked_at is None:
+        await revoke_refresh_family(db, family_id)
+    return False
+
+
+async def prune_expired_refresh_tokens() -> int:
+    """Delete expired refresh tokens in batches. Returns the number of rows removed."""
+    batch_size = settings.refresh_token_prune_batch_size
+    removed = 0
+    async with SessionLocal() as db:
+        while True:
+            batch = select(RefreshToken.token_hash).where(
+                RefreshToken.expires_at < datetime.utcnow()
+            ).limit(batch_size)
+            result = await db.execute(
+                delete(RefreshToken).where(RefreshToken.token_hash.in_(batch.scalar_subquery()))
+            )
+            await db.commit()
+            removed += result.rowcount
+            if result.rowcount < batch_size:
+                return removed
@@ -1,13 +1,15 @@
+import json
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import List, Optional, Set, Tuple
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..config import settings
-from ..models.user import User
-from ..models.user_management import UserManagement
+from .keys import signing_keys
+from .principals import Principal, resolve_principals
 
 # Configure bcrypt to handle longer passwords by truncating internally
 pwd_context = CryptContext(
@@ -16,80 +18,227 @@ pwd_context = CryptContext(
     bcrypt__ident="2b",  # Use bcrypt 2b format
 )
 
+# Calibration never goes below this cost, however slow the hardware
+BCRYPT_MIN_ROUNDS = 10
+BCRYPT_MAX_ROUNDS = 16
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against a hash."""
-    # Truncate password to 72 bytes if longer (bcrypt limit)
-    password_bytes = plain_password.encode('utf-8')
-    if len(password_bytes) > 72:
-        password_bytes = password_bytes[:72]
-        plain_password = password_bytes.decode('utf-8', errors='ignore')
-    return pwd_context.verify(plain_password, hashed_password)
 
+def configure_password_context(rounds: Optional[int], tolerance: Optional[int] = None) -> None:
+    """Make ``rounds`` the bcrypt work factor for new hashes.
 
-def get_password_hash(password: str) -> str:
-    """Hash a password using bcrypt."""
+    Stored hashes within ``tolerance`` rounds of it (BCRYPT_ROUNDS_TOLERANCE)
+    are accepted as they are. Only hashes outside that band are reported by
+    ``pwd_context.needs_update`` and rehashed on the user's next login, so
+    a one-round change in the setting does not rehash every account.
+    """
+    if rounds:
+        if tolerance is None:
+            tolerance = settings.bcrypt_rounds_tolerance
+        pwd_context.update(
+            bcrypt__default_rounds=rounds,
+            bcrypt__min_rounds=max(4, rounds - tolerance),
+            bcrypt__max_rounds=rounds + tolerance,
+        )
+
+
+def get_bcrypt_rounds() -> Optional[int]:
+    """Return the configured bcrypt work factor, or None for the passlib default."""
+    return pwd_context.to_dict().get("bcrypt__default_rounds")
+
+
+def get_bcrypt_tolerance() -> int:
+    """Return the accepted band around the work factor (0 when none is configured)."""
+    config = pwd_context.to_dict()
+    if "bcrypt__default_rounds" not in config:
+        return 0
+    return config["bcrypt__max_rounds"] - config["bcrypt__default_rounds"]
+
+
+def benchmark_bcrypt(target_ms: Optional[int] = None) -> List[Tuple[int, float]]:
+    """Time one hash at each cost, from BCRYPT_MIN_ROUNDS up to the first over ``target_ms``.
+
+    Returns ``(rounds, milliseconds)`` pairs. Each extra round doubles the hashing time.
+    """
+    from passlib.hash import bcrypt
+
+    target_ms = target_ms or settings.bcrypt_target_ms
+    timings = []
+    for rounds in range(BCRYPT_MIN_ROUNDS, BCRYPT_MAX_ROUNDS + 1):
+        hasher = bcrypt.using(rounds=rounds, ident="2b")
+        started = time.perf_counter()
+        hasher.hash("calibration-password")
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        timings.append((rounds, elapsed_ms))
+        if elapsed_ms > target_ms:
+            break
+    return timings
+
+
+def calibrate_bcrypt_rounds(
+    target_ms: Optional[int] = None, timings: Optional[List[Tuple[int, float]]] = None
+) -> int:
+    """Return the highest cost that hashes within ``target_ms`` on this machine.
+
+    Uses ``timings`` from benchmark_bcrypt when given, otherwise benchmarks.
+    The result is never lower than BCRYPT_MIN_ROUNDS, even if that cost
+    exceeds the target.
+    """
+    target_ms = target_ms or settings.bcrypt_target_ms
+    if timings is None:
+        timings = benchmark_bcrypt(target_ms)
+    within = [rounds for rounds, elapsed_ms in timings if elapsed_ms <= target_ms]
+    return max(within, default=BCRYPT_MIN_ROUNDS)
+
+
+configure_password_context(settings.bcrypt_rounds)
+
+
+def _truncate_password(password: str) -> str:
     # Truncate password to 72 bytes if longer (bcrypt limit)
     password_bytes = password.encode('utf-8')
     if len(password_bytes) > 72:
         password_bytes = password_bytes[:72]
         password = password_bytes.decode('utf-8', errors='ignore')
-    return pwd_context.hash(password)
+    return password
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against a hash."""
+    return pwd_context.verify(_truncate_password(plain_password), hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password and return a new hash if the stored one uses a different cost."""
+    return pwd_context.verify_and_update(_truncate_password(plain_password), hashed_password)
 
 
-def create_access_token(subject: str, role: str, expires_delta: Optional[timedelta] = None) -> str:
+def get_password_hash(password: str) -> str:
+    """Hash a password using bcrypt."""
+    return pwd_context.hash(_truncate_password(password))
+
+
+def create_access_token(
+    subject: str,
+    role: str,
+    expires_delta: Optional[timedelta] = None,
+    permissions: Optional[str] = None,
+    epoch: int = 0,
+) -> str:
+    """Create an access token carrying the role, permissions and token epoch.
+
+    With ``perms`` and ``ep`` in the token, role/permission checks need no
+    database lookup, and bumping the user's epoch revokes the token.
+    """
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=settings.access_token_expire_minutes))
-    to_encode = {"exp": expire, "sub": subject, "role": role}
-    return jwt.encode(to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
+    to_encode = {"exp": expire, "sub": subject, "role": role, "ep": epoch}
+    if permissions:
+        to_encode["perms"] = permissions
+    return encode_token(to_encode)
 
 
-def authenticate_user(db: Session, email: str, password: str):
-    """Authenticate user from either users or user_management table.
-    
-    Returns User or UserManagement object if authenticated, None otherwise.
+def encode_token(claims: dict) -> str:
+    """Sign claims with the active key (shared secret for HS*, private key otherwise)."""
+    kid, key = signing_keys.signing_key()
+    headers = {"kid": kid} if kid else None
+    return jwt.encode(claims, key, algorithm=settings.jwt_algorithm, headers=headers)
+
+
+def _decode(token: str) -> dict:
+    """Verify a token's signature with the key named in its header; raises JWTError."""
+    key = signing_keys.verification_key(jwt.get_unverified_header(token).get("kid"))
+    return jwt.decode(token, key, algorithms=[settings.jwt_algorithm])
+
+
+def parse_permissions(permissions: Optional[str]) -> Set[str]:
+    """Turn a stored permissions value into a set of permission names.
+
+    Accepts a JSON list (``["sermons:write"]``), a JSON object of flags
+    (``{"sermons:write": true}``) or a comma/whitespace separated string.
     """
-    # First check users table
-    user = db.query(User).filter(User.email == email).first()
-    if user:
+    if not permissions:
+        return set()
+    try:
+        parsed = json.loads(permissions)
+    except ValueError:
+        parsed = None
+    if isinstance(parsed, list):
+        return {str(item) for item in parsed}
+    if isinstance(parsed, dict):
+        return {str(key) for key, value in parsed.items() if value}
+    return {item for item in permissions.replace(",", " ").split() if item}
+
+
+async def authenticate_principal(db: AsyncSession, candidates: List[Principal], password: str) -> Optional[Principal]:
+    """Check ``password`` against already-resolved login candidates.
+
+    Returns the matching Principal, or None. bcrypt verification runs in the
+    hashing process pool. Passwords stored with a different bcrypt cost than
+    the configured one are rehashed and saved.
+    """
+    from .cache import principal_cache
+    from .hashing import password_hasher
+
+    for candidate in candidates:
+        user = candidate.user
         if not user.is_active:
             return None
         if not user.hashed_password:
-            return None
-        if verify_password(password, user.hashed_password):
-            return user
-    
-    # Then check user_management table
-    user_mgmt = db.query(UserManagement).filter(UserManagement.email == email).first()
-    if user_mgmt:
-        if not user_mgmt.is_active:
-            return None
-        if not user_mgmt.hashed_password:
             # User exists but has no password set - they need to reset password
             return None
-        if verify_password(password, user_mgmt.hashed_password):
-            return user_mgmt
+        verified, new_hash = await password_hasher.verify_and_update(password, user.hashed_password)
+        if verified:
+            if new_hash:
+                user.hashed_password = new_hash
+                await db.commit()
+                principal_cache.invalidate(user.id)
+            return candidate
     
     return None
 
 
+async def authenticate_user(db: AsyncSession, email: str, password: str):
+    """Authenticate user from either users or user_management table.
+    
+    Returns User or UserManagement object if authenticated, None otherwise.
+    """
+    # Both tables are resolved in one query, users table first
+    principal = await authenticate_principal(db, await resolve_principals(db, email=email), password)
+    return principal.user if principal else None
+
+
 def decode_token(token: str) -> Optional[dict]:
     try:
-        return jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
+        return _decode(token)
     except JWTError:
         return None
 
 
-def create_refresh_token(subject: str, role: str, expires_delta: Optional[timedelta] = None) -> str:
-    """Create a JWT-based refresh token (no database storage)."""
+def create_refresh_token(
+    subject: str,
+    role: str,
+    expires_delta: Optional[timedelta] = None,
+    epoch: int = 0,
+    token_id: Optional[str] = None,
+    family_id: Optional[str] = None,
+) -> str:
+    """Create a JWT-based refresh token.
+
+    Use refresh_tokens.issue_refresh_token to also record it; only recorded
+    tokens (with ``jti``/``fam`` claims) are accepted by /refresh/.
+    """
     expire = datetime.utcnow() + (expires_delta or timedelta(days=settings.refresh_token_expire_days))
-    to_encode = {"exp": expire, "sub": subject, "role": role, "type": "refresh"}
-    return jwt.encode(to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
+    to_encode = {"exp": expire, "sub": subject, "role": role, "type": "refresh", "ep": epoch}
+    if token_id:
+        to_encode["jti"] = token_id
+    if family_id:
+        to_encode["fam"] = family_id
+    return encode_token(to_encode)
 
 
 def verify_refresh_token(token: str) -> Optional[dict]:
     """Verify a refresh token and return decoded payload if valid."""
     try:
-        payload = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
+        payload = _decode(token)
         # Check if it's a refresh token
         if payload.get("type") != "refresh":
             return None
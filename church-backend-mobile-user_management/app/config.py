@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import ValidationError
 import sys
@@ -14,16 +15,138 @@ class Settings(BaseSettings):
 
     database_url: str
 
+    # Run Base.metadata.create_all on startup (development only; use alembic elsewhere)
+    auto_create_tables: bool = False
+    # PostgreSQL migrations give up on a table lock after this long instead of
+    # queueing every query on the table behind them (0 = wait forever)
+    migration_lock_timeout_ms: int = 5000
+    # Create the superadmin account on startup if it does not exist
+    seed_superadmin: bool = True
+
+    # Connection pool, per worker process
+    db_pool_size: int = 5
+    # Extra connections allowed above db_pool_size under load
+    db_max_overflow: int = 10
+    # Seconds to wait for a free connection before failing the request
+    db_pool_timeout: float = 30
+    # Replace connections older than this many seconds (-1 = never)
+    db_pool_recycle: int = 1800
+    # Test connections on checkout so dropped connections are replaced transparently
+    db_pool_pre_ping: bool = True
+
+    # SQLite only: WAL, synchronous=NORMAL, bigger cache, mmap and a single queued
+    # writer connection (see app/utils/sqlite_profile.py)
+    sqlite_performance_profile: bool = False
+    # How long a connection waits on a locked database before failing
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kib: int = 65536
+    sqlite_mmap_size_bytes: int = 268435456
+
+    # Comma-separated read replica URLs used by read-only endpoints (empty = primary only)
+    database_replica_urls: Optional[str] = None
+    # After a write, the client's reads stay on the primary this long (replica lag budget)
+    read_your_writes_seconds: int = 5
+
+    # Per-request query count / DB time (Server-Timing header and app.sql log)
+    sql_metrics_enabled: bool = True
+    # Warn when one statement shape runs more than this many times in a request (0 = off)
+    sql_repeat_warn_threshold: int = 10
+
+    # Log statements slower than this (0 = off); plans are captured in the background
+    slow_query_threshold_ms: float = 200
+    slow_query_explain: bool = True
+    # Explain each statement shape at most once per this many seconds
+    slow_query_explain_cooldown_seconds: int = 600
+
     jwt_secret_key: str
 
     jwt_algorithm: str = "HS256"
 
+    # Asymmetric signing (ES256/RS256): directory of <kid>.pem / <kid>.pub.pem keys
+    jwt_keys_dir: Optional[str] = None
+
+    # Key ID used to sign new tokens
+    jwt_active_kid: Optional[str] = None
+
     access_token_expire_minutes: int = 30
 
     refresh_token_expire_days: int = 7
 
+    # Background pruning of expired refresh tokens
+    refresh_token_prune_interval_seconds: int = 3600
+    refresh_token_prune_batch_size: int = 1000
+
+    # Revoked refresh-token families remembered in memory (rejected without a query)
+    revoked_family_cache_max_entries: int = 10000
+
     otp_validity_minutes: int = 10
 
+    # OTP storage: "database" (otp_codes table, shared by all workers) or "memory" (single worker)
+    otp_store_backend: str = "database"
+    # Failed checks allowed before a code is discarded
+    otp_max_attempts: int = 5
+    # How often expired codes are deleted
+    otp_sweep_interval_seconds: int = 300
+
+    # In-process cache of authenticated principals (get_current_user)
+    principal_cache_ttl_seconds: int = 60
+    principal_cache_max_entries: int = 10000
+
+    # Bloom filter of account emails: unknown-email logins are rejected without a query.
+    # Each worker keeps its own filter and sees accounts created by other workers
+    # only after its next refresh, so it is off by default (see app/auth/email_filter.py)
+    email_filter_enabled: bool = False
+    email_filter_capacity: int = 100000
+    email_filter_error_rate: float = 0.001
+    # Incremental refresh: adds accounts created since the last one (by any worker)
+    email_filter_refresh_interval_seconds: int = 5
+    # Full rebuild (forgets deleted emails, picks up emails renamed by other workers)
+    email_filter_rebuild_interval_seconds: int = 3600
+
+    # How often the /count counters are checked against count(*) and corrected
+    counter_reconcile_interval_seconds: int = 3600
+
+    # Largest array accepted by the /bulk endpoints
+    bulk_max_items: int = 500
+
+    # How long a worker trusts its cached copy of a user's token epoch
+    token_epoch_cache_ttl_seconds: int = 30
+
+    # Server worker processes on this machine. uvicorn and gunicorn both read
+    # WEB_CONCURRENCY as their worker count, so set it rather than --workers
+    web_concurrency: int = 1
+    # bcrypt processes per server worker (None = the CPUs shared out between the
+    # WEB_CONCURRENCY workers, at least 1; 0 = hash in the thread pool). Together
+    # with password_hash_max_pending this bounds the hashing load of the machine
+    password_hash_workers: Optional[int] = None
+    # In-flight hashing jobs per server worker allowed before requests are rejected with 503
+    password_hash_max_pending: int = 32
+
+    # bcrypt work factor for new hashes (None = passlib default). Run
+    # calibrate_bcrypt.py --write once per deployment to pick one.
+    bcrypt_rounds: Optional[int] = None
+    # Stored hashes within this many rounds of bcrypt_rounds are kept as they
+    # are; only hashes outside the band are rehashed on the next login
+    bcrypt_rounds_tolerance: int = 1
+    # Target hashing latency used by calibration
+    bcrypt_target_ms: int = 250
+
+    # Token-bucket rate limits (burst size, refill per minute) keyed by client IP and email
+    rate_limit_enabled: bool = True
+    # "memory" (per worker) or "redis" (shared by all workers, needs the redis package)
+    rate_limit_backend: str = "memory"
+    rate_limit_redis_url: Optional[str] = None
+    # Take the client IP from X-Forwarded-For (only behind a trusted proxy)
+    rate_limit_trust_forwarded_for: bool = False
+    login_rate_limit_ip_burst: int = 20
+    login_rate_limit_ip_per_minute: float = 20
+    login_rate_limit_email_burst: int = 5
+    login_rate_limit_email_per_minute: float = 5
+    otp_rate_limit_ip_burst: int = 10
+    otp_rate_limit_ip_per_minute: float = 10
+    otp_rate_limit_email_burst: int = 3
+    otp_rate_limit_email_per_minute: float = 1
+
     smtp_server: str
 
     smtp_port: int
@@ -49,11 +172,6 @@ class Settings(BaseSettings):
 # Try to load settings, show helpful error if fails
 try:
     settings = Settings()
-    if ENV_FILE.exists():
-        print(f"✅ Configuration loaded from: {ENV_FILE}")
-    else:
-        print(f"⚠️  .env file not found at: {ENV_FILE}")
-        print("   Loading from environment variables only.")
 except ValidationError as e:
     print("=" * 70)
     print("❌ CONFIGURATION ERROR: Missing or invalid environment variables")
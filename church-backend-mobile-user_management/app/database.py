@@ -1,24 +1,170 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+import hashlib
+import itertools
+from typing import List, Optional, Tuple
+
+from fastapi import Depends, Request
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase
 
 from .config import settings
+from .utils.consistency import reads_pinned_to_primary
+from .utils.pool import InstrumentedPool
+from .utils.sqlite_profile import is_file_sqlite, single_writer_session, tune_sqlite_engine, writer_engine_options
 
 
 class Base(DeclarativeBase):
-    pass
+    # Values the database generates (server defaults, triggers) come back in
+    # the INSERT/UPDATE itself via RETURNING instead of a later SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
+
+def async_database_url(url: str) -> str:
+    """Point a DATABASE_URL at its asyncio driver.
+
+    ``sqlite://`` uses aiosqlite and ``postgresql://`` / ``postgresql+psycopg2://``
+    use asyncpg, so existing .env files keep working. URLs that already name an
+    async driver are returned unchanged.
+    """
+    scheme, separator, rest = url.partition("://")
+    backend = scheme.split("+")[0]
+    if backend == "sqlite":
+        return f"sqlite+aiosqlite://{rest}"
+    if backend in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg://{rest}"
+    return url
+
+
+def sync_database_url(url: str) -> str:
+    """Point a DATABASE_URL at a blocking driver (pysqlite / psycopg2), for Alembic."""
+    scheme, separator, rest = url.partition("://")
+    backend = scheme.split("+")[0]
+    if backend == "sqlite":
+        return f"sqlite://{rest}"
+    if backend in ("postgresql", "postgres"):
+        return f"postgresql+psycopg2://{rest}"
+    return url
+
+
+def engine_options(url: str) -> dict:
+    """Pool settings for ``url``.
+
+    In-memory SQLite keeps the dialect's own pool (each connection would be a
+    separate database); everything else uses the instrumented queue pool.
+    """
+    if url.startswith("sqlite") and (":memory:" in url or url.rstrip("/").endswith(":")):
+        return {}
+    return {
+        "poolclass": InstrumentedPool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def create_engines(url: str, sqlite_profile: bool = False) -> Tuple[AsyncEngine, Optional[AsyncEngine]]:
+    """The engine for ``url`` and, with the SQLite profile, its dedicated writer engine."""
+    primary = create_async_engine(async_database_url(url), **engine_options(url))
+    if not (sqlite_profile and is_file_sqlite(url)):
+        return primary, None
+    writer = create_async_engine(async_database_url(url), **writer_engine_options())
+    tune_sqlite_engine(primary)
+    tune_sqlite_engine(writer, immediate=True)
+    return primary, writer
+
+
+def create_sessionmaker(bind: AsyncEngine, writer: Optional[AsyncEngine] = None) -> async_sessionmaker:
+    # Objects stay usable after commit: reloading them would need an implicit
+    # (and, under asyncio, unsupported) lazy load. After a flush they already
+    # hold every column, so write handlers return them without a refresh
+    return async_sessionmaker(
+        bind=bind,
+        class_=AsyncSession,
+        sync_session_class=single_writer_session(writer),
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
+engine, writer_engine = create_engines(settings.database_url, settings.sqlite_performance_profile)
+SessionLocal = create_sessionmaker(engine, writer_engine)
+
+
+def replica_urls(value: Optional[str]) -> List[str]:
+    return [url.strip() for url in (value or "").split(",") if url.strip()]
 
 
-engine = create_engine(
-    settings.database_url, connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {}
-)
+# Read replicas, used round-robin by get_read_db
+replica_engines = [
+    create_async_engine(async_database_url(url), **engine_options(url))
+    for url in replica_urls(settings.database_replica_urls)
+]
+ReplicaSessionLocals = [create_sessionmaker(replica) for replica in replica_engines]
+_replica_turn = itertools.count()
 
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
+def read_sessionmaker(pinned: bool = False) -> async_sessionmaker:
+    """Session factory for a read-only request: the primary if ``pinned`` or
+    no replicas are configured, otherwise the next replica."""
+    if pinned or not ReplicaSessionLocals:
+        return SessionLocal
+    return ReplicaSessionLocals[next(_replica_turn) % len(ReplicaSessionLocals)]
 
-def get_db():
-    db = SessionLocal()
-    try:
+
+async def dispose_engines() -> None:
+    for each in all_engines():
+        await each.dispose()
+
+
+def all_engines() -> List[AsyncEngine]:
+    """Primary, SQLite writer (if any) and replica engines."""
+    return [engine, *([writer_engine] if writer_engine is not None else []), *replica_engines]
+
+
+def advisory_lock_key(name: str) -> int:
+    """Stable signed 64-bit key for ``name`` (PostgreSQL advisory locks take a bigint)."""
+    return int.from_bytes(hashlib.blake2b(name.encode("utf-8"), digest_size=8).digest(), "big", signed=True)
+
+
+async def advisory_xact_lock(db: AsyncSession, name: str) -> None:
+    """Serialize transactions across processes on ``name`` until ``db`` commits or rolls back.
+
+    Uses pg_advisory_xact_lock on PostgreSQL. Other databases have no advisory
+    locks; there the call does nothing and callers rely on unique constraints.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        await db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": advisory_lock_key(name)})
+
+
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
+
+async def release_connection(db: AsyncSession) -> None:
+    """End ``db``'s transaction so its connection goes back to the pool.
+
+    For sessions that have only read so far. Loaded objects stay usable
+    (``expire_on_commit=False``); the session checks a connection out again
+    on its next query.
+    """
+    if db.in_transaction():
+        await db.commit()
+
+
+async def get_read_db(request: Request, db: AsyncSession = Depends(get_db)):
+    """Session for endpoints that only read.
+
+    Goes to a replica unless the client recently wrote (see utils.consistency),
+    in which case it stays on the primary. On the primary this is the
+    request's ``get_db`` session, so a request never holds two primary
+    connections. Never write through this session.
+    """
+    sessionmaker = read_sessionmaker(reads_pinned_to_primary(request))
+    if sessionmaker is SessionLocal:
+        yield db
+        return
+    async with sessionmaker() as read_db:
+        yield read_db
@@ -1,13 +1,17 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect, select
+from sqlalchemy.exc import IntegrityError
 
-from .config import settings
-from .database import Base, engine, SessionLocal
+from .config import Settings, settings
+from .database import Base, engine, SessionLocal, advisory_xact_lock, all_engines, dispose_engines, replica_engines, writer_engine
 from .models.user import User
 from .routes import admin as admin_routes
 from .routes import auth as auth_routes
 from .routes import devotional as devotional_routes
+from .routes import internal as internal_routes
 from .routes import refresh as refresh_routes
 from .routes import sermons as sermons_routes
 from .routes import series as series_routes
@@ -15,101 +19,209 @@ from .routes import superadmin as superadmin_routes
 from .routes import user_management as user_management_routes
 from .routes import permissions as permissions_routes
 from .schemas.enums import UserRole
-from .auth.security import get_password_hash
-
-Base.metadata.create_all(bind=engine)
-
-
-def init_superadmin():
-    """Initialize superadmin with hard-coded credentials if it doesn't exist."""
-    db: Session = SessionLocal()
-    try:
-        # Ensure tables exist
-        Base.metadata.create_all(bind=engine)
-        
-        # Debug: Print database URL (without password)
-        db_url_display = settings.database_url.split('@')[-1] if '@' in settings.database_url else settings.database_url
-        print(f"🔍 Checking database: {db_url_display}")
-        
-        # Check total users count for debugging
-        total_users = db.query(User).count()
-        print(f"🔍 Total users in database: {total_users}")
-        
-        # Check if superadmin already exists (by email AND role)
-        existing = db.query(User).filter(
-            User.email == settings.superadmin_email,
-            User.role == UserRole.SUPERADMIN
-        ).first()
-        if existing:
-            print("ℹ️  Superadmin already exists in database")
-            return
-        
-        # Create superadmin
-        superadmin = User(
-            email=settings.superadmin_email,
-            first_name="super",
-            last_name="admin",
-            hashed_password=get_password_hash(settings.superadmin_password),
-            role=UserRole.SUPERADMIN,
-            is_active=True,
+from .utils.consistency import mark_write
+from .utils.counters import reconcile_counters
+from .utils.migrations import stamp_head
+from .utils.slow_queries import install_slow_query_log
+from .utils.sql_metrics import collect_queries, instrument_engine, report_request
+from .utils.tasks import periodic_tasks
+from .auth.email_filter import known_emails
+from .auth.hashing import password_hasher
+from .auth.keys import signing_keys
+from .auth.otp_store import otp_store
+from .auth.refresh_tokens import prune_expired_refresh_tokens
+
+
+def _create_all(connection):
+    fresh = not inspect(connection).get_table_names()
+    Base.metadata.create_all(connection)
+    # An empty database now matches the latest migration; record that so
+    # later schema changes can be applied with ``alembic upgrade head``
+    if fresh:
+        stamp_head(connection)
+
+
+async def create_tables():
+    async with engine.begin() as conn:
+        await conn.run_sync(_create_all)
+
+
+async def init_superadmin(app_settings: Settings = settings):
+    """Create the superadmin account if it doesn't exist.
+
+    Runs under an advisory lock so that workers starting together do not race
+    (on databases without advisory locks the unique email constraint decides).
+    The password is only hashed when the account is actually created.
+    """
+    async with SessionLocal() as db:
+        try:
+            await advisory_xact_lock(db, "seed_superadmin")
+
+            # Check if superadmin already exists (by email AND role)
+            existing = await db.scalar(select(User.id).where(
+                User.email == app_settings.superadmin_email,
+                User.role == UserRole.SUPERADMIN
+            ))
+            if existing:
+                return
+
+            # Create superadmin
+            superadmin = User(
+                email=app_settings.superadmin_email,
+                first_name="super",
+                last_name="admin",
+                hashed_password=await password_hasher.hash(app_settings.superadmin_password),
+                role=UserRole.SUPERADMIN,
+                is_active=True,
+            )
+            db.add(superadmin)
+            await db.commit()
+            print("✅ Superadmin initialized successfully!")
+            print(f"   Email: {app_settings.superadmin_email}")
+        except IntegrityError:
+            # Another worker created it first
+            await db.rollback()
+        except Exception as e:
+            print(f"⚠️  Error initializing superadmin: {e}")
+            import traceback
+            traceback.print_exc()
+            await db.rollback()
+
+
+def register_periodic_tasks(app_settings: Settings) -> None:
+    periodic_tasks.register(
+        "prune_refresh_tokens",
+        app_settings.refresh_token_prune_interval_seconds,
+        prune_expired_refresh_tokens,
+    )
+    periodic_tasks.register("sweep_otp_codes", app_settings.otp_sweep_interval_seconds, otp_store.sweep)
+    periodic_tasks.register(
+        "reconcile_counters",
+        app_settings.counter_reconcile_interval_seconds,
+        reconcile_counters,
+    )
+    if app_settings.email_filter_enabled:
+        periodic_tasks.register(
+            "refresh_email_filter",
+            app_settings.email_filter_refresh_interval_seconds,
+            known_emails.refresh,
         )
-        db.add(superadmin)
-        db.commit()
-        db.refresh(superadmin)
-        print("✅ Superadmin initialized successfully!")
-        print(f"   Email: {settings.superadmin_email}")
-        print(f"   Password: {settings.superadmin_password}")
-    except Exception as e:
-        print(f"⚠️  Error initializing superadmin: {e}")
-        import traceback
-        traceback.print_exc()
-        db.rollback()
-    finally:
-        db.close()
-
-
-# Initialize superadmin on startup
-init_superadmin()
-
-app = FastAPI(
-    title="Pastor Mobile API",
-    version="1.0.0",
-    swagger_ui_init_oauth={
-        "usePkceWithAuthorizationCodeGrant": False,
-    }
-)
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-app.include_router(auth_routes.router, prefix="/api/v1")
-app.include_router(refresh_routes.router, prefix="/api/v1")
-app.include_router(superadmin_routes.router, prefix="/api/v1")
-app.include_router(admin_routes.router, prefix="/api/v1")
-app.include_router(user_management_routes.router, prefix="/api/v1")
-app.include_router(permissions_routes.router, prefix="/api/v1")
-app.include_router(sermons_routes.router, prefix="/api/v1")
-app.include_router(series_routes.router, prefix="/api/v1")
-app.include_router(devotional_routes.router, prefix="/api/v1")
-
-
-@app.get("/", tags=["Root"])
-def root():
-    """Root endpoint - API information."""
-    return {
-        "message": "Pastor Mobile API",
-        "version": "1.0.0",
-        "docs": "/docs",
-        "health": "/health"
-    }
-
-
-@app.get("/health", tags=["Health"])
-def health_check():
-    return {"status": "ok"}
+        periodic_tasks.register(
+            "rebuild_email_filter",
+            app_settings.email_filter_rebuild_interval_seconds,
+            known_emails.rebuild,
+        )
+
+
+def lifespan_for(app_settings: Settings):
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # bcrypt worker processes first: seeding the superadmin may need a hash
+        password_hasher.start()
+
+        if app_settings.auto_create_tables:
+            await create_tables()
+            # Migrations seed the counters; fresh create_all databases start here
+            await reconcile_counters()
+        if app_settings.seed_superadmin:
+            await init_superadmin(app_settings)
+
+        if app_settings.email_filter_enabled:
+            await known_emails.rebuild()
+        register_periodic_tasks(app_settings)
+        periodic_tasks.start()
+        try:
+            yield
+        finally:
+            await periodic_tasks.stop()
+            password_hasher.shutdown()
+            await dispose_engines()
+
+    return lifespan
+
+
+def create_app(app_settings: Settings = settings) -> FastAPI:
+    """Build the application.
+
+    Nothing touches the database here; schema creation (opt-in with
+    AUTO_CREATE_TABLES), superadmin seeding and background jobs run in the
+    lifespan, once per worker at server startup.
+    """
+    app = FastAPI(
+        title="Pastor Mobile API",
+        version="1.0.0",
+        swagger_ui_init_oauth={
+            "usePkceWithAuthorizationCodeGrant": False,
+        },
+        lifespan=lifespan_for(app_settings),
+    )
+
+    if app_settings.sql_metrics_enabled:
+        for db_engine in all_engines():
+            instrument_engine(db_engine)
+
+        @app.middleware("http")
+        async def record_sql_metrics(request: Request, call_next):
+            """Count the queries and database time of each request."""
+            with collect_queries(request.scope) as stats:
+                response = await call_next(request)
+            report_request(request, response, stats)
+            return response
+
+    if app_settings.slow_query_threshold_ms > 0:
+        for db_engine in (engine, *replica_engines):
+            install_slow_query_log(db_engine)
+        if writer_engine is not None:
+            # Plans are captured on the reader pool; the writer's one connection stays free
+            install_slow_query_log(writer_engine, explain_engine=engine)
+
+    if replica_engines:
+        @app.middleware("http")
+        async def issue_consistency_tokens(request: Request, call_next):
+            """Pin the client's next reads to the primary after a successful write."""
+            response = await call_next(request)
+            mark_write(request, response)
+            return response
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    app.include_router(auth_routes.router, prefix="/api/v1")
+    app.include_router(refresh_routes.router, prefix="/api/v1")
+    app.include_router(superadmin_routes.router, prefix="/api/v1")
+    app.include_router(admin_routes.router, prefix="/api/v1")
+    app.include_router(user_management_routes.router, prefix="/api/v1")
+    app.include_router(permissions_routes.router, prefix="/api/v1")
+    app.include_router(sermons_routes.router, prefix="/api/v1")
+    app.include_router(series_routes.router, prefix="/api/v1")
+    app.include_router(devotional_routes.router, prefix="/api/v1")
+    app.include_router(internal_routes.router, prefix="/api/v1")
+
+    @app.get("/", tags=["Root"])
+    def root():
+        """Root endpoint - API information."""
+        return {
+            "message": "Pastor Mobile API",
+            "version": "1.0.0",
+            "docs": "/docs",
+            "health": "/health"
+        }
+
+    @app.get("/health", tags=["Health"])
+    def health_check():
+        return {"status": "ok"}
+
+    @app.get("/.well-known/jwks.json", tags=["Auth"])
+    def jwks():
+        """Public keys for verifying access tokens (empty when using a shared HS* secret)."""
+        return signing_keys.jwks()
+
+    return app
+
 
+app = create_app()
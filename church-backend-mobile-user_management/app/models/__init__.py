@@ -5,6 +5,10 @@ from .sermon import Sermon
 from .series import Series
 from .devotional import Devotional
 from .existing_series import ExistingSeries
+from .token_epoch import TokenEpoch
+from .refresh_token import RefreshToken
+from .otp_code import OTPCode
+from .counter import Counter
 
-__all__ = ["User", "UserManagement", "Role", "Sermon", "Series", "Devotional", "ExistingSeries"]
+__all__ = ["User", "UserManagement", "Role", "Sermon", "Series", "Devotional", "ExistingSeries", "TokenEpoch", "RefreshToken", "OTPCode", "Counter"]
 
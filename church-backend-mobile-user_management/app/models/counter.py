@@ -0,0 +1,29 @@
+"""
+Counter Model
+
+Materialized row counts behind the /count endpoints. Each counter is adjusted
+in the same transaction as the insert or delete that changes it (see
+app.utils.counters), so reading a count is a primary-key lookup instead of a
+full-table ``count(*)``.
+"""
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, String
+
+from ..database import Base
+
+
+class Counter(Base):
+    """
+    Counter - one row per counted set of rows.
+
+    Fields:
+    - name: Counter name, e.g. "sermons" or "admins" (primary key)
+    - value: Current number of rows
+    - reconciled_at: Last time the value was checked against count(*)
+    """
+    __tablename__ = "counters"
+
+    name = Column(String(64), primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
+    reconciled_at = Column(DateTime, nullable=True)
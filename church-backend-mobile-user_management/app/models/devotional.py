@@ -1,25 +1,31 @@
 from datetime import date, datetime
-from uuid import uuid4
 
-from sqlalchemy import Column, Date, DateTime, ForeignKey, String
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, String
 from sqlalchemy.orm import relationship
 
 from ..database import Base
+from ..utils.ids import new_id
+from .types import GUID
 
 
 class Devotional(Base):
     __tablename__ = "devotionals"
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid4()), index=True)
+    id = Column(GUID, primary_key=True, default=new_id, index=True)
     title = Column(String(255), nullable=False)
-    date = Column(Date, nullable=False, index=True)
+    date = Column(Date, nullable=False)
     passage = Column(String(255), nullable=False)
     leader = Column(String(255), nullable=False)
-    sermon_id = Column(String(36), ForeignKey("sermons.id"), nullable=True)
-    created_by_id = Column(String(36), ForeignKey("users.id"), nullable=True)
+    sermon_id = Column(GUID, ForeignKey("sermons.id"), nullable=True, index=True)
+    created_by_id = Column(GUID, ForeignKey("users.id"), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     created_by = relationship("User", foreign_keys=[created_by_id])
     sermon = relationship("Sermon", foreign_keys=[sermon_id])
 
+    __table_args__ = (
+        # Listing and keyset pages: date DESC, id DESC
+        Index("ix_devotionals_date_id", "date", "id"),
+    )
+
@@ -0,0 +1,31 @@
+"""
+OTP Code Model
+
+One-time codes for admin account verification and password reset, kept out of
+the users table so issuing and checking codes never writes to a user row.
+Only an HMAC of the code is stored.
+"""
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, String
+
+from ..database import Base
+
+
+class OTPCode(Base):
+    """
+    OTP code - at most one live code per email.
+
+    Fields:
+    - email: Lowercased email the code was sent to (primary key)
+    - code_hash: HMAC-SHA256 of the code
+    - expires_at: Expiry; indexed so the sweeper can delete expired codes cheaply
+    - attempts: Failed verification attempts; the code is dropped at otp_max_attempts
+    """
+    __tablename__ = "otp_codes"
+
+    email = Column(String(255), primary_key=True)
+    code_hash = Column(String(64), nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,36 @@
+"""
+Refresh Token Model
+
+Stores issued refresh tokens so they can be rotated (single use), revoked on
+logout, and revoked as a whole family when reuse of an old token is detected.
+Only a SHA-256 hash of the token ID is stored.
+"""
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, String
+
+from ..database import Base
+from .types import GUID
+
+
+class RefreshToken(Base):
+    """
+    Refresh token - one row per issued token.
+
+    Fields:
+    - token_hash: SHA-256 of the token's jti claim (primary key, single-probe lookups)
+    - family_id: All tokens rotated from the same login share a family
+    - user_id: ID from users or user_management
+    - expires_at: Expiry, used by the background pruning job
+    - used_at: Set when the token is exchanged; a second exchange is a reuse
+    - revoked_at: Set on logout or when the family is revoked
+    """
+    __tablename__ = "refresh_tokens"
+
+    token_hash = Column(String(64), primary_key=True)
+    family_id = Column(GUID, nullable=False, index=True)
+    user_id = Column(GUID, nullable=False, index=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    used_at = Column(DateTime, nullable=True)
+    revoked_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
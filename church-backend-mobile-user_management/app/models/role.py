@@ -4,11 +4,12 @@ Role Model
 Stores role information with permissions and active status.
 Roles: ADMIN, PASTOR_STAFF, TEACHING_TEAM, COMMUNICATIONS_TEAM, SMALL_GROUP_LEADER
 """
-from uuid import uuid4
 
-from sqlalchemy import Boolean, Column, Enum, String, Text
+from sqlalchemy import Boolean, Column, Enum, Text
 
 from ..database import Base
+from ..utils.ids import new_id
+from .types import GUID
 from ..schemas.enums import UserRole
 
 
@@ -24,8 +25,8 @@ class Role(Base):
     """
     __tablename__ = "role"
 
-    # Primary key - UUID as string
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid4()), index=True)
+    # Primary key - UUID (time-ordered v7, stored natively)
+    id = Column(GUID, primary_key=True, default=new_id, index=True)
     
     # Role enum value
     role = Column(Enum(UserRole), nullable=False, unique=True, index=True)
@@ -1,34 +1,42 @@
-from datetime import date, datetime, timezone
-from uuid import uuid4
+from datetime import date, datetime
 
-from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, String, Table, Text
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer, String, Table, Text
 from sqlalchemy.orm import relationship
 
 from ..database import Base
+from ..utils.ids import new_id
+from .types import GUID
 
 # Junction table for many-to-many relationship between Series and Sermon
 series_sermons = Table(
     'series_sermons',
     Base.metadata,
-    Column('series_id', String(36), ForeignKey('series.id', ondelete='CASCADE'), primary_key=True),
-    Column('sermon_id', String(36), ForeignKey('sermons.id', ondelete='CASCADE'), primary_key=True)
+    Column('series_id', GUID, ForeignKey('series.id', ondelete='CASCADE'), primary_key=True),
+    Column('sermon_id', GUID, ForeignKey('sermons.id', ondelete='CASCADE'), primary_key=True),
+    # The primary key serves lookups by series; this covers lookups by sermon
+    Index('ix_series_sermons_sermon_id_series_id', 'sermon_id', 'series_id'),
 )
 
 
 class Series(Base):
     __tablename__ = "series"
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid4()), index=True)
+    id = Column(GUID, primary_key=True, default=new_id, index=True)
     title = Column(String(255), nullable=False)
-    from_date = Column(Date, nullable=False, index=True)
+    from_date = Column(Date, nullable=False)
     to_date = Column(Date, nullable=False, index=True)
     passage = Column(String(255), nullable=False)  # Scripture reference
     description = Column(Text, nullable=False)
-    created_by_id = Column(String(36), ForeignKey("users.id"), nullable=True)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
-    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    created_by_id = Column(GUID, ForeignKey("users.id"), nullable=True, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Many-to-many relationship with Sermon
     sermons = relationship("Sermon", secondary=series_sermons, back_populates="series", lazy="select")
     created_by = relationship("User", foreign_keys=[created_by_id])
 
+    __table_args__ = (
+        # Listing and keyset pages: from_date DESC, id DESC
+        Index("ix_series_from_date_id", "from_date", "id"),
+    )
+
@@ -0,0 +1,28 @@
+"""
+Token Epoch Model
+
+Per-user revocation counter embedded in access and refresh tokens. Bumping a
+user's epoch (on role, permission or deactivation changes) invalidates every
+token issued before the bump, without a per-request user lookup.
+"""
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer
+
+from ..database import Base
+from .types import GUID
+
+
+class TokenEpoch(Base):
+    """
+    Token epoch - one row per user whose tokens have ever been revoked.
+
+    Fields:
+    - user_id: ID from users or user_management (no FK, it can be either table)
+    - epoch: Current epoch; tokens carrying a lower value are rejected
+    """
+    __tablename__ = "token_epochs"
+
+    user_id = Column(GUID, primary_key=True)
+    epoch = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
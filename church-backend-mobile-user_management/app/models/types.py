@@ -0,0 +1,55 @@
+"""
+Column Types
+
+``GUID`` stores UUIDs natively: PostgreSQL's 16-byte ``uuid`` type, and a
+16-byte BLOB on SQLite, instead of 36-character strings. Python code keeps
+seeing canonical UUID strings, so schemas, tokens and route parameters are
+unchanged.
+"""
+import uuid
+from typing import Optional
+
+from sqlalchemy import LargeBinary
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.types import TypeDecorator
+
+
+class GUID(TypeDecorator):
+    """UUID column exchanging canonical strings with Python.
+
+    Values that are not valid UUIDs bind as NULL, so looking up a malformed ID
+    finds nothing (404) rather than failing the statement.
+    """
+
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=True))
+        return dialect.type_descriptor(LargeBinary(16))
+
+    @staticmethod
+    def _to_uuid(value) -> Optional[uuid.UUID]:
+        if isinstance(value, uuid.UUID):
+            return value
+        if isinstance(value, (bytes, bytearray)) and len(value) == 16:
+            return uuid.UUID(bytes=bytes(value))
+        try:
+            return uuid.UUID(str(value))
+        except ValueError:
+            return None
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        parsed = self._to_uuid(value)
+        if parsed is None or dialect.name == "postgresql":
+            return parsed
+        return parsed.bytes
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        parsed = self._to_uuid(value)
+        return str(parsed) if parsed is not None else value
@@ -13,12 +13,13 @@ Roles supported:
 - SMALL_GROUP_LEADER: Small Group Leader
 """
 from datetime import datetime
-from uuid import uuid4
 
-from sqlalchemy import Boolean, Column, DateTime, Enum, ForeignKey, String
+from sqlalchemy import Boolean, Column, DateTime, Enum, ForeignKey, Index, String
 from sqlalchemy.orm import relationship
 
 from ..database import Base
+from ..utils.ids import new_id
+from .types import GUID
 from ..schemas.enums import UserRole
 
 
@@ -36,8 +37,8 @@ class User(Base):
     """
     __tablename__ = "users"
 
-    # Primary key - UUID as string
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid4()), index=True)
+    # Primary key - UUID (time-ordered v7, stored natively)
+    id = Column(GUID, primary_key=True, default=new_id, index=True)
     
     # User identification
     email = Column(String(255), unique=True, nullable=False, index=True)
@@ -55,17 +56,24 @@ class User(Base):
     is_active = Column(Boolean, default=True)
     is_verified = Column(Boolean, default=False)
     
-    # OTP for email verification and password reset
+    # Legacy OTP columns, no longer written: codes live in otp_codes (app/auth/otp_store.py)
     otp_code = Column(String(6), nullable=True)
     otp_expires_at = Column(DateTime, nullable=True)
     
     # Audit trail - tracks who created this user
-    created_by_id = Column(String(36), ForeignKey("users.id"), nullable=True)
+    created_by_id = Column(GUID, ForeignKey("users.id"), nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationship to track users created by this user
     created_users = relationship("User", remote_side=[id])
 
+    __table_args__ = (
+        # Admin listings and keyset pages: filtered by role, newest first
+        Index("ix_users_role_created_at_id", "role", "created_at", "id"),
+        # Accounts created since a point in time (app/auth/email_filter.py)
+        Index("ix_users_created_at", "created_at"),
+    )
+
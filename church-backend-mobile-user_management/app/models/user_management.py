@@ -10,12 +10,15 @@ Separate table for user management with simplified fields:
 
 This table stores user information specifically for user management purposes.
 """
-from uuid import uuid4
 
-from sqlalchemy import Boolean, Column, Enum, ForeignKey, String, Text
+from datetime import datetime
+
+from sqlalchemy import Boolean, Column, DateTime, Enum, ForeignKey, Index, String, Text
 from sqlalchemy.orm import relationship
 
 from ..database import Base
+from ..utils.ids import new_id
+from .types import GUID
 from ..schemas.enums import UserRole
 
 
@@ -32,8 +35,8 @@ class UserManagement(Base):
     """
     __tablename__ = "user_management"
 
-    # Primary key - UUID as string
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid4()), index=True)
+    # Primary key - UUID (time-ordered v7, stored natively)
+    id = Column(GUID, primary_key=True, default=new_id, index=True)
     
     # User identification
     first_name = Column(String(255), nullable=False)
@@ -47,7 +50,7 @@ class UserManagement(Base):
     role = Column(Enum(UserRole), nullable=False, index=True)
     
     # Role ID - foreign key to role.id
-    role_id = Column(String(36), ForeignKey('role.id'), nullable=True, index=True)
+    role_id = Column(GUID, ForeignKey('role.id'), nullable=True, index=True)
     
     # Permissions - fetched from role table and stored here
     permissions = Column(Text, nullable=True)
@@ -55,6 +58,14 @@ class UserManagement(Base):
     # Account status
     is_active = Column(Boolean, default=True, nullable=False)
     
+    # Creation time (NULL for rows created before the column existed)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    
     # Relationship to Role table via role_id
     role_details = relationship("Role", foreign_keys=[role_id], uselist=False)
 
+    __table_args__ = (
+        # Listing by role, ordered by email
+        Index("ix_user_management_role_email", "role", "email"),
+    )
+
@@ -1,16 +1,21 @@
-from typing import List
+from typing import List, Union
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Path, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..auth.cache import principal_cache
+from ..auth.epochs import bump_token_epoch
 from ..auth.dependencies import require_roles
-from ..auth.security import get_password_hash
+from ..auth.hashing import password_hasher
 from ..database import get_db
 from ..models.user import User
 from ..schemas.auth import EmailNotification
 from ..schemas.enums import UserRole
+from ..schemas.pagination import Page
 from ..schemas.user import UserCreate, UserResponse, UserUpdate
 from ..utils.email import send_email
+from ..utils.pagination import PageParams, fetch_page
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -26,14 +31,14 @@ def send_credentials_email(background_tasks: BackgroundTasks, email: str, passwo
 
 
 @router.post("/create", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def create_admin(
+async def create_admin(
     payload: UserCreate,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
     """Create Admin user."""
-    if db.query(User).filter(User.email == payload.email).first():
+    if await db.scalar(select(User).where(User.email == payload.email)):
         raise HTTPException(status_code=400, detail="Email already registered")
 
     # Force role to ADMIN
@@ -42,50 +47,53 @@ def create_admin(
         email=payload.email,
         first_name=payload.first_name,
         last_name=payload.last_name,
-        hashed_password=get_password_hash(raw_password),
+        hashed_password=await password_hasher.hash(raw_password),
         role=UserRole.ADMIN,  # Always set to ADMIN
         created_by_id=current_user.id,
     )
     db.add(admin)
-    db.commit()
-    db.refresh(admin)
+    await db.commit()
 
     send_credentials_email(background_tasks, payload.email, raw_password, UserRole.ADMIN)
     return admin
 
 
-@router.get("/list", response_model=List[UserResponse])
-def list_admins(
-    db: Session = Depends(get_db),
+@router.get("/list", response_model=Union[List[UserResponse], Page[UserResponse]])
+async def list_admins(
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
-    """List all Admin users."""
-    admins = db.query(User).filter(User.role == UserRole.ADMIN).order_by(User.created_at.desc()).all()
-    return admins
+    """List all Admin users, newest first. Pass ``limit`` (and then ``cursor``) to page through them."""
+    query = select(User).where(User.role == UserRole.ADMIN)
+    admins, next_cursor = await fetch_page(db, query, (User.created_at, User.id), page, descending=True)
+    if not page.paginated:
+        return admins
+    return Page(items=admins, next_cursor=next_cursor)
 
 
 @router.get("/{user_id}", response_model=UserResponse)
-def get_admin(
+async def get_admin(
     user_id: str = Path(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
     """Get Admin user by ID."""
-    admin = db.query(User).filter(User.id == user_id, User.role == UserRole.ADMIN).first()
+    admin = await db.scalar(select(User).where(User.id == user_id, User.role == UserRole.ADMIN))
     if not admin:
         raise HTTPException(status_code=404, detail="Admin not found")
     return admin
 
 
 @router.put("/update/{user_id}", response_model=UserResponse)
-def update_admin(
+async def update_admin(
     user_id: str,
     payload: UserUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
     """Update Admin user."""
-    admin = db.query(User).filter(User.id == user_id, User.role == UserRole.ADMIN).first()
+    admin = await db.scalar(select(User).where(User.id == user_id, User.role == UserRole.ADMIN))
     if not admin:
         raise HTTPException(status_code=404, detail="Admin not found")
 
@@ -94,31 +102,36 @@ def update_admin(
     if payload.last_name:
         admin.last_name = payload.last_name
     if payload.password:
-        admin.hashed_password = get_password_hash(payload.password)
+        admin.hashed_password = await password_hasher.hash(payload.password)
     if payload.is_active is not None:
+        if admin.is_active and not payload.is_active:
+            # Deactivation revokes every token issued to the admin
+            await bump_token_epoch(db, admin.id)
         admin.is_active = payload.is_active
-    db.commit()
-    db.refresh(admin)
+    await db.commit()
+    principal_cache.invalidate(admin.id)
     return admin
 
 
 @router.delete("/delete/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_admin(
+async def delete_admin(
     user_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
     """Delete Admin user."""
-    admin = db.query(User).filter(User.id == user_id, User.role == UserRole.ADMIN).first()
+    admin = await db.scalar(select(User).where(User.id == user_id, User.role == UserRole.ADMIN))
     if not admin:
         raise HTTPException(status_code=404, detail="Admin not found")
-    db.delete(admin)
-    db.commit()
+    await db.delete(admin)
+    await bump_token_epoch(db, admin.id)
+    await db.commit()
+    principal_cache.invalidate(admin.id)
 
 
 @router.get("/me", response_model=UserResponse)
-def get_current_admin(
-    db: Session = Depends(get_db),
+async def get_current_admin(
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
     """Get current authenticated admin user information."""
@@ -126,9 +139,9 @@ def get_current_admin(
 
 
 @router.put("/me/update", response_model=UserResponse)
-def update_current_admin(
+async def update_current_admin(
     payload: UserUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
     """Update current authenticated admin user profile."""
@@ -137,9 +150,11 @@ def update_current_admin(
     if payload.last_name:
         current_user.last_name = payload.last_name
     if payload.password:
-        current_user.hashed_password = get_password_hash(payload.password)
+        current_user.hashed_password = await password_hasher.hash(payload.password)
     if payload.is_active is not None:
+        if current_user.is_active and not payload.is_active:
+            await bump_token_epoch(db, current_user.id)
         current_user.is_active = payload.is_active
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    principal_cache.invalidate(current_user.id)
     return current_user
@@ -1,12 +1,19 @@
-from datetime import timedelta, datetime
+from datetime import timedelta
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..auth.cache import principal_cache
 from ..auth.dependencies import get_current_user
+from ..auth.email_filter import known_emails
+from ..auth.hashing import password_hasher
+from ..auth.otp_store import otp_store
+from ..auth.principals import USER_MANAGEMENT, USERS, resolve_principals
+from ..auth.rate_limit import login_rate_limit, otp_rate_limit
+from ..auth.refresh_tokens import issue_refresh_token, revoke_refresh_family
 from ..auth.security import (
-    authenticate_user, create_access_token, create_refresh_token,
-    generate_otp, get_password_hash, is_otp_valid
+    authenticate_principal, create_access_token, verify_refresh_token
 )
 from ..config import settings
 from ..database import get_db
@@ -14,7 +21,7 @@ from ..models.user import User
 from ..schemas.auth import (
     AdminSignupRequest, AdminSignupResponse, ForgotPasswordRequest,
     ForgotPasswordResponse, LoginRequest, LoginResponse, ResendOTPRequest,
-    ResendOTPResponse, ResetPasswordRequest, ResetPasswordResponse,
+    RefreshTokenRequest, ResendOTPResponse, ResetPasswordRequest, ResetPasswordResponse,
     Token, VerifyOTPRequest, VerifyOTPResponse, EmailNotification
 )
 from ..schemas.enums import UserRole
@@ -24,47 +31,52 @@ from ..utils.email import send_email
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 
-@router.post("/superadmin/login", response_model=LoginResponse)
-def superadmin_login(payload: LoginRequest, db: Session = Depends(get_db)):
+@router.post("/superadmin/login", response_model=LoginResponse, dependencies=[Depends(login_rate_limit)])
+async def superadmin_login(payload: LoginRequest, db: AsyncSession = Depends(get_db)):
     """Superadmin Login - Only accepts superadmin credentials from settings."""
     # Use superadmin credentials from settings
     if payload.email != settings.superadmin_email or payload.password != settings.superadmin_password:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
     
-    user = db.query(User).filter(User.email == settings.superadmin_email, User.role == UserRole.SUPERADMIN).first()
+    # Superadmin row and its role permissions in one query
+    candidates = await resolve_principals(db, email=settings.superadmin_email, with_claims=True)
+    superadmin = next(
+        (c for c in candidates if c.source == USERS and c.user.role == UserRole.SUPERADMIN),
+        None,
+    )
+    user = superadmin.user if superadmin else None
+    permissions = superadmin.permissions if superadmin else None
+    token_epoch = superadmin.token_epoch if superadmin else 0
     
     # If superadmin doesn't exist, create it
     if not user:
-        from ..auth.security import get_password_hash
         user = User(
             email=settings.superadmin_email,
             first_name="super",
             last_name="admin",
-            hashed_password=get_password_hash(settings.superadmin_password),
+            hashed_password=await password_hasher.hash(settings.superadmin_password),
             role=UserRole.SUPERADMIN,
             is_active=True,
         )
         db.add(user)
-        db.commit()
-        db.refresh(user)
-    
-    # Get permissions from role table for superadmin
-    from ..models.role import Role
-    permissions = None
-    role_details = db.query(Role).filter(Role.role == user.role).first()
-    if role_details:
-        permissions = role_details.permissions
+        await db.commit()
+        
+        # Get permissions from role table for the new superadmin
+        from ..models.role import Role
+        role_details = await db.scalar(select(Role).where(Role.role == user.role))
+        if role_details:
+            permissions = role_details.permissions
     
     access_token = create_access_token(
         subject=str(user.id),
         role=user.role.value,
         expires_delta=timedelta(minutes=settings.access_token_expire_minutes),
+        permissions=permissions,
+        epoch=token_epoch,
     )
-    refresh_token = create_refresh_token(
-        subject=str(user.id),
-        role=user.role.value,
-        expires_delta=timedelta(days=settings.refresh_token_expire_days),
-    )
+    # Start a new refresh token family for this session
+    refresh_token = issue_refresh_token(db, user.id, user.role.value, epoch=token_epoch)
+    await db.commit()
     return LoginResponse(
         access_token=access_token,
         refresh_token=refresh_token,
@@ -76,17 +88,23 @@ def superadmin_login(payload: LoginRequest, db: Session = Depends(get_db)):
     )
 
 
-@router.post("/login", response_model=LoginResponse)
-def login(payload: LoginRequest, db: Session = Depends(get_db)):
+@router.post("/login", response_model=LoginResponse, dependencies=[Depends(login_rate_limit)])
+async def login(payload: LoginRequest, db: AsyncSession = Depends(get_db)):
     """Account Login - General login endpoint for all roles. Accepts JSON with email and password.
     
     Supports login from both users and user_management tables.
+    
+    Single pass: one query fetches the candidate accounts from both tables together
+    with their role permissions, and those rows are reused for error classification,
+    password verification and token issuance.
     """
-    from ..models.user_management import UserManagement
+    # Emails the filter has never seen do not exist: reject without a query
+    if settings.email_filter_enabled and not known_emails.might_exist(payload.email):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials - Email not found")
     
-    # Check if user exists in either table
-    user_in_users = db.query(User).filter(User.email == payload.email).first()
-    user_in_mgmt = db.query(UserManagement).filter(UserManagement.email == payload.email).first()
+    candidates = await resolve_principals(db, email=payload.email, with_claims=True)
+    user_in_users = next((c.user for c in candidates if c.source == USERS), None)
+    user_in_mgmt = next((c.user for c in candidates if c.source == USER_MANAGEMENT), None)
     
     # Provide more specific error messages
     if not user_in_users and not user_in_mgmt:
@@ -99,14 +117,15 @@ def login(payload: LoginRequest, db: Session = Depends(get_db)):
             detail="Account exists but password not set. Please contact administrator to reset your password."
         )
     
-    user = authenticate_user(db, payload.email, payload.password)
-    if not user:
+    principal = await authenticate_principal(db, candidates, payload.password)
+    if not principal:
         # More specific error - password might be wrong or account inactive
         if user_in_users and not user_in_users.is_active:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Account is inactive")
         if user_in_mgmt and not user_in_mgmt.is_active:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Account is inactive")
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials - Incorrect password")
+    user = principal.user
     
     # Superadmin should use /superadmin/login endpoint
     if user.role == UserRole.SUPERADMIN:
@@ -119,27 +138,21 @@ def login(payload: LoginRequest, db: Session = Depends(get_db)):
             detail="Account not verified. Please verify your account using the OTP code sent to your email."
         )
     
-    # Get permissions - from user_management table if UserManagement, or None for User
-    permissions = None
-    if isinstance(user, UserManagement):
-        permissions = user.permissions
-    elif isinstance(user, User):
-        # For User model, try to fetch from role table
-        from ..models.role import Role
-        role_details = db.query(Role).filter(Role.role == user.role).first()
-        if role_details:
-            permissions = role_details.permissions
+    # Permissions came with the candidate row: user_management's own column,
+    # or the role table's permissions for users
+    permissions = principal.permissions
+    token_epoch = principal.token_epoch
     
     access_token = create_access_token(
         subject=str(user.id),
         role=user.role.value,
         expires_delta=timedelta(minutes=settings.access_token_expire_minutes),
+        permissions=permissions,
+        epoch=token_epoch,
     )
-    refresh_token = create_refresh_token(
-        subject=str(user.id),
-        role=user.role.value,
-        expires_delta=timedelta(days=settings.refresh_token_expire_days),
-    )
+    # Start a new refresh token family for this session
+    refresh_token = issue_refresh_token(db, user.id, user.role.value, epoch=token_epoch)
+    await db.commit()
     return LoginResponse(
         access_token=access_token,
         refresh_token=refresh_token,
@@ -151,37 +164,46 @@ def login(payload: LoginRequest, db: Session = Depends(get_db)):
     )
 
 
-@router.post("/admin/signup", response_model=AdminSignupResponse, status_code=status.HTTP_201_CREATED)
-def admin_signup(
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(payload: RefreshTokenRequest, db: AsyncSession = Depends(get_db)):
+    """Logout - Revoke the refresh token and every token rotated from it.
+    
+    Access tokens already issued stay valid until they expire.
+    """
+    refresh_token_payload = verify_refresh_token(payload.refresh_token)
+    if refresh_token_payload and refresh_token_payload.get("fam"):
+        await revoke_refresh_family(db, refresh_token_payload["fam"])
+    return None
+
+
+@router.post("/admin/signup", response_model=AdminSignupResponse, status_code=status.HTTP_201_CREATED,
+             dependencies=[Depends(otp_rate_limit)])
+async def admin_signup(
     payload: AdminSignupRequest,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Admin signup - Create a new admin account."""
     # Check if email already exists
-    existing_user = db.query(User).filter(User.email == payload.email).first()
+    existing_user = await db.scalar(select(User).where(User.email == payload.email))
     if existing_user:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
     
-    # Generate OTP
-    otp_code = generate_otp()
-    otp_expires_at = datetime.utcnow() + timedelta(minutes=settings.otp_validity_minutes)
-    
     # Create admin user
     admin_user = User(
         email=payload.email,
         first_name=payload.first_name,
         last_name=payload.last_name,
-        hashed_password=get_password_hash(payload.password),
+        hashed_password=await password_hasher.hash(payload.password),
         role=UserRole.ADMIN,
         is_active=True,
         is_verified=False,
-        otp_code=otp_code,
-        otp_expires_at=otp_expires_at,
     )
     db.add(admin_user)
-    db.commit()
-    db.refresh(admin_user)
+    
+    # Generate OTP (committed together with the new account)
+    otp_code = await otp_store.issue(db, payload.email)
+    await db.commit()
     
     # Send OTP email
     notification = EmailNotification(
@@ -197,17 +219,17 @@ def admin_signup(
     )
 
 
-@router.post("/admin/forgot-password", response_model=ForgotPasswordResponse)
-def admin_forgot_password(
+@router.post("/admin/forgot-password", response_model=ForgotPasswordResponse, dependencies=[Depends(otp_rate_limit)])
+async def admin_forgot_password(
     payload: ForgotPasswordRequest,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Admin forgot password - Send OTP to reset password."""
-    user = db.query(User).filter(
+    user = await db.scalar(select(User).where(
         User.email == payload.email,
         User.role == UserRole.ADMIN
-    ).first()
+    ))
     
     if not user:
         # Don't reveal if email exists for security
@@ -215,14 +237,9 @@ def admin_forgot_password(
             message="If the email exists, an OTP code has been sent."
         )
     
-    # Generate new OTP
-    otp_code = generate_otp()
-    otp_expires_at = datetime.utcnow() + timedelta(minutes=settings.otp_validity_minutes)
-    
-    # Update user with new OTP
-    user.otp_code = otp_code
-    user.otp_expires_at = otp_expires_at
-    db.commit()
+    # Generate new OTP (replaces any previous code; the user row is not written)
+    otp_code = await otp_store.issue(db, payload.email)
+    await db.commit()
     
     # Send OTP email
     notification = EmailNotification(
@@ -237,29 +254,28 @@ def admin_forgot_password(
     )
 
 
-@router.post("/admin/verify-otp", response_model=VerifyOTPResponse)
-def admin_verify_otp(
+@router.post("/admin/verify-otp", response_model=VerifyOTPResponse, dependencies=[Depends(otp_rate_limit)])
+async def admin_verify_otp(
     payload: VerifyOTPRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Admin verify OTP - Verify OTP code for account verification."""
-    user = db.query(User).filter(
+    user = await db.scalar(select(User).where(
         User.email == payload.email,
         User.role == UserRole.ADMIN
-    ).first()
+    ))
     
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     
     # Verify OTP
-    if not is_otp_valid(payload.otp_code, user.otp_code, user.otp_expires_at):
+    if not await otp_store.verify(db, payload.email, payload.otp_code):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid or expired OTP code")
     
-    # Mark as verified and clear OTP
+    # Mark as verified (the OTP was consumed by the check above)
     user.is_verified = True
-    user.otp_code = None
-    user.otp_expires_at = None
-    db.commit()
+    await db.commit()
+    principal_cache.invalidate(user.id)
     
     return VerifyOTPResponse(
         message="Account verified successfully",
@@ -267,46 +283,45 @@ def admin_verify_otp(
     )
 
 
-@router.post("/admin/reset-password", response_model=ResetPasswordResponse)
-def admin_reset_password(
+@router.post("/admin/reset-password", response_model=ResetPasswordResponse, dependencies=[Depends(otp_rate_limit)])
+async def admin_reset_password(
     payload: ResetPasswordRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Admin reset password - Reset password using OTP code."""
-    user = db.query(User).filter(
+    user = await db.scalar(select(User).where(
         User.email == payload.email,
         User.role == UserRole.ADMIN
-    ).first()
+    ))
     
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     
     # Verify OTP
-    if not is_otp_valid(payload.otp_code, user.otp_code, user.otp_expires_at):
+    if not await otp_store.verify(db, payload.email, payload.otp_code):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid or expired OTP code")
     
-    # Update password and clear OTP
-    user.hashed_password = get_password_hash(payload.new_password)
-    user.otp_code = None
-    user.otp_expires_at = None
-    db.commit()
+    # Update password (the OTP was consumed by the check above)
+    user.hashed_password = await password_hasher.hash(payload.new_password)
+    await db.commit()
+    principal_cache.invalidate(user.id)
     
     return ResetPasswordResponse(
         message="Password reset successfully"
     )
 
 
-@router.post("/admin/resend-otp", response_model=ResendOTPResponse)
-def admin_resend_otp(
+@router.post("/admin/resend-otp", response_model=ResendOTPResponse, dependencies=[Depends(otp_rate_limit)])
+async def admin_resend_otp(
     payload: ResendOTPRequest,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Admin resend OTP - Resend OTP code for verification."""
-    user = db.query(User).filter(
+    user = await db.scalar(select(User).where(
         User.email == payload.email,
         User.role == UserRole.ADMIN
-    ).first()
+    ))
     
     if not user:
         # Don't reveal if email exists for security
@@ -314,14 +329,9 @@ def admin_resend_otp(
             message="If the email exists, an OTP code has been sent."
         )
     
-    # Generate new OTP
-    otp_code = generate_otp()
-    otp_expires_at = datetime.utcnow() + timedelta(minutes=settings.otp_validity_minutes)
-    
-    # Update user with new OTP
-    user.otp_code = otp_code
-    user.otp_expires_at = otp_expires_at
-    db.commit()
+    # Generate new OTP (replaces any previous code; the user row is not written)
+    otp_code = await otp_store.issue(db, payload.email)
+    await db.commit()
     
     # Send OTP email
     notification = EmailNotification(
@@ -337,7 +347,7 @@ def admin_resend_otp(
 
 
 @router.get("/me", response_model=UserResponse)
-def get_me(current_user: User = Depends(get_current_user)):
+async def get_me(current_user: User = Depends(get_current_user)):
     """Get current authenticated user information."""
     return current_user
 
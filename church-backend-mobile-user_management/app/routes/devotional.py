@@ -1,51 +1,68 @@
-from typing import List
+from typing import Any, List, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Path, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Body, Depends, HTTPException, Path, status
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..auth.dependencies import require_roles
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..models.devotional import Devotional
+from ..models.sermon import Sermon
 from ..models.user import User
+from ..schemas.bulk import BulkDelete, BulkResponse
 from ..schemas.enums import UserRole
+from ..schemas.pagination import Page
 from ..schemas.devotional import (
     DevotionalCreate,
     DevotionalResponse,
     DevotionalUpdate,
     DevotionalCountResponse,
 )
+from ..utils.bulk import BulkResults, bulk_write, existing_ids, unique_ids, validate_items, validate_updates
+from ..utils.counters import adjust_counters, get_count
+from ..utils.ids import new_id
+from ..utils.pagination import PageParams, fetch_page
+from ..utils.writes import update_returning
 
 router = APIRouter(prefix="/devotional", tags=["devotional"])
 
 
-@router.get("/list", response_model=List[DevotionalResponse])
-def get_all_devotionals(
-    db: Session = Depends(get_db),
+@router.get("/list", response_model=Union[List[DevotionalResponse], Page[DevotionalResponse]])
+async def get_all_devotionals(
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
-    """Get all devotionals. Accessible by Admin."""
-    devotionals = db.query(Devotional).order_by(Devotional.date.desc()).all()
-    return devotionals
+    """Get all devotionals, newest first. Accessible by Admin.
+
+    Pass ``limit`` (and then ``cursor``) to page through them.
+    """
+    devotionals, next_cursor = await fetch_page(
+        db, select(Devotional), (Devotional.date, Devotional.id), page, descending=True
+    )
+    if not page.paginated:
+        return devotionals
+    return Page(items=devotionals, next_cursor=next_cursor)
 
 
 @router.get("/count", response_model=DevotionalCountResponse)
-def get_devotional_count(
-    db: Session = Depends(get_db),
+async def get_devotional_count(
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
     """Get the total count of devotionals. Accessible by Admin."""
-    count = db.query(Devotional).count()
+    count = await get_count(db, "devotionals")
     return DevotionalCountResponse(total=count)
 
 
 @router.get("/{devotional_id}", response_model=DevotionalResponse)
-def get_devotional(
+async def get_devotional(
     devotional_id: str = Path(..., description="The ID (UUID) of the devotional"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
     """Get a devotional by ID. Accessible by Admin."""
-    devotional = db.query(Devotional).filter(Devotional.id == devotional_id).first()
+    devotional = await db.scalar(select(Devotional).where(Devotional.id == devotional_id))
     if not devotional:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Devotional not found"
@@ -54,12 +71,13 @@ def get_devotional(
 
 
 @router.post("/create", response_model=DevotionalResponse, status_code=status.HTTP_201_CREATED)
-def create_devotional(
+async def create_devotional(
     payload: DevotionalCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
     """Create a new devotional. Admin only."""
+    await _check_sermon(db, payload)
     devotional = Devotional(
         title=payload.title,
         date=payload.date,
@@ -69,54 +87,142 @@ def create_devotional(
         created_by_id=current_user.id,
     )
     db.add(devotional)
-    db.commit()
-    db.refresh(devotional)
+    await db.commit()
     return devotional
 
 
 @router.put("/update/{devotional_id}", response_model=DevotionalResponse)
-def update_devotional(
+async def update_devotional(
     devotional_id: str = Path(..., description="The ID (UUID) of the devotional"),
     payload: DevotionalUpdate = ...,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
     """Update a devotional. Admin only."""
-    devotional = db.query(Devotional).filter(Devotional.id == devotional_id).first()
+    await _check_sermon(db, payload)
+    # Update fields if provided, returning the updated row in the same statement
+    devotional = await update_returning(db, Devotional, devotional_id, payload.model_dump(exclude_none=True))
     if not devotional:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Devotional not found"
         )
-
-    # Update fields if provided
-    if payload.title is not None:
-        devotional.title = payload.title
-    if payload.date is not None:
-        devotional.date = payload.date
-    if payload.passage is not None:
-        devotional.passage = payload.passage
-    if payload.leader is not None:
-        devotional.leader = payload.leader
-    if payload.sermon_id is not None:
-        devotional.sermon_id = payload.sermon_id
-
-    db.commit()
-    db.refresh(devotional)
+    await db.commit()
     return devotional
 
 
 @router.delete("/delete/{devotional_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_devotional(
+async def delete_devotional(
     devotional_id: str = Path(..., description="The ID (UUID) of the devotional"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
     """Delete a devotional. Admin only."""
-    devotional = db.query(Devotional).filter(Devotional.id == devotional_id).first()
+    devotional = await db.scalar(select(Devotional).where(Devotional.id == devotional_id))
     if not devotional:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Devotional not found"
         )
-    db.delete(devotional)
-    db.commit()
+    await db.delete(devotional)
+    await db.commit()
+
+
+async def _missing_sermons(db: AsyncSession, payloads) -> set:
+    """sermon_id values among ``payloads`` that match no sermon."""
+    wanted = {payload.sermon_id for payload in payloads if payload.sermon_id is not None}
+    return wanted - await existing_ids(db, Sermon.id, wanted)
+
+
+async def _check_sermon(db: AsyncSession, payload) -> None:
+    """404 if ``payload`` references a sermon that does not exist."""
+    if payload.sermon_id is not None and await _missing_sermons(db, [payload]):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=f"Sermon with id {payload.sermon_id} not found"
+        )
+
 
+@router.post("/bulk/create", response_model=BulkResponse)
+async def bulk_create_devotionals(
+    items: List[Any] = Body(..., description="Devotionals to create, each with the fields of /create"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_roles(UserRole.ADMIN)),
+):
+    """Create several devotionals in one transaction. Admin only.
+
+    Invalid items, and items whose sermon_id matches no sermon, are skipped and
+    reported; the rest are inserted together.
+    """
+    results = BulkResults()
+    valid = validate_items(items, DevotionalCreate, results)
+    missing = await _missing_sermons(db, [payload for _, payload in valid])
+
+    rows = []
+    for index, payload in valid:
+        if payload.sermon_id in missing:
+            results.fail(index, status.HTTP_404_NOT_FOUND, f"Sermon with id {payload.sermon_id} not found")
+            continue
+        devotional_id = new_id()
+        rows.append({"id": devotional_id, **payload.model_dump(), "created_by_id": current_user.id})
+        results.ok(index, devotional_id, status.HTTP_201_CREATED)
+
+    if rows:
+        async with bulk_write(db):
+            await db.execute(insert(Devotional), rows)
+            await adjust_counters(db, {"devotionals": len(rows)})
+    return results.response()
+
+
+@router.put("/bulk/update", response_model=BulkResponse)
+async def bulk_update_devotionals(
+    items: List[Any] = Body(..., description="Updates, each an \"id\" plus the fields of /update"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_roles(UserRole.ADMIN)),
+):
+    """Update several devotionals in one transaction. Admin only."""
+    results = BulkResults()
+    updates = validate_updates(items, DevotionalUpdate, results)
+    found = await existing_ids(db, Devotional.id, [devotional_id for _, devotional_id, _ in updates])
+    missing = await _missing_sermons(db, [payload for _, _, payload in updates])
+
+    rows = []
+    for index, devotional_id, payload in updates:
+        if devotional_id not in found:
+            results.fail(index, status.HTTP_404_NOT_FOUND, "Devotional not found", id=devotional_id)
+            continue
+        if payload.sermon_id in missing:
+            results.fail(
+                index, status.HTTP_404_NOT_FOUND, f"Sermon with id {payload.sermon_id} not found", id=devotional_id
+            )
+            continue
+        rows.append({"id": devotional_id, **payload.model_dump(exclude_none=True)})
+        results.ok(index, devotional_id)
+
+    if rows:
+        async with bulk_write(db):
+            await db.execute(update(Devotional), rows)
+    return results.response()
+
+
+@router.delete("/bulk/delete", response_model=BulkResponse)
+async def bulk_delete_devotionals(
+    payload: BulkDelete,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_roles(UserRole.ADMIN)),
+):
+    """Delete several devotionals in one transaction. Admin only."""
+    results = BulkResults()
+    requested = unique_ids(payload.ids, results)
+    found = await existing_ids(db, Devotional.id, [devotional_id for _, devotional_id in requested])
+
+    doomed = []
+    for index, devotional_id in requested:
+        if devotional_id not in found:
+            results.fail(index, status.HTTP_404_NOT_FOUND, "Devotional not found", id=devotional_id)
+            continue
+        doomed.append(devotional_id)
+        results.ok(index, devotional_id, status.HTTP_204_NO_CONTENT)
+
+    if doomed:
+        async with bulk_write(db):
+            await db.execute(delete(Devotional).where(Devotional.id.in_(doomed)))
+            await adjust_counters(db, {"devotionals": -len(doomed)})
+    return results.response()
@@ -0,0 +1,47 @@
+"""
+Internal Routes
+
+Operational endpoints for superadmins (pool metrics, slow queries and similar
+diagnostics).
+"""
+from fastapi import APIRouter, Depends
+
+from ..auth.dependencies import require_roles
+from ..config import settings
+from ..database import engine, replica_engines, writer_engine
+from ..models.user import User
+from ..schemas.enums import UserRole
+from ..utils.slow_queries import slow_query_log
+
+router = APIRouter(prefix="/internal", tags=["internal"])
+
+
+@router.get("/db/pool")
+async def get_pool_metrics(
+    current_user: User = Depends(require_roles(UserRole.SUPERADMIN)),
+):
+    """Connection pool state for this worker: checked-out connections, overflow,
+    checkout wait times and timeouts. Replica pools are listed under ``replicas``,
+    the SQLite profile's writer queue under ``writer``."""
+    metrics = _pool_metrics(engine)
+    if writer_engine is not None:
+        metrics["writer"] = _pool_metrics(writer_engine)
+    if replica_engines:
+        metrics["replicas"] = [_pool_metrics(replica) for replica in replica_engines]
+    return metrics
+
+
+@router.get("/db/slow-queries")
+async def get_slow_queries(
+    current_user: User = Depends(require_roles(UserRole.SUPERADMIN)),
+):
+    """Recent statements above SLOW_QUERY_THRESHOLD_MS in this worker, newest first,
+    with their query plans once captured."""
+    return {"threshold_ms": settings.slow_query_threshold_ms, "queries": slow_query_log.recent()}
+
+
+def _pool_metrics(db_engine) -> dict:
+    pool = db_engine.pool
+    if not hasattr(pool, "metrics"):
+        return {"pool_class": type(pool).__name__}
+    return {"pool_class": type(pool).__name__, **pool.metrics()}
@@ -3,35 +3,45 @@ Permissions Routes
 
 API endpoints for managing user permissions from user_management table.
 """
-from typing import List
+from typing import List, Union
 
 from fastapi import APIRouter, Depends, HTTPException, Path, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..auth.cache import principal_cache
+from ..auth.epochs import bump_token_epoch
 from ..auth.dependencies import require_roles
 from ..database import get_db
 from ..models.user import User
 from ..models.user_management import UserManagement
 from ..schemas.enums import UserRole
+from ..schemas.pagination import Page
 from ..schemas.permissions import PermissionResponse, PermissionUpdate
+from ..utils.pagination import PageParams, fetch_page
 
 router = APIRouter(prefix="/permissions", tags=["permissions"])
 
 
-@router.get("/list", response_model=List[PermissionResponse])
-def list_permissions(
-    db: Session = Depends(get_db),
+@router.get("/list", response_model=Union[List[PermissionResponse], Page[PermissionResponse]])
+async def list_permissions(
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
-    """List all users with their permissions from user_management table.
+    """List all users with their permissions from user_management table, by email.
     
-    Only Lead Pastor (Admin) can view all permissions.
+    Only Lead Pastor (Admin) can view all permissions. Pass ``limit`` (and then
+    ``cursor``) to page through them.
     """
-    users = db.query(UserManagement).filter(
-        UserManagement.role != UserRole.SUPERADMIN
-    ).order_by(UserManagement.email).all()
+    users, next_cursor = await fetch_page(
+        db,
+        select(UserManagement).where(UserManagement.role != UserRole.SUPERADMIN),
+        (UserManagement.email,),
+        page,
+    )
     
-    return [
+    permissions = [
         PermissionResponse(
             user_id=user.id,
             user_email=user.email,
@@ -41,19 +51,22 @@ def list_permissions(
         )
         for user in users
     ]
+    if not page.paginated:
+        return permissions
+    return Page(items=permissions, next_cursor=next_cursor)
 
 
 @router.get("/list/{user_id}", response_model=PermissionResponse)
-def get_user_permissions(
+async def get_user_permissions(
     user_id: str = Path(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
     """Get permissions for a specific user from user_management table.
     
     Only Lead Pastor (Admin) can view user permissions.
     """
-    user = db.query(UserManagement).filter(UserManagement.id == user_id).first()
+    user = await db.scalar(select(UserManagement).where(UserManagement.id == user_id))
     if not user:
         raise HTTPException(
             status_code=404,
@@ -77,17 +90,17 @@ def get_user_permissions(
 
 
 @router.put("/update/{user_id}", response_model=PermissionResponse)
-def update_permissions(
+async def update_permissions(
     user_id: str,
     payload: PermissionUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
     """Update permissions for a user in user_management table.
     
     Only Lead Pastor (Admin) can update permissions.
     """
-    user = db.query(UserManagement).filter(UserManagement.id == user_id).first()
+    user = await db.scalar(select(UserManagement).where(UserManagement.id == user_id))
     if not user:
         raise HTTPException(
             status_code=404,
@@ -101,10 +114,11 @@ def update_permissions(
             detail="Cannot update superadmin permissions"
         )
     
-    # Update permissions
+    # Update permissions; tokens carrying the old permissions are revoked
     user.permissions = payload.permissions
-    db.commit()
-    db.refresh(user)
+    await bump_token_epoch(db, user.id)
+    await db.commit()
+    principal_cache.invalidate(user.id)
     
     return PermissionResponse(
         user_id=user.id,
@@ -116,9 +130,9 @@ def update_permissions(
 
 
 @router.get("/by-role/{role}", response_model=List[PermissionResponse])
-def list_permissions_by_role(
+async def list_permissions_by_role(
     role: UserRole = Path(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
     """List permissions for all users with a specific role.
@@ -132,7 +146,7 @@ def list_permissions_by_role(
             detail="Cannot list superadmin permissions"
         )
     
-    users = db.query(UserManagement).filter(UserManagement.role == role).all()
+    users = (await db.scalars(select(UserManagement).where(UserManagement.role == role).order_by(UserManagement.email))).all()
     
     return [
         PermissionResponse(
@@ -1,20 +1,20 @@
 from datetime import timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..auth.security import create_access_token, create_refresh_token, verify_refresh_token
+from ..auth.principals import resolve_principal
+from ..auth.refresh_tokens import consume_refresh_token, issue_refresh_token
+from ..auth.security import create_access_token, verify_refresh_token
 from ..config import settings
 from ..database import get_db
-from ..models.user import User
-from ..models.user_management import UserManagement
 from ..schemas.auth import RefreshTokenRequest, RefreshTokenResponse
 
 router = APIRouter(prefix="/refresh", tags=["Refresh Token"])
 
 
 @router.post("/", response_model=RefreshTokenResponse)
-def refresh_token(payload: RefreshTokenRequest, db: Session = Depends(get_db)):
+async def refresh_token(payload: RefreshTokenRequest, db: AsyncSession = Depends(get_db)):
     """
     Refresh access token using refresh token.
     
@@ -22,6 +22,8 @@ def refresh_token(payload: RefreshTokenRequest, db: Session = Depends(get_db)):
     without needing to log in again. The refresh token must be valid and not expired.
     
     Returns a new access token and a new refresh token (token rotation for security).
+    Each refresh token can be used once; presenting a used token again revokes
+    every token in its family, forcing a new login.
     """
     # Verify the refresh token
     refresh_token_payload = verify_refresh_token(payload.refresh_token)
@@ -31,33 +33,51 @@ def refresh_token(payload: RefreshTokenRequest, db: Session = Depends(get_db)):
             detail="Invalid or expired refresh token"
         )
     
+    # Single-use check: marks the token as used, or detects reuse and revokes the family
+    if not await consume_refresh_token(db, refresh_token_payload):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, 
+            detail="Invalid or expired refresh token"
+        )
+    
     # Extract user ID from refresh token (UUID as string)
     user_id = refresh_token_payload["sub"]
     
-    # Verify user exists and is active (check both tables)
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user or not user.is_active:
-        # Check user_management table
-        user = db.query(UserManagement).filter(UserManagement.id == user_id).first()
-        if not user or not user.is_active:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED, 
-                detail="User not found or inactive"
-            )
+    # Verify user exists and is active (both tables, single query), and fetch
+    # the current permissions and token epoch for the new tokens
+    resolved = await resolve_principal(db, user_id=user_id, active_only=True, with_claims=True)
+    if not resolved:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, 
+            detail="User not found or inactive"
+        )
+    
+    # Refresh tokens issued before the user's tokens were revoked are rejected
+    if refresh_token_payload.get("ep", 0) != resolved.token_epoch:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, 
+            detail="Invalid or expired refresh token"
+        )
+    user = resolved.user
     
     # Create new access token
     access_token = create_access_token(
         subject=str(user.id),
         role=user.role.value,
         expires_delta=timedelta(minutes=settings.access_token_expire_minutes),
+        permissions=resolved.permissions,
+        epoch=resolved.token_epoch,
     )
     
     # Create new refresh token (token rotation for security)
-    new_refresh_token = create_refresh_token(
-        subject=str(user.id),
-        role=user.role.value,
-        expires_delta=timedelta(days=settings.refresh_token_expire_days),
+    new_refresh_token = issue_refresh_token(
+        db,
+        user.id,
+        user.role.value,
+        epoch=resolved.token_epoch,
+        family_id=refresh_token_payload["fam"],
     )
+    await db.commit()
     
     return RefreshTokenResponse(
         access_token=access_token,
@@ -1,57 +1,69 @@
-from typing import List
+from typing import Any, List, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Path, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Body, Depends, HTTPException, Path, status
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from ..auth.dependencies import get_current_user, require_roles
-from ..database import get_db
-from ..models.series import Series
+from ..database import get_db, get_read_db
+from ..models.series import Series, series_sermons
 from ..models.sermon import Sermon
 from ..models.user import User
+from ..schemas.bulk import BulkDelete, BulkResponse
 from ..schemas.enums import UserRole
+from ..schemas.pagination import Page
 from ..schemas.series import SeriesCreate, SeriesResponse, SeriesUpdate, SeriesCountResponse, SeriesCreateResponse, SeriesInsertSermons, SeriesDeleteSermons, SeriesDetailResponse, SeriesSermonsResponse
 from ..schemas.sermon import SermonResponse
+from ..utils.bulk import BulkResults, bulk_write, existing_ids, unique_ids, validate_items, validate_updates
+from ..utils.counters import adjust_counters, get_count
+from ..utils.ids import new_id
+from ..utils.pagination import PageParams, fetch_page
 
 router = APIRouter(prefix="/series", tags=["series"])
 
 
-@router.get("/list", response_model=List[SeriesResponse])
-def get_all_series(
-    db: Session = Depends(get_db),
+@router.get("/list", response_model=Union[List[SeriesResponse], Page[SeriesResponse]])
+async def get_all_series(
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Get all series. Accessible by all authenticated users."""
-    from sqlalchemy.orm import joinedload
-    series = db.query(Series).options(joinedload(Series.sermons)).order_by(Series.from_date.desc()).all()
-    return series
+    """Get all series, latest first. Accessible by all authenticated users.
+
+    Pass ``limit`` (and then ``cursor``) to page through them.
+    """
+    query = select(Series).options(selectinload(Series.sermons))
+    series, next_cursor = await fetch_page(db, query, (Series.from_date, Series.id), page, descending=True)
+    if not page.paginated:
+        return series
+    return Page(items=series, next_cursor=next_cursor)
 
 
 @router.get("/count", response_model=SeriesCountResponse)
-def get_series_count(
-    db: Session = Depends(get_db),
+async def get_series_count(
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get the total count of series. Accessible by all authenticated users."""
-    count = db.query(Series).count()
+    count = await get_count(db, "series")
     return SeriesCountResponse(total=count)
 
 
 @router.get("/{series_id}/sermons", response_model=SeriesSermonsResponse)
-def get_series_sermons(
+async def get_series_sermons(
     series_id: str = Path(..., description="The ID (UUID) of the series"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get access and available sermons for a series. Accessible by all authenticated users."""
-    from sqlalchemy.orm import joinedload
-    
     # Get the series with its sermons
-    series = db.query(Series).options(joinedload(Series.sermons)).filter(Series.id == series_id).first()
+    series = await db.scalar(select(Series).options(selectinload(Series.sermons)).where(Series.id == series_id))
     if not series:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Series not found")
     
     # Get all sermons from the database
-    all_sermons = db.query(Sermon).all()
+    all_sermons = (await db.scalars(select(Sermon).order_by(Sermon.date.desc()))).all()
     
     # Get sermon IDs that are in the series
     series_sermon_ids = {sermon.id for sermon in series.sermons}
@@ -71,21 +83,19 @@ def get_series_sermons(
 
 
 @router.get("/{series_id}", response_model=SeriesDetailResponse)
-def get_series(
+async def get_series(
     series_id: str = Path(..., description="The ID (UUID) of the series"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get a series by ID with access and available sermons. Accessible by all authenticated users."""
-    from sqlalchemy.orm import joinedload
-    
     # Get the series with its sermons
-    series = db.query(Series).options(joinedload(Series.sermons)).filter(Series.id == series_id).first()
+    series = await db.scalar(select(Series).options(selectinload(Series.sermons)).where(Series.id == series_id))
     if not series:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Series not found")
     
     # Get all sermons from the database
-    all_sermons = db.query(Sermon).all()
+    all_sermons = (await db.scalars(select(Sermon).order_by(Sermon.date.desc()))).all()
     
     # Get sermon IDs that are in the series
     series_sermon_ids = {sermon.id for sermon in series.sermons}
@@ -114,9 +124,9 @@ def get_series(
 
 
 @router.post("/create", response_model=SeriesCreateResponse, status_code=status.HTTP_201_CREATED)
-def create_series(
+async def create_series(
     payload: SeriesCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
     """Create a new series. Admin only."""
@@ -130,9 +140,9 @@ def create_series(
     # Validate sermons_id if provided
     sermons_list = []
     if payload.sermons_id is not None and len(payload.sermons_id) > 0:
-        # Validate all sermon IDs exist
-        for sermon_id in payload.sermons_id:
-            sermon = db.query(Sermon).filter(Sermon.id == sermon_id).first()
+        # Validate all sermon IDs exist (IDs are canonical; each is linked once)
+        for sermon_id in dict.fromkeys(payload.sermons_id):
+            sermon = await db.scalar(select(Sermon).where(Sermon.id == sermon_id))
             if not sermon:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -157,17 +167,13 @@ def create_series(
         created_by_id=admin_user_id,  # Always set to admin user ID
     )
     
-    # Add sermons to the series (many-to-many relationship)
-    if sermons_list:
-        series.sermons = sermons_list
+    # Add sermons to the series (many-to-many relationship); assigned even
+    # when empty, so the response reads the collection without a lazy load
+    series.sermons = sermons_list
     
     db.add(series)
-    db.commit()
-    db.refresh(series)
+    await db.commit()
     
-    # Reload series with sermons to ensure we have the latest data
-    db.refresh(series)
-    # Eagerly load sermons
     sermons_data = [SermonResponse.model_validate(sermon) for sermon in series.sermons]
     
     # Return response with full sermon details
@@ -186,14 +192,15 @@ def create_series(
 
 
 @router.put("/update/{series_id}", response_model=SeriesResponse)
-def update_series(
+async def update_series(
     series_id: str = Path(..., description="The ID (UUID) of the series"),
     payload: SeriesUpdate = ...,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
     """Update a series. Admin only."""
-    series = db.query(Series).filter(Series.id == series_id).first()
+    # Sermons are part of the response (lazy loading is not available under asyncio)
+    series = await db.scalar(select(Series).options(selectinload(Series.sermons)).where(Series.id == series_id))
     if not series:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Series not found")
 
@@ -216,23 +223,20 @@ def update_series(
             detail="from_date must be before or equal to to_date"
         )
 
-    db.commit()
-    db.refresh(series)
+    await db.commit()
     return series
 
 
 @router.post("/insert/{series_id}/", response_model=SeriesResponse, status_code=status.HTTP_200_OK)
-def insert_sermons_to_series(
+async def insert_sermons_to_series(
     series_id: str = Path(..., description="The ID (UUID) of the series"),
     payload: SeriesInsertSermons = ...,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
     """Insert sermons into an existing series. Admin only."""
-    from sqlalchemy.orm import joinedload
-    
     # Get the series
-    series = db.query(Series).options(joinedload(Series.sermons)).filter(Series.id == series_id).first()
+    series = await db.scalar(select(Series).options(selectinload(Series.sermons)).where(Series.id == series_id))
     if not series:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Series not found")
     
@@ -242,11 +246,12 @@ def insert_sermons_to_series(
     # Validate all sermon IDs exist and collect new sermons
     new_sermons = []
     for sermon_id in payload.sermons_id:
-        # Skip if already in the series
+        # Skip if already in the series (or earlier in this request); IDs are canonical
         if sermon_id in existing_sermon_ids:
             continue
+        existing_sermon_ids.add(sermon_id)
         
-        sermon = db.query(Sermon).filter(Sermon.id == sermon_id).first()
+        sermon = await db.scalar(select(Sermon).where(Sermon.id == sermon_id))
         if not sermon:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -257,26 +262,21 @@ def insert_sermons_to_series(
     # Add new sermons to the series (append to existing ones)
     if new_sermons:
         series.sermons.extend(new_sermons)
-        db.commit()
-        db.refresh(series)
-        # Reload with sermons
-        db.refresh(series)
+        await db.commit()
     
     return series
 
 
 @router.delete("/{series_id}/sermons", response_model=SeriesResponse, status_code=status.HTTP_200_OK)
-def delete_sermons_from_series(
+async def delete_sermons_from_series(
     series_id: str = Path(..., description="The ID (UUID) of the series"),
     payload: SeriesDeleteSermons = ...,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
     """Delete sermons from an existing series. Admin only."""
-    from sqlalchemy.orm import joinedload
-    
     # Get the series with sermons
-    series = db.query(Series).options(joinedload(Series.sermons)).filter(Series.id == series_id).first()
+    series = await db.scalar(select(Series).options(selectinload(Series.sermons)).where(Series.id == series_id))
     if not series:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Series not found")
     
@@ -285,7 +285,7 @@ def delete_sermons_from_series(
     
     # Validate all sermon IDs exist in the series and collect sermons to remove
     sermons_to_remove = []
-    for sermon_id in payload.sermons_id:
+    for sermon_id in dict.fromkeys(payload.sermons_id):
         if sermon_id not in existing_sermon_ids:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -300,24 +300,128 @@ def delete_sermons_from_series(
     if sermons_to_remove:
         for sermon in sermons_to_remove:
             series.sermons.remove(sermon)
-        db.commit()
-        db.refresh(series)
-        # Reload with sermons
-        db.refresh(series)
+        await db.commit()
     
     return series
 
 
 @router.delete("/delete/{series_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_series(
+async def delete_series(
     series_id: str = Path(..., description="The ID (UUID) of the series"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
     """Delete a series. Admin only."""
-    series = db.query(Series).filter(Series.id == series_id).first()
+    series = await db.scalar(select(Series).where(Series.id == series_id))
     if not series:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Series not found")
-    db.delete(series)
-    db.commit()
+    await db.delete(series)
+    await db.commit()
+
+
+@router.post("/bulk/create", response_model=BulkResponse)
+async def bulk_create_series(
+    items: List[Any] = Body(..., description="Series to create, each with the fields of /create"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_roles(UserRole.ADMIN)),
+):
+    """Create several series, with their sermon links, in one transaction. Admin only.
+
+    Invalid items (bad dates, unknown sermon IDs) are skipped and reported; the
+    rest are inserted together.
+    """
+    results = BulkResults()
+    valid = validate_items(items, SeriesCreate, results)
+    sermon_ids = {}
+    for index, payload in valid:
+        # Keep the first occurrence of each sermon, in request order
+        sermon_ids[index] = list(dict.fromkeys(payload.sermons_id or []))
+    found = await existing_ids(db, Sermon.id, {sermon_id for ids in sermon_ids.values() for sermon_id in ids})
+
+    rows, links = [], []
+    for index, payload in valid:
+        if payload.from_date > payload.to_date:
+            results.fail(index, status.HTTP_400_BAD_REQUEST, "from_date must be before or equal to to_date")
+            continue
+        missing = [sermon_id for sermon_id in sermon_ids[index] if sermon_id not in found]
+        if missing:
+            results.fail(index, status.HTTP_404_NOT_FOUND, f"Sermon with id {missing[0]} not found")
+            continue
+        series_id = new_id()
+        rows.append({"id": series_id, **payload.model_dump(exclude={"sermons_id"}), "created_by_id": current_user.id})
+        links.extend({"series_id": series_id, "sermon_id": sermon_id} for sermon_id in sermon_ids[index])
+        results.ok(index, series_id, status.HTTP_201_CREATED)
+
+    if rows:
+        async with bulk_write(db):
+            await db.execute(insert(Series), rows)
+            if links:
+                await db.execute(insert(series_sermons), links)
+            await adjust_counters(db, {"series": len(rows)})
+    return results.response()
+
+
+@router.put("/bulk/update", response_model=BulkResponse)
+async def bulk_update_series(
+    items: List[Any] = Body(..., description="Updates, each an \"id\" plus the fields of /update"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_roles(UserRole.ADMIN)),
+):
+    """Update several series in one transaction. Admin only."""
+    results = BulkResults()
+    updates = validate_updates(items, SeriesUpdate, results)
+    # Current dates, to check the range when an item changes only one end
+    ids = [series_id for _, series_id, _ in updates]
+    current = {
+        row.id: row
+        for row in (await db.execute(
+            select(Series.id, Series.from_date, Series.to_date).where(Series.id.in_(ids))
+        )).all()
+    } if ids else {}
+
+    rows = []
+    for index, series_id, payload in updates:
+        existing = current.get(series_id)
+        if existing is None:
+            results.fail(index, status.HTTP_404_NOT_FOUND, "Series not found", id=series_id)
+            continue
+        from_date = payload.from_date or existing.from_date
+        to_date = payload.to_date or existing.to_date
+        if from_date > to_date:
+            results.fail(index, status.HTTP_400_BAD_REQUEST, "from_date must be before or equal to to_date", id=series_id)
+            continue
+        rows.append({"id": series_id, **payload.model_dump(exclude_none=True)})
+        results.ok(index, series_id)
+
+    if rows:
+        async with bulk_write(db):
+            await db.execute(update(Series), rows)
+    return results.response()
+
+
+@router.delete("/bulk/delete", response_model=BulkResponse)
+async def bulk_delete_series(
+    payload: BulkDelete,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_roles(UserRole.ADMIN)),
+):
+    """Delete several series in one transaction. Admin only."""
+    results = BulkResults()
+    requested = unique_ids(payload.ids, results)
+    found = await existing_ids(db, Series.id, [series_id for _, series_id in requested])
+
+    doomed = []
+    for index, series_id in requested:
+        if series_id not in found:
+            results.fail(index, status.HTTP_404_NOT_FOUND, "Series not found", id=series_id)
+            continue
+        doomed.append(series_id)
+        results.ok(index, series_id, status.HTTP_204_NO_CONTENT)
 
+    if doomed:
+        async with bulk_write(db):
+            # The single delete drops sermon links through the relationship
+            await db.execute(delete(series_sermons).where(series_sermons.c.series_id.in_(doomed)))
+            await db.execute(delete(Series).where(Series.id.in_(doomed)))
+            await adjust_counters(db, {"series": -len(doomed)})
+    return results.response()
@@ -1,57 +1,72 @@
-from typing import List
+from typing import Any, List, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Path, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Body, Depends, HTTPException, Path, status
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..auth.dependencies import require_roles
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..models.sermon import Sermon
-from ..models.series import Series
+from ..models.series import Series, series_sermons
+from ..models.devotional import Devotional
 from ..models.existing_series import ExistingSeries
 from ..models.user import User
+from ..schemas.bulk import BulkDelete, BulkResponse
 from ..schemas.enums import UserRole
+from ..schemas.pagination import Page
 from ..schemas.sermon import SermonCreate, SermonResponse, SermonUpdate, SermonCountResponse, ExistingSeriesAssociate, ExistingSeriesResponse
+from ..utils.bulk import BulkResults, bulk_write, existing_ids, unique_ids, validate_items, validate_updates
+from ..utils.counters import adjust_counters, get_count
+from ..utils.ids import new_id
+from ..utils.pagination import PageParams, fetch_page
+from ..utils.writes import update_returning
 
 router = APIRouter(prefix="/sermons", tags=["sermons"])
 
 
-@router.get("/list", response_model=List[SermonResponse])
-def get_all_sermons(
-    db: Session = Depends(get_db),
+@router.get("/list", response_model=Union[List[SermonResponse], Page[SermonResponse]])
+async def get_all_sermons(
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
-    """Get all sermons. Accessible by Admin."""
-    sermons = db.query(Sermon).order_by(Sermon.date.desc()).all()
-    return sermons
+    """Get all sermons, newest first. Accessible by Admin.
+
+    Pass ``limit`` (and then ``cursor``) to page through them.
+    """
+    sermons, next_cursor = await fetch_page(db, select(Sermon), (Sermon.date, Sermon.id), page, descending=True)
+    if not page.paginated:
+        return sermons
+    return Page(items=sermons, next_cursor=next_cursor)
 
 
 @router.get("/count", response_model=SermonCountResponse)
-def get_sermon_count(
-    db: Session = Depends(get_db),
+async def get_sermon_count(
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
     """Get the total count of sermons. Accessible by Admin."""
-    count = db.query(Sermon).count()
+    count = await get_count(db, "sermons")
     return SermonCountResponse(total=count)
 
 
 @router.get("/{sermon_id}", response_model=SermonResponse)
-def get_sermon(
+async def get_sermon(
     sermon_id: str = Path(..., description="The ID (UUID) of the sermon"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
     """Get a sermon by ID. Accessible by Admin."""
-    sermon = db.query(Sermon).filter(Sermon.id == sermon_id).first()
+    sermon = await db.scalar(select(Sermon).where(Sermon.id == sermon_id))
     if not sermon:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sermon not found")
     return sermon
 
 
 @router.post("/create", response_model=SermonResponse, status_code=status.HTTP_201_CREATED)
-def create_sermon(
+async def create_sermon(
     payload: SermonCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
     """Create a new sermon. Admin only."""
@@ -65,81 +80,149 @@ def create_sermon(
         created_by_id=current_user.id,
     )
     db.add(sermon)
-    db.commit()
-    db.refresh(sermon)
+    await db.commit()
     return sermon
 
 
 @router.put("/update/{sermon_id}", response_model=SermonResponse)
-def update_sermon(
+async def update_sermon(
     sermon_id: str = Path(..., description="The ID (UUID) of the sermon"),
     payload: SermonUpdate = ...,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
     """Update a sermon. Admin only."""
-    sermon = db.query(Sermon).filter(Sermon.id == sermon_id).first()
+    # Update fields if provided, returning the updated row in the same statement
+    sermon = await update_returning(db, Sermon, sermon_id, payload.model_dump(exclude_none=True))
     if not sermon:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sermon not found")
-
-    # Update fields if provided
-    if payload.date is not None:
-        sermon.date = payload.date
-    if payload.time is not None:
-        sermon.time = payload.time
-    if payload.speaker is not None:
-        sermon.speaker = payload.speaker
-    if payload.passage is not None:
-        sermon.passage = payload.passage
-    if payload.title is not None:
-        sermon.title = payload.title
-    if payload.description is not None:
-        sermon.description = payload.description
-
-    db.commit()
-    db.refresh(sermon)
+    await db.commit()
     return sermon
 
 
 @router.delete("/delete/{sermon_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_sermon(
+async def delete_sermon(
     sermon_id: str = Path(..., description="The ID (UUID) of the sermon"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
     """Delete a sermon. Admin only."""
-    sermon = db.query(Sermon).filter(Sermon.id == sermon_id).first()
+    sermon = await db.scalar(select(Sermon).where(Sermon.id == sermon_id))
     if not sermon:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sermon not found")
-    db.delete(sermon)
-    db.commit()
+    await db.delete(sermon)
+    await db.commit()
+
+
+@router.post("/bulk/create", response_model=BulkResponse)
+async def bulk_create_sermons(
+    items: List[Any] = Body(..., description="Sermons to create, each with the fields of /create"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_roles(UserRole.ADMIN)),
+):
+    """Create several sermons in one transaction. Admin only.
+
+    Invalid items are skipped and reported; the rest are inserted together.
+    """
+    results = BulkResults()
+    rows = []
+    for index, payload in validate_items(items, SermonCreate, results):
+        sermon_id = new_id()
+        rows.append({"id": sermon_id, **payload.model_dump(), "created_by_id": current_user.id})
+        results.ok(index, sermon_id, status.HTTP_201_CREATED)
+
+    if rows:
+        async with bulk_write(db):
+            await db.execute(insert(Sermon), rows)
+            await adjust_counters(db, {"sermons": len(rows)})
+    return results.response()
+
+
+@router.put("/bulk/update", response_model=BulkResponse)
+async def bulk_update_sermons(
+    items: List[Any] = Body(..., description="Updates, each an \"id\" plus the fields of /update"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_roles(UserRole.ADMIN)),
+):
+    """Update several sermons in one transaction. Admin only."""
+    results = BulkResults()
+    updates = validate_updates(items, SermonUpdate, results)
+    found = await existing_ids(db, Sermon.id, [sermon_id for _, sermon_id, _ in updates])
+
+    rows = []
+    for index, sermon_id, payload in updates:
+        if sermon_id not in found:
+            results.fail(index, status.HTTP_404_NOT_FOUND, "Sermon not found", id=sermon_id)
+            continue
+        rows.append({"id": sermon_id, **payload.model_dump(exclude_none=True)})
+        results.ok(index, sermon_id)
+
+    if rows:
+        async with bulk_write(db):
+            await db.execute(update(Sermon), rows)
+    return results.response()
+
+
+@router.delete("/bulk/delete", response_model=BulkResponse)
+async def bulk_delete_sermons(
+    payload: BulkDelete,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_roles(UserRole.ADMIN)),
+):
+    """Delete several sermons in one transaction. Admin only.
+
+    Sermons that devotionals still point to are reported as 409 and kept.
+    """
+    results = BulkResults()
+    requested = unique_ids(payload.ids, results)
+    candidates = [sermon_id for _, sermon_id in requested]
+    found = await existing_ids(db, Sermon.id, candidates)
+    referenced = await existing_ids(db, Devotional.sermon_id, candidates)
+
+    doomed = []
+    for index, sermon_id in requested:
+        if sermon_id not in found:
+            results.fail(index, status.HTTP_404_NOT_FOUND, "Sermon not found", id=sermon_id)
+        elif sermon_id in referenced:
+            results.fail(index, status.HTTP_409_CONFLICT, "Sermon is referenced by devotionals", id=sermon_id)
+        else:
+            doomed.append(sermon_id)
+            results.ok(index, sermon_id, status.HTTP_204_NO_CONTENT)
+
+    if doomed:
+        async with bulk_write(db):
+            # The single delete drops series links through the relationship
+            await db.execute(delete(series_sermons).where(series_sermons.c.sermon_id.in_(doomed)))
+            await db.execute(delete(Sermon).where(Sermon.id.in_(doomed)))
+            await adjust_counters(db, {"sermons": -len(doomed)})
+    return results.response()
 
 
 @router.post("/{sermons_id}/existing-series", response_model=SermonResponse, status_code=status.HTTP_200_OK)
-def associate_existing_series(
+async def associate_existing_series(
     sermons_id: str = Path(..., description="The ID (UUID) of the sermon"),
     payload: ExistingSeriesAssociate = ...,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
     """Associate an existing series with a sermon. Admin only."""
     from sqlalchemy.exc import IntegrityError
     
     # Verify sermon exists
-    sermon = db.query(Sermon).filter(Sermon.id == sermons_id).first()
+    sermon = await db.scalar(select(Sermon).where(Sermon.id == sermons_id))
     if not sermon:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sermon not found")
     
     # Verify series exists
-    series = db.query(Series).filter(Series.id == payload.series_id).first()
+    series = await db.scalar(select(Series).where(Series.id == payload.series_id))
     if not series:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Series not found")
     
     # Check if association already exists in existing_series table
-    existing_association = db.query(ExistingSeries).filter(
-        ExistingSeries.sermon_id == sermons_id,
+    existing_association = await db.scalar(select(ExistingSeries).where(
+        ExistingSeries.sermon_id == sermon.id,
         ExistingSeries.series_id == payload.series_id
-    ).first()
+    ))
     
     if existing_association:
         raise HTTPException(
@@ -150,44 +233,41 @@ def associate_existing_series(
     # Create new association in existing_series table
     try:
         existing_series_record = ExistingSeries(
-            sermon_id=sermons_id,
+            sermon_id=sermon.id,
             series_id=payload.series_id,
             created_by_id=current_user.id
         )
         db.add(existing_series_record)
-        db.commit()
-        db.refresh(existing_series_record)
+        await db.commit()
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Series is already associated with this sermon"
         )
     
-    # Refresh sermon to get latest data
-    db.refresh(sermon)
     return sermon
 
 
 @router.get("/{sermons_id}/existing-series", response_model=ExistingSeriesResponse)
-def get_unused_series(
+async def get_unused_series(
     sermons_id: str = Path(..., description="The ID (UUID) of the sermon"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
     """Get list of unused series IDs for a sermon. Accessible by Admin."""
     # Verify sermon exists
-    sermon = db.query(Sermon).filter(Sermon.id == sermons_id).first()
+    sermon = await db.scalar(select(Sermon).where(Sermon.id == sermons_id))
     if not sermon:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sermon not found")
     
     # Get all series from the database
-    all_series = db.query(Series).all()
+    all_series = (await db.scalars(select(Series).order_by(Series.from_date.desc()))).all()
     
     # Get series IDs that are already associated with the sermon in existing_series table
-    associated_series_records = db.query(ExistingSeries).filter(
+    associated_series_records = (await db.scalars(select(ExistingSeries).where(
         ExistingSeries.sermon_id == sermons_id
-    ).all()
+    ))).all()
     associated_series_ids = {record.series_id for record in associated_series_records}
     
     # Get unused series IDs (series not associated with the sermon)
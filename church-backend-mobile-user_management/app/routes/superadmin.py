@@ -1,16 +1,22 @@
-from typing import List
+from typing import List, Union
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Path, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..auth.cache import principal_cache
+from ..auth.epochs import bump_token_epoch
 from ..auth.dependencies import require_roles
-from ..auth.security import get_password_hash
+from ..auth.hashing import password_hasher
 from ..database import get_db
 from ..models.user import User
 from ..schemas.auth import EmailNotification
 from ..schemas.enums import UserRole
+from ..schemas.pagination import Page
 from ..schemas.user import UserCreate, UserResponse, UserUpdate
 from ..utils.email import send_email
+from ..utils.counters import get_count
+from ..utils.pagination import PageParams, fetch_page
 
 router = APIRouter(prefix="/superadmin", tags=["superadmin"])
 
@@ -25,25 +31,29 @@ def send_credentials_email(background_tasks: BackgroundTasks, email: str, passwo
     send_email(background_tasks, notification)
 
 
-@router.get("/admins/list", response_model=List[UserResponse])
-def list_admins(
-    db: Session = Depends(get_db),
+@router.get("/admins/list", response_model=Union[List[UserResponse], Page[UserResponse]])
+async def list_admins(
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.SUPERADMIN)),
 ):
-    """List Admins."""
-    admins = db.query(User).filter(User.role == UserRole.ADMIN).order_by(User.created_at.desc()).all()
-    return admins
+    """List Admins, newest first. Pass ``limit`` (and then ``cursor``) to page through them."""
+    query = select(User).where(User.role == UserRole.ADMIN)
+    admins, next_cursor = await fetch_page(db, query, (User.created_at, User.id), page, descending=True)
+    if not page.paginated:
+        return admins
+    return Page(items=admins, next_cursor=next_cursor)
 
 
 @router.post("/admins/create", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def create_admin(
+async def create_admin(
     payload: UserCreate,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.SUPERADMIN)),
 ):
     """Create Admin - Superadmin can only create Admin role users."""
-    if db.query(User).filter(User.email == payload.email).first():
+    if await db.scalar(select(User).where(User.email == payload.email)):
         raise HTTPException(status_code=400, detail="Email already registered")
 
     # Force role to ADMIN (superadmin can only create admins)
@@ -52,13 +62,12 @@ def create_admin(
         email=payload.email,
         first_name=payload.first_name,
         last_name=payload.last_name,
-        hashed_password=get_password_hash(raw_password),
+        hashed_password=await password_hasher.hash(raw_password),
         role=UserRole.ADMIN,  # Always set to ADMIN
         created_by_id=current_user.id,
     )
     db.add(admin)
-    db.commit()
-    db.refresh(admin)
+    await db.commit()
 
     send_credentials_email(background_tasks, payload.email, raw_password)
     
@@ -67,37 +76,37 @@ def create_admin(
 
 
 @router.get("/admins/count")
-def count_admins(
-    db: Session = Depends(get_db),
+async def count_admins(
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.SUPERADMIN)),
 ):
     """Count Admins."""
-    count = db.query(User).filter(User.role == UserRole.ADMIN).count()
+    count = await get_count(db, "admins")
     return {"count": count}
 
 
 @router.get("/admins/{admin_id}", response_model=UserResponse)
-def get_admin(
-    admin_id: int = Path(..., gt=0),
-    db: Session = Depends(get_db),
+async def get_admin(
+    admin_id: str = Path(..., description="The ID (UUID) of the admin"),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.SUPERADMIN)),
 ):
     """Get Admin."""
-    admin = db.query(User).filter(User.id == admin_id, User.role == UserRole.ADMIN).first()
+    admin = await db.scalar(select(User).where(User.id == admin_id, User.role == UserRole.ADMIN))
     if not admin:
         raise HTTPException(status_code=404, detail="Admin not found")
     return admin
 
 
 @router.put("/admins/update/{admin_id}", response_model=UserResponse)
-def update_admin(
-    admin_id: int,
+async def update_admin(
+    admin_id: str,
     payload: UserUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.SUPERADMIN)),
 ):
     """Update Admin."""
-    admin = db.query(User).filter(User.id == admin_id, User.role == UserRole.ADMIN).first()
+    admin = await db.scalar(select(User).where(User.id == admin_id, User.role == UserRole.ADMIN))
     if not admin:
         raise HTTPException(status_code=404, detail="Admin not found")
 
@@ -106,24 +115,29 @@ def update_admin(
     if payload.last_name:
         admin.last_name = payload.last_name
     if payload.password:
-        admin.hashed_password = get_password_hash(payload.password)
+        admin.hashed_password = await password_hasher.hash(payload.password)
     if payload.is_active is not None:
+        if admin.is_active and not payload.is_active:
+            # Deactivation revokes every token issued to the admin
+            await bump_token_epoch(db, admin.id)
         admin.is_active = payload.is_active
-    db.commit()
-    db.refresh(admin)
+    await db.commit()
+    principal_cache.invalidate(admin.id)
     return admin
 
 
 @router.delete("/admins/delete/{admin_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_admin(
-    admin_id: int,
-    db: Session = Depends(get_db),
+async def delete_admin(
+    admin_id: str,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.SUPERADMIN)),
 ):
     """Delete Admin."""
-    admin = db.query(User).filter(User.id == admin_id, User.role == UserRole.ADMIN).first()
+    admin = await db.scalar(select(User).where(User.id == admin_id, User.role == UserRole.ADMIN))
     if not admin:
         raise HTTPException(status_code=404, detail="Admin not found")
-    db.delete(admin)
-    db.commit()
+    await db.delete(admin)
+    await bump_token_epoch(db, admin.id)
+    await db.commit()
+    principal_cache.invalidate(admin.id)
 
@@ -1,22 +1,33 @@
-from typing import List
+import asyncio
+from typing import Any, List, Union
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Path, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, HTTPException, Path, status
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..auth.cache import principal_cache
+from ..auth.email_filter import known_emails
+from ..auth.epochs import bump_token_epoch, bump_token_epochs
 from ..auth.dependencies import require_roles
-from ..auth.security import generate_secure_password, get_password_hash
-from ..database import get_db
+from ..auth.hashing import password_hasher
+from ..auth.security import generate_secure_password
+from ..database import get_db, get_read_db
 from ..models.user import User
 from ..models.user_management import UserManagement
 from ..models.role import Role
 from ..schemas.auth import EmailNotification
+from ..schemas.bulk import BulkDelete, BulkResponse
 from ..schemas.enums import UserRole
+from ..schemas.pagination import Page
 from ..schemas.user import (
     UserManagementCreate,
     UserManagementResponse,
     UserManagementUpdate,
 )
+from ..utils.bulk import BulkResults, bulk_write, unique_ids, validate_items, validate_updates
 from ..utils.email import send_email
+from ..utils.ids import new_id
+from ..utils.pagination import PageParams, fetch_page
 
 router = APIRouter(prefix="/user_management", tags=["user_management"])
 
@@ -48,10 +59,10 @@ def send_user_credentials_email(
 
 
 @router.post("/create", response_model=UserManagementResponse, status_code=status.HTTP_201_CREATED)
-def create_user(
+async def create_user(
     payload: UserManagementCreate,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
     """Create a new user in user_management table. Only Lead Pastor (Admin) can create users for all roles.
@@ -61,10 +72,10 @@ def create_user(
     # Check if email already exists in user_management table only
     # (This is a separate table from users, so we only check user_management)
     try:
-        existing_mgmt = db.query(UserManagement).filter(UserManagement.email == payload.email).first()
+        existing_mgmt = await db.scalar(select(UserManagement).where(UserManagement.email == payload.email))
         if existing_mgmt:
             # Get all emails in user_management for debugging
-            all_emails = db.query(UserManagement.email).all()
+            all_emails = (await db.execute(select(UserManagement.email))).all()
             email_list = [email[0] for email in all_emails]
             raise HTTPException(
                 status_code=400, 
@@ -85,7 +96,7 @@ def create_user(
         )
     
     # Fetch role details from role table to get permissions and role_id
-    role_details = db.query(Role).filter(Role.role == payload.role).first()
+    role_details = await db.scalar(select(Role).where(Role.role == payload.role))
     if not role_details:
         raise HTTPException(
             status_code=404,
@@ -107,15 +118,14 @@ def create_user(
         email=payload.email,
         first_name=payload.first_name,
         last_name=payload.last_name,
-        hashed_password=get_password_hash(generated_password),  # Store password hash for login
+        hashed_password=await password_hasher.hash(generated_password),  # Store password hash for login
         role=payload.role,  # Role name stored in database as enum value
         role_id=role_details.id,  # Foreign key to role.id
         permissions=role_details.permissions,  # Fetch permissions from role table
         is_active=True,  # User is active by default
     )
     db.add(user_mgmt)
-    db.commit()
-    db.refresh(user_mgmt)
+    await db.commit()
     
     # Send credentials via email
     send_user_credentials_email(
@@ -130,20 +140,27 @@ def create_user(
     return user_mgmt
 
 
-@router.get("/list", response_model=List[UserManagementResponse])
-def list_users(
-    db: Session = Depends(get_db),
+@router.get("/list", response_model=Union[List[UserManagementResponse], Page[UserManagementResponse]])
+async def list_users(
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
-    """List all users from user_management table. Only Lead Pastor (Admin) can view all users."""
-    users = db.query(UserManagement).filter(UserManagement.role != UserRole.SUPERADMIN).all()
-    return users
+    """List all users from user_management table, by email. Only Lead Pastor (Admin) can view all users.
+
+    Pass ``limit`` (and then ``cursor``) to page through them.
+    """
+    query = select(UserManagement).where(UserManagement.role != UserRole.SUPERADMIN)
+    users, next_cursor = await fetch_page(db, query, (UserManagement.email,), page)
+    if not page.paginated:
+        return users
+    return Page(items=users, next_cursor=next_cursor)
 
 
 @router.get("/list/{role}", response_model=List[UserManagementResponse])
-def list_users_by_role(
+async def list_users_by_role(
     role: UserRole = Path(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
     """List users by role from user_management table. Only Lead Pastor (Admin) can view users."""
@@ -154,18 +171,18 @@ def list_users_by_role(
             detail="Cannot list superadmin users"
         )
     
-    users = db.query(UserManagement).filter(UserManagement.role == role).all()
+    users = (await db.scalars(select(UserManagement).where(UserManagement.role == role).order_by(UserManagement.email))).all()
     return users
 
 
 @router.get("/{user_id}", response_model=UserManagementResponse)
-def get_user(
+async def get_user(
     user_id: str = Path(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
     """Get user by ID from user_management table. Only Lead Pastor (Admin) can view user details."""
-    user = db.query(UserManagement).filter(UserManagement.id == user_id).first()
+    user = await db.scalar(select(UserManagement).where(UserManagement.id == user_id))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -180,14 +197,14 @@ def get_user(
 
 
 @router.put("/update/{user_id}", response_model=UserManagementResponse)
-def update_user(
+async def update_user(
     user_id: str,
     payload: UserManagementUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
     """Update user in user_management table. Only Lead Pastor (Admin) can update users."""
-    user = db.query(UserManagement).filter(UserManagement.id == user_id).first()
+    user = await db.scalar(select(UserManagement).where(UserManagement.id == user_id))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -205,10 +222,10 @@ def update_user(
         user.last_name = payload.last_name
     if payload.email is not None:
         # Check if new email already exists in user_management table
-        existing_mgmt = db.query(UserManagement).filter(
+        existing_mgmt = await db.scalar(select(UserManagement).where(
             UserManagement.email == payload.email,
             UserManagement.id != user_id
-        ).first()
+        ))
         if existing_mgmt:
             raise HTTPException(
                 status_code=400, 
@@ -216,7 +233,7 @@ def update_user(
             )
         
         # Also check if email exists in users table
-        existing_user = db.query(User).filter(User.email == payload.email).first()
+        existing_user = await db.scalar(select(User).where(User.email == payload.email))
         if existing_user:
             raise HTTPException(
                 status_code=400, 
@@ -226,7 +243,7 @@ def update_user(
         user.email = payload.email
     if payload.role is not None:
         # Validate role exists in role table
-        role_details = db.query(Role).filter(Role.role == payload.role).first()
+        role_details = await db.scalar(select(Role).where(Role.role == payload.role))
         if not role_details:
             raise HTTPException(
                 status_code=404,
@@ -248,19 +265,23 @@ def update_user(
     if payload.permissions is not None:
         user.permissions = payload.permissions
     
-    db.commit()
-    db.refresh(user)
+    # Role/permission changes revoke tokens carrying the old claims
+    if payload.role is not None or payload.permissions is not None:
+        await bump_token_epoch(db, user.id)
+    
+    await db.commit()
+    principal_cache.invalidate(user.id)
     return user
 
 
 @router.delete("/delete/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(
+async def delete_user(
     user_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
 ):
     """Delete user from user_management table. Only Lead Pastor (Admin) can delete users."""
-    user = db.query(UserManagement).filter(UserManagement.id == user_id).first()
+    user = await db.scalar(select(UserManagement).where(UserManagement.id == user_id))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -271,6 +292,200 @@ def delete_user(
             detail="Cannot delete superadmin users"
         )
     
-    db.delete(user)
-    db.commit()
+    await db.delete(user)
+    await bump_token_epoch(db, user.id)
+    await db.commit()
+    principal_cache.invalidate(user.id)
+
+
+async def _roles_by_name(db: AsyncSession, roles) -> dict:
+    """Role rows for the given role names, in one query."""
+    roles = set(roles)
+    if not roles:
+        return {}
+    return {role.role: role for role in (await db.scalars(select(Role).where(Role.role.in_(roles)))).all()}
+
+
+def _role_problem(role: UserRole, role_details):
+    """(status, detail) when ``role`` cannot be assigned, else None."""
+    if role_details is None:
+        return status.HTTP_404_NOT_FOUND, f"Role '{role.value}' not found in role table"
+    if not role_details.is_active:
+        return status.HTTP_400_BAD_REQUEST, f"Role '{role.value}' is not active"
+    return None
+
+
+@router.post("/bulk/create", response_model=BulkResponse)
+async def bulk_create_users(
+    background_tasks: BackgroundTasks,
+    items: List[Any] = Body(..., description="Users to create, each with the fields of /create"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_roles(UserRole.ADMIN)),
+):
+    """Create several users in user_management in one transaction. Only Lead Pastor (Admin).
+
+    Invalid items (bad fields, taken emails, unknown or inactive roles) are
+    skipped and reported; the rest are inserted together and each new user is
+    emailed their credentials.
+    """
+    results = BulkResults()
+    valid = validate_items(items, UserManagementCreate, results)
+    taken = set((await db.scalars(
+        select(UserManagement.email).where(UserManagement.email.in_({payload.email for _, payload in valid}))
+    )).all()) if valid else set()
+    roles = await _roles_by_name(db, {payload.role for _, payload in valid})
+
+    accepted = []
+    for index, payload in valid:
+        if payload.role == UserRole.SUPERADMIN:
+            results.fail(index, status.HTTP_400_BAD_REQUEST, "Cannot create superadmin users through this endpoint")
+            continue
+        if payload.email in taken:
+            results.fail(index, status.HTTP_400_BAD_REQUEST, f"Email '{payload.email}' already exists in user_management table")
+            continue
+        problem = _role_problem(payload.role, roles.get(payload.role))
+        if problem:
+            results.fail(index, *problem)
+            continue
+        taken.add(payload.email)
+        accepted.append((index, payload, generate_secure_password()))
+
+    # Hash with bounded concurrency, leaving pool capacity for logins
+    limit = asyncio.Semaphore(max(1, password_hasher.max_pending // 2))
+
+    async def hash_password(password: str) -> str:
+        async with limit:
+            return await password_hasher.hash(password)
+
+    hashes = await asyncio.gather(*(hash_password(password) for _, _, password in accepted))
+
+    rows = []
+    for (index, payload, _), hashed_password in zip(accepted, hashes):
+        user_id = new_id()
+        role_details = roles[payload.role]
+        rows.append({
+            "id": user_id,
+            "email": payload.email,
+            "first_name": payload.first_name,
+            "last_name": payload.last_name,
+            "hashed_password": hashed_password,
+            "role": payload.role,
+            "role_id": role_details.id,
+            "permissions": role_details.permissions,
+            "is_active": True,
+        })
+        results.ok(index, user_id, status.HTTP_201_CREATED)
+
+    if rows:
+        async with bulk_write(db):
+            await db.execute(insert(UserManagement), rows)
+        # Core inserts skip the mapper events that feed the email filter
+        for row in rows:
+            known_emails.add(row["email"])
+        for _, payload, password in accepted:
+            send_user_credentials_email(
+                background_tasks, payload.email, payload.first_name, payload.last_name, password, payload.role
+            )
+    return results.response()
+
+
+@router.put("/bulk/update", response_model=BulkResponse)
+async def bulk_update_users(
+    items: List[Any] = Body(..., description="Updates, each an \"id\" plus the fields of /update"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_roles(UserRole.ADMIN)),
+):
+    """Update several users in user_management in one transaction. Only Lead Pastor (Admin)."""
+    results = BulkResults()
+    updates = validate_updates(items, UserManagementUpdate, results)
+    ids = [user_id for _, user_id, _ in updates]
+    current_roles = dict((await db.execute(
+        select(UserManagement.id, UserManagement.role).where(UserManagement.id.in_(ids))
+    )).all()) if ids else {}
+
+    emails = {payload.email for _, _, payload in updates if payload.email is not None}
+    email_owners = dict((await db.execute(
+        select(UserManagement.email, UserManagement.id).where(UserManagement.email.in_(emails))
+    )).all()) if emails else {}
+    user_emails = set((await db.scalars(select(User.email).where(User.email.in_(emails)))).all()) if emails else set()
+    roles = await _roles_by_name(db, {payload.role for _, _, payload in updates if payload.role is not None})
+
+    rows, revoked, claimed = [], [], set()
+    for index, user_id, payload in updates:
+        if user_id not in current_roles:
+            results.fail(index, status.HTTP_404_NOT_FOUND, "User not found", id=user_id)
+            continue
+        if current_roles[user_id] == UserRole.SUPERADMIN:
+            results.fail(index, status.HTTP_403_FORBIDDEN, "Cannot update superadmin users", id=user_id)
+            continue
+        if payload.email is not None:
+            owner = email_owners.get(payload.email)
+            if payload.email in claimed or (owner is not None and owner != user_id):
+                results.fail(
+                    index, status.HTTP_400_BAD_REQUEST,
+                    f"Email '{payload.email}' already exists in user_management table", id=user_id,
+                )
+                continue
+            if payload.email in user_emails:
+                results.fail(
+                    index, status.HTTP_400_BAD_REQUEST, f"Email '{payload.email}' already exists in users table", id=user_id
+                )
+                continue
+        row = {"id": user_id, **payload.model_dump(exclude_none=True, exclude={"role", "permissions"})}
+        if payload.role is not None:
+            problem = _role_problem(payload.role, roles.get(payload.role))
+            if problem:
+                results.fail(index, *problem, id=user_id)
+                continue
+            row.update(role=payload.role, role_id=roles[payload.role].id, permissions=roles[payload.role].permissions)
+        # Explicit permissions win over the role's defaults
+        if payload.permissions is not None:
+            row["permissions"] = payload.permissions
+        if payload.role is not None or payload.permissions is not None:
+            revoked.append(user_id)
+        if payload.email is not None:
+            claimed.add(payload.email)
+        rows.append(row)
+        results.ok(index, user_id)
+
+    if rows:
+        async with bulk_write(db):
+            await db.execute(update(UserManagement), rows)
+            # Role/permission changes revoke tokens carrying the old claims
+            await bump_token_epochs(db, revoked)
+        principal_cache.invalidate(*(row["id"] for row in rows))
+        for email in claimed:
+            known_emails.add(email)
+    return results.response()
+
+
+@router.delete("/bulk/delete", response_model=BulkResponse)
+async def bulk_delete_users(
+    payload: BulkDelete,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_roles(UserRole.ADMIN)),
+):
+    """Delete several users from user_management in one transaction. Only Lead Pastor (Admin)."""
+    results = BulkResults()
+    requested = unique_ids(payload.ids, results)
+    ids = [user_id for _, user_id in requested]
+    current_roles = dict((await db.execute(
+        select(UserManagement.id, UserManagement.role).where(UserManagement.id.in_(ids))
+    )).all())
+
+    doomed = []
+    for index, user_id in requested:
+        if user_id not in current_roles:
+            results.fail(index, status.HTTP_404_NOT_FOUND, "User not found", id=user_id)
+        elif current_roles[user_id] == UserRole.SUPERADMIN:
+            results.fail(index, status.HTTP_403_FORBIDDEN, "Cannot delete superadmin users", id=user_id)
+        else:
+            doomed.append(user_id)
+            results.ok(index, user_id, status.HTTP_204_NO_CONTENT)
 
+    if doomed:
+        async with bulk_write(db):
+            await db.execute(delete(UserManagement).where(UserManagement.id.in_(doomed)))
+            await bump_token_epochs(db, doomed)
+        principal_cache.invalidate(*doomed)
+    return results.response()
@@ -0,0 +1,23 @@
+from typing import Any, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class BulkDelete(BaseModel):
+    """Schema for deleting several rows at once."""
+    ids: List[str] = Field(..., min_length=1, description="IDs (UUIDs) to delete")
+
+
+class BulkItemResult(BaseModel):
+    """Outcome of one item of a bulk request."""
+    index: int = Field(..., description="Position of the item in the request")
+    status: int = Field(..., description="HTTP status the equivalent single-item call would return")
+    id: Optional[str] = None  # UUID of the created, updated or deleted row
+    detail: Optional[Any] = None  # Error message or validation errors when the item failed
+
+
+class BulkResponse(BaseModel):
+    """Schema for bulk create / update / delete responses."""
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult]
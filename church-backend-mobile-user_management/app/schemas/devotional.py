@@ -3,13 +3,15 @@ from typing import Optional
 
 from pydantic import BaseModel, Field
 
+from .ids import IdField
+
 
 class DevotionalBase(BaseModel):
     title: str = Field(..., min_length=1, max_length=255)
     date: date
     passage: str = Field(..., min_length=1, max_length=255)
     leader: str = Field(..., min_length=1, max_length=255)
-    sermon_id: Optional[str] = Field(None, description="Reference to sermon ID (UUID)")
+    sermon_id: Optional[IdField] = Field(None, description="Reference to sermon ID (UUID)")
 
 
 class DevotionalCreate(DevotionalBase):
@@ -23,7 +25,7 @@ class DevotionalUpdate(BaseModel):
     date: Optional[date] = None
     passage: Optional[str] = Field(None, min_length=1, max_length=255)
     leader: Optional[str] = Field(None, min_length=1, max_length=255)
-    sermon_id: Optional[str] = Field(None, description="Reference to sermon ID (UUID)")
+    sermon_id: Optional[IdField] = Field(None, description="Reference to sermon ID (UUID)")
 
 
 class DevotionalResponse(DevotionalBase):
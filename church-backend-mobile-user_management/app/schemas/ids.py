@@ -0,0 +1,17 @@
+from typing import Annotated
+
+from pydantic import AfterValidator
+
+from ..utils.ids import canonical_id
+
+
+def parse_id(v: str) -> str:
+    """Reject IDs that are not UUIDs; return the canonical (lowercase, hyphenated) form."""
+    canonical = canonical_id(v)
+    if canonical is None:
+        raise ValueError(f"Invalid ID: {v!r}. Expected a UUID")
+    return canonical
+
+
+# A reference to another row, stored as given: malformed IDs are a 422, not "not found"
+IdField = Annotated[str, AfterValidator(parse_id)]
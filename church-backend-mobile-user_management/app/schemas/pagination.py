@@ -0,0 +1,12 @@
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """One page of a keyset-paginated list."""
+    items: List[T]
+    # Pass back as ?cursor= to get the next page; None on the last page
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for the next page")
@@ -4,6 +4,7 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field, computed_field
 
+from .ids import IdField
 from .sermon import SermonResponse
 
 
@@ -22,7 +23,7 @@ class SeriesCreate(BaseModel):
     to_date: date
     passage: str = Field(..., min_length=1, max_length=255, description="Scripture reference")
     description: str = Field(..., min_length=1)
-    sermons_id: Optional[List[str]] = Field(None, description="List of Sermon IDs (UUIDs) to link to this series")
+    sermons_id: Optional[List[IdField]] = Field(None, description="List of Sermon IDs (UUIDs) to link to this series")
 
 
 class SeriesUpdate(BaseModel):
@@ -71,12 +72,12 @@ class SeriesCreateResponse(BaseModel):
 
 class SeriesInsertSermons(BaseModel):
     """Schema for inserting sermons into an existing series."""
-    sermons_id: List[str] = Field(..., min_items=1, description="List of Sermon IDs (UUIDs) to add to this series")
+    sermons_id: List[IdField] = Field(..., min_items=1, description="List of Sermon IDs (UUIDs) to add to this series")
 
 
 class SeriesDeleteSermons(BaseModel):
     """Schema for deleting sermons from an existing series."""
-    sermons_id: List[str] = Field(..., min_items=1, description="List of Sermon IDs (UUIDs) to remove from this series")
+    sermons_id: List[IdField] = Field(..., min_items=1, description="List of Sermon IDs (UUIDs) to remove from this series")
 
 
 class SeriesDetailResponse(SeriesBase):
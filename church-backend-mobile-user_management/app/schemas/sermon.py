@@ -3,6 +3,8 @@ from typing import Annotated, List, Optional
 
 from pydantic import BaseModel, BeforeValidator, Field
 
+from .ids import IdField
+
 
 def parse_time_string(v):
     """Parse time string in various formats to time object."""
@@ -89,7 +91,7 @@ class SermonCountResponse(BaseModel):
 
 class ExistingSeriesAssociate(BaseModel):
     """Schema for associating an existing series with a sermon."""
-    series_id: str = Field(..., description="The ID (UUID) of the series to associate")
+    series_id: IdField = Field(..., description="The ID (UUID) of the series to associate")
 
 
 class ExistingSeriesResponse(BaseModel):
@@ -0,0 +1,135 @@
+"""
+Bulk Writes
+
+Helpers for the ``/bulk/*`` endpoints. A bulk request is a JSON array that is
+checked item by item in one pass (schema validation, then one query per
+lookup for the whole batch instead of one per item). Every item that passes is
+written with a single executemany statement per table, in one transaction;
+items that fail are skipped and reported with the status code the single-item
+endpoint would have returned.
+
+Bulk statements bypass the ORM unit of work, so callers adjust counters
+(app.utils.counters) and other flush-time bookkeeping themselves.
+"""
+import json
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Type
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..schemas.bulk import BulkItemResult, BulkResponse
+from .ids import canonical_id
+
+
+class BulkResults:
+    """Per-item outcomes of a bulk request, keyed by the item's position."""
+
+    def __init__(self):
+        self._results: Dict[int, BulkItemResult] = {}
+
+    def ok(self, index: int, id: Optional[str], status_code: int = status.HTTP_200_OK) -> None:
+        self._results[index] = BulkItemResult(index=index, status=status_code, id=id)
+
+    def fail(self, index: int, status_code: int, detail: Any, id: Optional[str] = None) -> None:
+        self._results[index] = BulkItemResult(index=index, status=status_code, id=id, detail=detail)
+
+    def response(self) -> BulkResponse:
+        results = [self._results[index] for index in sorted(self._results)]
+        succeeded = sum(1 for result in results if result.status < 400)
+        return BulkResponse(succeeded=succeeded, failed=len(results) - succeeded, results=results)
+
+
+def check_batch_size(items: List[Any]) -> None:
+    if not items:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Expected a non-empty array")
+    if len(items) > settings.bulk_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.bulk_max_items} items per request",
+        )
+
+
+def _validation_detail(exc: ValidationError) -> list:
+    # Round-trip through JSON: error contexts may hold exception objects
+    return json.loads(exc.json(include_url=False))
+
+
+def validate_items(items: List[Any], schema: Type[BaseModel], results: BulkResults) -> List[Tuple[int, BaseModel]]:
+    """Validate every item against ``schema``; failures are recorded as 422."""
+    check_batch_size(items)
+    valid = []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, schema.model_validate(item)))
+        except ValidationError as exc:
+            results.fail(index, status.HTTP_422_UNPROCESSABLE_ENTITY, _validation_detail(exc))
+    return valid
+
+
+def validate_updates(
+    items: List[Any], schema: Type[BaseModel], results: BulkResults
+) -> List[Tuple[int, str, BaseModel]]:
+    """Validate ``{"id": ..., <schema fields>}`` items; an ID may appear only once."""
+    check_batch_size(items)
+    valid = []
+    seen: Set[str] = set()
+    for index, item in enumerate(items):
+        item_id = item.get("id") if isinstance(item, dict) else None
+        if not isinstance(item_id, str) or not item_id:
+            results.fail(index, status.HTTP_422_UNPROCESSABLE_ENTITY, "Each item needs an \"id\"")
+            continue
+        # Malformed IDs are kept as given: they match nothing and report 404
+        item_id = canonical_id(item_id) or item_id
+        if item_id in seen:
+            results.fail(index, status.HTTP_400_BAD_REQUEST, "Duplicate id in request", id=item_id)
+            continue
+        seen.add(item_id)
+        try:
+            payload = schema.model_validate({key: value for key, value in item.items() if key != "id"})
+        except ValidationError as exc:
+            results.fail(index, status.HTTP_422_UNPROCESSABLE_ENTITY, _validation_detail(exc), id=item_id)
+            continue
+        valid.append((index, item_id, payload))
+    return valid
+
+
+def unique_ids(ids: List[str], results: BulkResults) -> List[Tuple[int, str]]:
+    """(index, id) pairs for a delete request; repeated IDs are reported as 400."""
+    check_batch_size(ids)
+    seen: Set[str] = set()
+    unique = []
+    for index, item_id in enumerate(ids):
+        item_id = canonical_id(item_id) or item_id
+        if item_id in seen:
+            results.fail(index, status.HTTP_400_BAD_REQUEST, "Duplicate id in request", id=item_id)
+            continue
+        seen.add(item_id)
+        unique.append((index, item_id))
+    return unique
+
+
+async def existing_ids(db: AsyncSession, column, ids: Iterable[str]) -> Set[str]:
+    """The subset of ``ids`` present in ``column``, in one query."""
+    ids = {item_id for item_id in ids if item_id}
+    if not ids:
+        return set()
+    return set((await db.scalars(select(column).where(column.in_(ids)))).all())
+
+
+@asynccontextmanager
+async def bulk_write(db: AsyncSession):
+    """Run the batch's statements, then commit; a constraint violation rolls back every item."""
+    try:
+        yield
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Bulk write rejected by the database; nothing was written ({exc.orig})",
+        )
@@ -0,0 +1,67 @@
+"""
+Read-Your-Writes Consistency Tokens
+
+With read replicas configured, a successful write response carries a
+short-lived signed token (``X-Consistency-Token`` header and cookie). A client
+that sends it back on its next requests has its reads pinned to the primary
+until the token expires, so it never reads data older than its own write while
+the replicas catch up.
+
+Tokens only carry an expiry and an HMAC over it: a forged or replayed token
+can at most send reads to the primary.
+"""
+import hashlib
+import hmac
+import time
+from typing import Optional
+
+from fastapi import Request, Response
+
+from ..config import settings
+
+CONSISTENCY_HEADER = "X-Consistency-Token"
+CONSISTENCY_COOKIE = "consistency_token"
+
+_SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def _sign(expires_at: int) -> str:
+    message = f"ryw:{expires_at}".encode("utf-8")
+    return hmac.new(settings.jwt_secret_key.encode("utf-8"), message, hashlib.sha256).hexdigest()[:32]
+
+
+def issue_consistency_token() -> str:
+    expires_at = int(time.time()) + settings.read_your_writes_seconds
+    return f"{expires_at}.{_sign(expires_at)}"
+
+
+def is_valid_consistency_token(token: Optional[str]) -> bool:
+    if not token:
+        return False
+    expires, _, signature = token.partition(".")
+    try:
+        expires_at = int(expires)
+    except ValueError:
+        return False
+    return expires_at > time.time() and hmac.compare_digest(signature, _sign(expires_at))
+
+
+def reads_pinned_to_primary(request: Request) -> bool:
+    """True if the request carries an unexpired token from a recent write."""
+    token = request.headers.get(CONSISTENCY_HEADER) or request.cookies.get(CONSISTENCY_COOKIE)
+    return is_valid_consistency_token(token)
+
+
+def mark_write(request: Request, response: Response) -> None:
+    """Attach a fresh token to the response of a successful write request."""
+    if request.method in _SAFE_METHODS or response.status_code >= 400:
+        return
+    token = issue_consistency_token()
+    response.headers[CONSISTENCY_HEADER] = token
+    response.set_cookie(
+        CONSISTENCY_COOKIE,
+        token,
+        max_age=settings.read_your_writes_seconds,
+        httponly=True,
+        samesite="lax",
+    )
@@ -0,0 +1,147 @@
+"""
+Materialized Counters
+
+The /count endpoints read a row from the ``counters`` table instead of running
+``count(*)`` over the whole table. Counters are adjusted at flush time, on the
+flushing connection, so an increment commits or rolls back together with the
+insert, delete or role change that caused it. Writers of the same counter
+queue on its row until they commit, which is negligible at this write rate.
+
+Core statements that bypass the ORM (bulk ``insert()``/``delete()``) must call
+``adjust_counters`` themselves. ``reconcile_counters`` runs periodically,
+rewrites every counter from ``count(*)`` and logs any drift it corrects; it
+also creates counters that are missing. Until a counter exists, reads fall
+back to ``count(*)``.
+"""
+import logging
+from collections import Counter as Tally
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, func, inspect, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..models.counter import Counter
+from ..models.devotional import Devotional
+from ..models.sermon import Sermon
+from ..models.series import Series
+from ..models.user import User
+from ..schemas.enums import UserRole
+
+logger = logging.getLogger(__name__)
+
+
+class CountedRows:
+    """Rows of ``model``, optionally only those whose ``attribute`` equals ``value``."""
+
+    def __init__(self, model, attribute: Optional[str] = None, value: Any = None):
+        self.model = model
+        self.attribute = attribute
+        self.value = value
+
+    def matches(self, obj) -> bool:
+        return self.attribute is None or getattr(obj, self.attribute) == self.value
+
+    def change(self, obj) -> int:
+        """+1 / -1 when a pending update moves ``obj`` into / out of the set."""
+        if self.attribute is None:
+            return 0
+        history = inspect(obj).attrs[self.attribute].history
+        if not history.has_changes():
+            return 0
+        was_counted = any(old == self.value for old in history.deleted)
+        return int(self.matches(obj)) - int(was_counted)
+
+    def count_statement(self):
+        statement = select(func.count()).select_from(self.model)
+        if self.attribute is not None:
+            statement = statement.where(getattr(self.model, self.attribute) == self.value)
+        return statement
+
+
+COUNTERS: Dict[str, CountedRows] = {
+    "sermons": CountedRows(Sermon),
+    "series": CountedRows(Series),
+    "devotionals": CountedRows(Devotional),
+    "admins": CountedRows(User, "role", UserRole.ADMIN),
+}
+
+
+def _increments(deltas: Dict[str, int]):
+    for name, delta in deltas.items():
+        if delta:
+            yield (
+                update(Counter)
+                .where(Counter.name == name)
+                .values(value=Counter.value + delta)
+            )
+
+
+@event.listens_for(Session, "after_flush")
+def _count_flushed_rows(session, flush_context):
+    deltas = Tally()
+    for name, counted in COUNTERS.items():
+        for obj in session.new:
+            if isinstance(obj, counted.model) and counted.matches(obj):
+                deltas[name] += 1
+        for obj in session.deleted:
+            if isinstance(obj, counted.model) and counted.matches(obj):
+                deltas[name] -= 1
+        if counted.attribute is not None:
+            for obj in session.dirty:
+                if isinstance(obj, counted.model) and obj not in session.new and obj not in session.deleted:
+                    deltas[name] += counted.change(obj)
+    if not any(deltas.values()):
+        return
+    connection = session.connection()
+    for statement in _increments(deltas):
+        connection.execute(statement)
+
+
+async def adjust_counters(db: AsyncSession, deltas: Dict[str, int]) -> None:
+    """Apply ``deltas`` (counter name -> change) inside the caller's transaction.
+
+    Only needed after Core statements; ORM flushes are counted automatically.
+    """
+    for statement in _increments(deltas):
+        await db.execute(statement)
+
+
+async def get_count(db: AsyncSession, name: str) -> int:
+    """Current value of counter ``name`` (a count(*) until the counter exists)."""
+    value = await db.scalar(select(Counter.value).where(Counter.name == name))
+    if value is None:
+        value = await db.scalar(COUNTERS[name].count_statement())
+    return value
+
+
+async def reconcile_counters() -> Dict[str, int]:
+    """Reset every counter to its count(*). Returns the drift corrected per counter."""
+    drift = {}
+    for name, counted in COUNTERS.items():
+        async with SessionLocal() as db:
+            # Lock the counter row first: writers that have not committed yet
+            # block on it and apply their increment after our reset
+            locked = await db.execute(
+                update(Counter).where(Counter.name == name).values(reconciled_at=datetime.utcnow())
+            )
+            actual = await db.scalar(counted.count_statement())
+            if locked.rowcount == 0:
+                db.add(Counter(name=name, value=actual, reconciled_at=datetime.utcnow()))
+                try:
+                    await db.commit()
+                except IntegrityError:
+                    # Created concurrently by another worker; the next run checks it
+                    await db.rollback()
+                continue
+
+            stored = await db.scalar(select(Counter.value).where(Counter.name == name))
+            if stored != actual:
+                await db.execute(update(Counter).where(Counter.name == name).values(value=actual))
+                drift[name] = actual - stored
+                logger.warning("Counter %s drifted by %+d; reset to %d", name, actual - stored, actual)
+            await db.commit()
+    return drift
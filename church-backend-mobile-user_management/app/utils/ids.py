@@ -0,0 +1,55 @@
+"""
+Time-Ordered IDs
+
+UUIDv7 (RFC 9562): a 48-bit millisecond Unix timestamp followed by random
+bits. New keys sort after older ones, so inserts land at the right edge of
+primary-key and foreign-key indexes instead of on random pages. Within one
+millisecond the random part is incremented, keeping keys from this process
+strictly increasing.
+"""
+import os
+import threading
+import time
+import uuid
+from typing import Optional
+
+_lock = threading.Lock()
+_last_ms = 0
+_last_rand = 0
+
+_RAND_BITS = 74
+_RAND_MASK = (1 << _RAND_BITS) - 1
+
+
+def uuid7() -> uuid.UUID:
+    global _last_ms, _last_rand
+    with _lock:
+        ms = time.time_ns() // 1_000_000
+        if ms > _last_ms:
+            rand = int.from_bytes(os.urandom(10), "big") & _RAND_MASK
+        else:
+            # Same (or an earlier, after a clock step) millisecond: stay monotonic
+            ms = _last_ms
+            rand = _last_rand + 1
+            if rand > _RAND_MASK:
+                ms += 1
+                rand = int.from_bytes(os.urandom(10), "big") & _RAND_MASK
+        _last_ms, _last_rand = ms, rand
+
+    rand_a = rand >> 62            # 12 bits
+    rand_b = rand & ((1 << 62) - 1)  # 62 bits
+    value = (ms & ((1 << 48) - 1)) << 80 | 0x7 << 76 | rand_a << 64 | 0b10 << 62 | rand_b
+    return uuid.UUID(int=value)
+
+
+def new_id() -> str:
+    """A new UUIDv7 in canonical string form (the form IDs take throughout the app)."""
+    return str(uuid7())
+
+
+def canonical_id(value) -> Optional[str]:
+    """``value`` in canonical UUID form, or None if it is not a UUID."""
+    try:
+        return str(uuid.UUID(str(value)))
+    except ValueError:
+        return None
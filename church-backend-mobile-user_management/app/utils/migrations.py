@@ -0,0 +1,131 @@
+"""
+Migration Helpers
+
+Building blocks for alembic/versions that keep schema changes from locking hot
+tables while the service is running (see MIGRATIONS.md):
+
+- ``create_index`` / ``drop_index`` build and drop indexes CONCURRENTLY on
+  PostgreSQL, outside the migration's transaction, so reads and writes to the
+  table carry on while the index is built. A concurrent build that failed
+  half-way leaves an INVALID index behind; it is dropped and rebuilt.
+- ``backfill`` updates a large table in primary-key batches, each committed on
+  its own on PostgreSQL, so row locks are held for one batch at a time.
+
+On SQLite these fall back to the plain, transactional operations.
+"""
+import logging
+from typing import Dict, List, Optional
+
+import sqlalchemy as sa
+from alembic import op
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+
+from ..config import BASE_DIR
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_DIR = BASE_DIR / "alembic"
+
+# Rows updated per statement by backfill()
+BACKFILL_BATCH_SIZE = 1000
+
+
+def _is_postgresql() -> bool:
+    return op.get_context().dialect.name == "postgresql"
+
+
+def _drop_invalid_index(name: str) -> None:
+    """Drop ``name`` if an earlier CONCURRENTLY build of it failed (PostgreSQL)."""
+    if op.get_context().as_sql:
+        return
+    invalid = op.get_bind().execute(
+        sa.text(
+            "SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid "
+            "WHERE pg_class.relname = :name AND NOT pg_index.indisvalid"
+        ),
+        {"name": name},
+    ).scalar()
+    if invalid:
+        logger.warning("Dropping invalid index %s left by an interrupted build", name)
+        op.drop_index(name, postgresql_concurrently=True, if_exists=True)
+
+
+def create_index(name: str, table: str, columns: List[str], unique: bool = False, **kw) -> None:
+    """CREATE INDEX IF NOT EXISTS, CONCURRENTLY on PostgreSQL."""
+    if not _is_postgresql():
+        op.create_index(name, table, columns, unique=unique, if_not_exists=True, **kw)
+        return
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        _drop_invalid_index(name)
+        op.create_index(
+            name, table, columns, unique=unique, if_not_exists=True, postgresql_concurrently=True, **kw
+        )
+
+
+def drop_index(name: str, table: str) -> None:
+    """DROP INDEX IF EXISTS, CONCURRENTLY on PostgreSQL."""
+    if not _is_postgresql():
+        op.drop_index(name, table_name=table, if_exists=True)
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
+
+
+def backfill(
+    table: str,
+    values: str,
+    where: str,
+    key: str = "id",
+    params: Optional[Dict] = None,
+    batch_size: int = BACKFILL_BATCH_SIZE,
+) -> int:
+    """``UPDATE table SET values WHERE where`` in batches of ``batch_size`` rows.
+
+    ``values`` and ``where`` are SQL fragments (bind ``params`` by name). Rows
+    are walked in ``key`` order, so the loop ends even if ``where`` still
+    matches updated rows. Returns the number of rows updated.
+    """
+    if op.get_context().as_sql:
+        # Offline mode has no rows to walk: emit the single-statement form
+        op.execute(sa.text(f"UPDATE {table} SET {values} WHERE {where}").bindparams(**(params or {})))
+        return 0
+
+    select_batch = sa.text(
+        f"SELECT {key} FROM {table} WHERE ({where}) AND (:after IS NULL OR {key} > :after) "
+        f"ORDER BY {key} LIMIT :limit"
+    )
+    update_batch = sa.text(
+        f"UPDATE {table} SET {values} WHERE {key} IN :keys"
+    ).bindparams(sa.bindparam("keys", expanding=True))
+
+    def run() -> int:
+        bind = op.get_bind()
+        updated, after = 0, None
+        while True:
+            keys = bind.execute(
+                select_batch, {**(params or {}), "after": after, "limit": batch_size}
+            ).scalars().all()
+            if not keys:
+                return updated
+            updated += bind.execute(update_batch, {**(params or {}), "keys": keys}).rowcount
+            after = keys[-1]
+            logger.info("Backfilled %d rows of %s", updated, table)
+
+    if not _is_postgresql():
+        return run()
+    # Each batch commits by itself instead of holding every row lock until the end
+    with op.get_context().autocommit_block():
+        return run()
+
+
+def stamp_head(connection: sa.engine.Connection) -> None:
+    """Record the latest revision on a database just built with create_all.
+
+    Later ``alembic upgrade head`` runs then apply only newer migrations.
+    """
+    config = Config()
+    config.set_main_option("script_location", str(ALEMBIC_DIR))
+    MigrationContext.configure(connection).stamp(ScriptDirectory.from_config(config), "head")
@@ -0,0 +1,104 @@
+"""
+Keyset Pagination
+
+List endpoints accept ``limit`` and ``cursor``. Each page continues strictly
+after the last row of the previous one on the list's sort key (for example
+``date DESC, id DESC``), so the database seeks into the matching index
+instead of counting past skipped rows as OFFSET does: page 1000 costs the
+same as page 1. The sort key always ends with a unique column, so rows are
+never skipped or repeated across pages, and its columns are NOT NULL: a NULL
+never satisfies the keyset comparison, so such rows would drop out of every
+page after the first.
+
+Cursors are opaque to clients (URL-safe base64 of the last row's key values).
+Requests with neither ``limit`` nor ``cursor`` get the complete, unwrapped
+list as before, so existing clients keep working.
+"""
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy import Date, DateTime, Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+MAX_PAGE_SIZE = 200
+
+
+class PageParams:
+    """``limit`` / ``cursor`` query parameters (use as ``Depends(PageParams)``)."""
+
+    def __init__(
+        self,
+        limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; enables pagination"),
+        cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+
+    @property
+    def paginated(self) -> bool:
+        return self.limit is not None or self.cursor is not None
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([value.isoformat() if isinstance(value, (date, datetime)) else value for value in values])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence) -> List[Any]:
+    """Key values from ``cursor``, converted back to the key columns' Python types."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError("cursor does not match the sort key")
+        converted = []
+        for key, value in zip(keys, values):
+            column_type = key.type
+            if value is not None and isinstance(column_type, DateTime):
+                value = datetime.fromisoformat(value)
+            elif value is not None and isinstance(column_type, Date):
+                value = date.fromisoformat(value)
+            converted.append(value)
+        return converted
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+async def fetch_page(
+    db: AsyncSession,
+    query: Select,
+    keys: Sequence,
+    page: PageParams,
+    descending: bool = False,
+) -> Tuple[list, Optional[str]]:
+    """Run ``query`` ordered by ``keys`` and return ``(rows, next_cursor)``.
+
+    Without pagination parameters every row is returned and next_cursor is None.
+    ``keys`` must be NOT NULL columns ending with a unique one, and should match an index.
+    """
+    nullable = [key.key for key in keys if key.nullable]
+    if nullable:
+        raise ValueError(f"Keyset pagination needs NOT NULL sort keys; nullable: {', '.join(nullable)}")
+    query = query.order_by(*(key.desc() if descending else key.asc() for key in keys))
+    if not page.paginated:
+        return list((await db.scalars(query)).all()), None
+
+    if page.cursor:
+        after = decode_cursor(page.cursor, keys)
+        if len(keys) == 1:
+            condition = keys[0] < after[0] if descending else keys[0] > after[0]
+        else:
+            position = tuple_(*keys)
+            condition = position < tuple(after) if descending else position > tuple(after)
+        query = query.where(condition)
+
+    limit = page.limit or MAX_PAGE_SIZE
+    rows = list((await db.scalars(query.limit(limit + 1))).all())
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor([getattr(last, key.key) for key in keys])
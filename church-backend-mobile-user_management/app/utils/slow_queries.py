@@ -0,0 +1,154 @@
+"""
+Slow Query Log
+
+Statements slower than ``SLOW_QUERY_THRESHOLD_MS`` are logged as JSON on the
+``app.sql.slow`` logger with their normalized SQL, a fingerprint of the bound
+parameters and the route that issued them (the route is known while
+``SQL_METRICS_ENABLED`` is on).
+
+For slow SELECTs the query plan is captured in a background task on a separate
+connection, off the request path: ``EXPLAIN`` on PostgreSQL, ``EXPLAIN QUERY
+PLAN`` on SQLite. Each statement shape is explained at most once per
+``SLOW_QUERY_EXPLAIN_COOLDOWN_SECONDS``. Recent entries, plans included, are
+served at ``/internal/db/slow-queries``.
+"""
+import asyncio
+import contextvars
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..config import settings
+from .sql_metrics import current_query_stats, fingerprint, normalize_statement
+
+logger = logging.getLogger("app.sql.slow")
+
+# Background EXPLAINs allowed at once; further slow statements are logged without a plan
+MAX_PENDING_EXPLAINS = 4
+
+
+def parameters_fingerprint(parameters) -> str:
+    return hashlib.blake2b(repr(parameters).encode("utf-8"), digest_size=6).hexdigest()
+
+
+def explain_prefix(dialect_name: str) -> Optional[str]:
+    if dialect_name == "sqlite":
+        return "EXPLAIN QUERY PLAN "
+    if dialect_name == "postgresql":
+        return "EXPLAIN "
+    return None
+
+
+class SlowQueryLog:
+    """Recent slow statements and the plans captured for them."""
+
+    def __init__(self, max_entries: int = 100, max_shapes: int = 1000):
+        self.entries: Deque[dict] = deque(maxlen=max_entries)
+        self.max_shapes = max_shapes
+        # statement fingerprint -> monotonic time of the last EXPLAIN
+        self._explained: "OrderedDict[str, float]" = OrderedDict()
+        self._pending: Set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+
+    def record(self, entry: dict) -> None:
+        with self._lock:
+            self.entries.append(entry)
+        logger.warning("Slow query %s", json.dumps(entry))
+
+    def recent(self) -> List[dict]:
+        with self._lock:
+            return list(reversed(self.entries))
+
+    def _should_explain(self, statement_fingerprint: str) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            last = self._explained.get(statement_fingerprint)
+            if last is not None and now - last < settings.slow_query_explain_cooldown_seconds:
+                return False
+            if len(self._pending) >= MAX_PENDING_EXPLAINS:
+                return False
+            self._explained[statement_fingerprint] = now
+            self._explained.move_to_end(statement_fingerprint)
+            while len(self._explained) > self.max_shapes:
+                self._explained.popitem(last=False)
+            return True
+
+    def schedule_explain(self, engine: AsyncEngine, entry: dict, statement: str, parameters) -> None:
+        """Capture the plan for ``entry`` in a background task, if one is due."""
+        prefix = explain_prefix(engine.dialect.name)
+        if prefix is None or not self._should_explain(entry["fingerprint"]):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        # A fresh context, so the EXPLAIN is not counted against the request
+        task = contextvars.Context().run(
+            loop.create_task, self._explain(engine, entry, prefix + statement, parameters)
+        )
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _explain(self, engine: AsyncEngine, entry: dict, statement: str, parameters) -> None:
+        try:
+            async with engine.connect() as conn:
+                rows = (await conn.exec_driver_sql(statement, parameters)).all()
+        except Exception as exc:
+            logger.info("Could not capture plan for %s: %s", entry["fingerprint"], exc)
+            return
+        plan = [" ".join(str(column) for column in row) for row in rows]
+        with self._lock:
+            entry["plan"] = plan
+        logger.warning("Slow query plan %s", json.dumps({"fingerprint": entry["fingerprint"], "plan": plan}))
+
+
+slow_query_log = SlowQueryLog()
+
+# Engines already carrying the hooks
+_instrumented: set = set()
+
+
+def install_slow_query_log(engine: AsyncEngine, explain_engine: Optional[AsyncEngine] = None) -> None:
+    """Time every statement on ``engine`` and record those above the threshold.
+
+    Plans are captured on ``explain_engine`` (default: ``engine`` itself).
+    """
+    sync_engine = engine.sync_engine
+    threshold = settings.slow_query_threshold_ms / 1000
+    if sync_engine in _instrumented:
+        return
+    _instrumented.add(sync_engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._slow_query_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_slow_query_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        if elapsed < threshold or statement.lstrip()[:7].upper() == "EXPLAIN":
+            return
+
+        shape = normalize_statement(statement)
+        stats = current_query_stats()
+        entry: Dict[str, object] = {
+            "fingerprint": fingerprint(shape),
+            "duration_ms": round(elapsed * 1000, 3),
+            "statement": shape,
+            "params_fingerprint": parameters_fingerprint(parameters),
+            "route": stats.route if stats is not None else None,
+            "at": time.time(),
+        }
+        slow_query_log.record(entry)
+        if settings.slow_query_explain and not executemany and shape.upper().startswith(("SELECT", "WITH ")):
+            slow_query_log.schedule_explain(explain_engine or engine, entry, statement, parameters)
@@ -0,0 +1,142 @@
+"""
+Per-Request SQL Metrics
+
+Cursor-execute hooks attribute every statement to the request that issued it
+(through a context variable), counting queries, database time and how often
+each statement shape repeats. At the end of the request the totals are added
+as a ``Server-Timing`` header and logged as one JSON line on the ``app.sql``
+logger. A statement shape repeated more than ``SQL_REPEAT_WARN_THRESHOLD``
+times in one request (the usual N+1 pattern) is logged as a warning.
+
+Statements run outside a request (startup, periodic tasks) are not tracked.
+"""
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..config import settings
+
+logger = logging.getLogger("app.sql")
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"\?|\$\d+|%\(\w+\)s|%s|(?<!:):\w+")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """Reduce SQL to its shape: literals and bind markers become ``?`` and
+    ``IN (?, ?, ...)`` lists of any length collapse to ``(?...)``."""
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _PLACEHOLDER.sub("?", shape)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _PLACEHOLDER_LIST.sub("(?...)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+def fingerprint(shape: str) -> str:
+    return hashlib.blake2b(shape.encode("utf-8"), digest_size=6).hexdigest()
+
+
+class QueryStats:
+    """Statements executed on behalf of one request."""
+
+    def __init__(self, scope: Optional[dict] = None):
+        self.scope = scope
+        self.count = 0
+        self.db_seconds = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.db_seconds += seconds
+        self.shapes[normalize_statement(statement)] += 1
+
+    @property
+    def route(self) -> Optional[str]:
+        """``METHOD /path/{template}`` of the request, once routing has matched it."""
+        if self.scope is None:
+            return None
+        route = self.scope.get("route")
+        path = getattr(route, "path_format", None) or self.scope.get("path")
+        return f"{self.scope.get('method')} {path}"
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes executed more than ``threshold`` times."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n > threshold]
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("sql_query_stats", default=None)
+
+# Engines already carrying the hooks (create_app may run more than once per process)
+_instrumented: set = set()
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+@contextmanager
+def collect_queries(scope: Optional[dict] = None) -> Iterator[QueryStats]:
+    """Attribute statements executed inside the block (and tasks it spawns) to one QueryStats."""
+    stats = QueryStats(scope)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    sync_engine = engine.sync_engine
+    if sync_engine in _instrumented:
+        return
+    _instrumented.add(sync_engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            context._sql_metrics_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        stats = _current.get()
+        started = getattr(context, "_sql_metrics_started", None)
+        if stats is not None and started is not None:
+            stats.record(statement, time.perf_counter() - started)
+
+
+def report_request(request: Request, response: Response, stats: QueryStats) -> None:
+    """Add the Server-Timing header and log the request's query totals."""
+    db_ms = stats.db_seconds * 1000
+    response.headers.append("Server-Timing", f'db;dur={db_ms:.1f};desc="{stats.count} queries"')
+
+    threshold = settings.sql_repeat_warn_threshold
+    repeated = stats.repeated(threshold) if threshold > 0 else []
+    record: Dict[str, object] = {
+        "method": request.method,
+        "path": request.url.path,
+        "route": stats.route,
+        "status": response.status_code,
+        "queries": stats.count,
+        "db_ms": round(db_ms, 3),
+        "distinct_statements": len(stats.shapes),
+    }
+    if repeated:
+        record["repeated"] = [
+            {"fingerprint": fingerprint(shape), "count": n, "statement": shape} for shape, n in repeated
+        ]
+        logger.warning("Repeated SQL (possible N+1) %s", json.dumps(record))
+    else:
+        logger.info(json.dumps(record))
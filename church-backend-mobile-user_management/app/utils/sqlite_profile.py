@@ -0,0 +1,109 @@
+"""
+SQLite Performance Profile
+
+Opt-in tuning for file-backed SQLite (``SQLITE_PERFORMANCE_PROFILE=true``):
+
+- Every connection switches to WAL journaling, so readers no longer block the
+  writer and the writer no longer blocks readers, with ``synchronous=NORMAL``
+  (fsync at checkpoints rather than on every commit; still safe against
+  corruption, the last commits may be lost on power failure), a larger page
+  cache, memory-mapped reads and a ``busy_timeout`` so a locked database is
+  waited on instead of failing immediately.
+- Writes go through one dedicated writer connection. Sessions read on the
+  normal pool; the first write in a transaction moves that transaction to the
+  writer, whose single-connection pool is the queue: writers wait their turn
+  there (up to DB_POOL_TIMEOUT) instead of contending for SQLite's write lock.
+  The writer opens its transactions with ``BEGIN IMMEDIATE``, so a transaction
+  can never fail half-way when upgrading from a read lock to a write lock.
+
+Writes issued as raw ``text()`` are not recognised as writes and run on the
+reader pool, where they still work, serialized by ``busy_timeout``.
+"""
+from typing import Optional, Type
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+from ..config import settings
+from .pool import InstrumentedPool
+
+# Session.info key set while the current transaction writes through the writer
+_WRITING = "sqlite_writer"
+
+
+def is_file_sqlite(url: str) -> bool:
+    """True for SQLite URLs naming a database file (WAL does not apply to :memory:)."""
+    return url.startswith("sqlite") and ":memory:" not in url and not url.rstrip("/").endswith(":")
+
+
+def pragmas() -> list:
+    return [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}",
+        # Negative cache_size is in KiB rather than pages
+        f"PRAGMA cache_size=-{settings.sqlite_cache_size_kib}",
+        f"PRAGMA mmap_size={settings.sqlite_mmap_size_bytes}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+
+
+def tune_sqlite_engine(engine: AsyncEngine, immediate: bool = False) -> None:
+    """Apply the profile's pragmas to every new connection of ``engine``.
+
+    With ``immediate`` transactions start with BEGIN IMMEDIATE (the writer).
+    """
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        if immediate:
+            # Let SQLAlchemy emit BEGIN itself (below) instead of the driver
+            dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas():
+            cursor.execute(pragma)
+        cursor.close()
+
+    if immediate:
+        @event.listens_for(sync_engine, "begin")
+        def _begin_immediate(conn):
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def writer_engine_options() -> dict:
+    """Pool settings for the writer: one connection, callers queue for it."""
+    return {
+        "poolclass": InstrumentedPool,
+        "pool_size": 1,
+        "max_overflow": 0,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def single_writer_session(writer: Optional[AsyncEngine]) -> Type[Session]:
+    """Session class sending writes, and everything after them, to ``writer``.
+
+    Statements after the first write stay on the writer so the transaction
+    reads its own uncommitted changes. Without a writer this is plain Session.
+    """
+    if writer is None:
+        return Session
+    writer_bind = writer.sync_engine
+
+    class SingleWriterSession(Session):
+        def get_bind(self, mapper=None, clause=None, **kw):
+            if self.info.get(_WRITING) or self._flushing or isinstance(clause, UpdateBase):
+                self.info[_WRITING] = True
+                return writer_bind
+            return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+    @event.listens_for(SingleWriterSession, "after_transaction_end")
+    def _release_writer(session, transaction):
+        if transaction.parent is None:
+            session.info.pop(_WRITING, None)
+
+    return SingleWriterSession
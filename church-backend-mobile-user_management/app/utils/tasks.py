@@ -0,0 +1,56 @@
+"""
+Periodic Tasks
+
+Maintenance jobs (pruning expired rows, rebuilding caches, ...) that run in the
+background for the lifetime of the app. Jobs are coroutine functions, or plain
+functions that are dispatched to the thread pool so they never block the event
+loop.
+"""
+import asyncio
+import logging
+from typing import Callable, List, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTasks:
+    """Registry of background jobs started and stopped with the application."""
+
+    def __init__(self):
+        self._jobs: List[Tuple[str, float, Callable[[], object]]] = []
+        self._tasks: List[asyncio.Task] = []
+
+    def register(self, name: str, interval_seconds: float, job: Callable[[], object]) -> None:
+        """Run ``job`` every ``interval_seconds`` (disabled when the interval is <= 0).
+
+        Registering a name again replaces the earlier job.
+        """
+        self._jobs = [entry for entry in self._jobs if entry[0] != name]
+        if interval_seconds > 0:
+            self._jobs.append((name, interval_seconds, job))
+
+    async def _run(self, name: str, interval_seconds: float, job: Callable[[], object]) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                if asyncio.iscoroutinefunction(job):
+                    await job()
+                else:
+                    await run_in_threadpool(job)
+            except Exception:
+                logger.exception("Periodic task %s failed", name)
+
+    def start(self) -> None:
+        for name, interval_seconds, job in self._jobs:
+            self._tasks.append(asyncio.create_task(self._run(name, interval_seconds, job), name=name))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+
+periodic_tasks = PeriodicTasks()
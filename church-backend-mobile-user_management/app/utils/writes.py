@@ -0,0 +1,38 @@
+"""
+Single-Row Writes
+
+Write endpoints answer with the row they wrote, without reading it back:
+
+- Sessions keep objects loaded across commit (``expire_on_commit=False``)
+  and IDs and timestamps are generated in Python, so after a flush an object
+  holds every column. Anything the database generates is returned by the
+  INSERT/UPDATE itself (``eager_defaults`` on app.database.Base).
+- ``update_returning`` updates a row by primary key with a single
+  ``UPDATE ... RETURNING``, for updates that need no look at the row first.
+  It skips the unit of work, so mapper events (app.auth.email_filter) and
+  counters (app.utils.counters) do not see it: use it only for tables that
+  need neither.
+"""
+from typing import Any, Dict, Optional, Type, TypeVar
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import Base
+
+Model = TypeVar("Model", bound=Base)
+
+
+async def update_returning(
+    db: AsyncSession, model: Type[Model], row_id: str, values: Dict[str, Any]
+) -> Optional[Model]:
+    """Set ``values`` on the ``model`` row ``row_id`` and return the updated row (None if missing).
+
+    ``onupdate`` columns such as ``updated_at`` are set as with a flush. With
+    nothing to change the row is only read, and ``onupdate`` columns are left alone.
+    """
+    if not values:
+        return await db.scalar(select(model).where(model.id == row_id))
+    return await db.scalar(
+        update(model).where(model.id == row_id).values(**values).returning(model)
+    )
@@ -0,0 +1,106 @@
+"""
+Compare ID storage layouts on SQLite: the old VARCHAR(36) random UUIDv4 keys
+against 16-byte BLOB UUIDv7 keys (app.models.types.GUID + app.utils.ids).
+
+For each layout it builds a parent table and a child table with an indexed
+foreign key (the shape of sermons / series_sermons), then reports insert
+time, table and index sizes (from the dbstat virtual table, or the whole file
+when SQLite lacks it), a full join and random primary-key lookups.
+
+Usage: python benchmark_ids.py [parents]
+"""
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.utils.ids import uuid7
+
+CHILDREN_PER_PARENT = 3
+LOOKUPS = 20000
+
+
+LAYOUTS = {
+    "varchar(36) uuid4": ("VARCHAR(36)", lambda: str(uuid.uuid4())),
+    "blob(16) uuid7": ("BLOB", lambda: uuid7().bytes),
+}
+
+
+def build(path: str, column_type: str, new_key, parents: int):
+    con = sqlite3.connect(path)
+    con.execute(f"CREATE TABLE parent (id {column_type} PRIMARY KEY, title VARCHAR(255) NOT NULL)")
+    con.execute(
+        f"CREATE TABLE child (id {column_type} PRIMARY KEY, "
+        f"parent_id {column_type} NOT NULL REFERENCES parent (id), title VARCHAR(255) NOT NULL)"
+    )
+    con.execute("CREATE INDEX ix_child_parent_id ON child (parent_id)")
+
+    started = time.perf_counter()
+    parent_ids = []
+    # Insert in small committed batches, the way rows arrive from the API
+    for offset in range(0, parents, 500):
+        batch = [(new_key(), f"parent {n}") for n in range(offset, min(parents, offset + 500))]
+        children = [
+            (new_key(), parent_id, "child") for parent_id, _ in batch for _ in range(CHILDREN_PER_PARENT)
+        ]
+        con.executemany("INSERT INTO parent VALUES (?, ?)", batch)
+        con.executemany("INSERT INTO child VALUES (?, ?, ?)", children)
+        con.commit()
+        parent_ids.extend(parent_id for parent_id, _ in batch)
+    insert_seconds = time.perf_counter() - started
+    return con, parent_ids, insert_seconds
+
+
+def sizes(con: sqlite3.Connection, path: str) -> dict:
+    try:
+        rows = con.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name").fetchall()
+    except sqlite3.OperationalError:
+        return {"file": os.path.getsize(path)}
+    return {name: size for name, size in rows if not name.startswith("sqlite_schema")}
+
+
+def time_join(con: sqlite3.Connection, runs: int = 5) -> float:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        con.execute(
+            "SELECT COUNT(*) FROM child JOIN parent ON parent.id = child.parent_id"
+        ).fetchone()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def time_lookups(con: sqlite3.Connection, parent_ids) -> float:
+    keys = random.sample(parent_ids, min(LOOKUPS, len(parent_ids)))
+    started = time.perf_counter()
+    for key in keys:
+        con.execute("SELECT child.id FROM child WHERE child.parent_id = ?", (key,)).fetchall()
+    return (time.perf_counter() - started) / len(keys)
+
+
+def main(parents: int):
+    print(f"\n🔍 ID layout benchmark: {parents} parents, {parents * CHILDREN_PER_PARENT} children\n")
+    with tempfile.TemporaryDirectory() as directory:
+        for label, (column_type, new_key) in LAYOUTS.items():
+            path = os.path.join(directory, label.split()[0].replace("(", "_").replace(")", "") + ".db")
+            con, parent_ids, insert_seconds = build(path, column_type, new_key, parents)
+            con.execute("ANALYZE")
+            print(f"   {label}")
+            print(f"      insert            {insert_seconds * 1000:10.1f} ms")
+            for name, size in sorted(sizes(con, path).items()):
+                print(f"      {name:<28} {size / 1024:10.1f} KiB")
+            print(f"      join (all rows)   {time_join(con) * 1000:10.2f} ms")
+            print(f"      fk lookup         {time_lookups(con, parent_ids) * 1e6:10.2f} µs")
+            con.close()
+    print()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
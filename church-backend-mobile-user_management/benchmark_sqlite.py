@@ -0,0 +1,125 @@
+"""
+Compare SQLite read/write throughput with and without the SQLite performance
+profile (app/utils/sqlite_profile.py).
+
+Each configuration gets a fresh database file seeded with sermons. Concurrent
+workers then run the request shapes the API issues for a fixed time: reads
+(a keyset page of the sermon list plus a lookup by ID) and read-modify-write
+transactions (load a sermon, change it, commit), in the given mix. The report
+shows completed reads and writes per second, write latency percentiles, and
+writes that failed with "database is locked".
+
+Usage: python benchmark_sqlite.py [workers] [seconds] [write_percent]
+"""
+import asyncio
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+BENCH_DIR = tempfile.mkdtemp(prefix="sqlite-bench-")
+# The app's module-level engine is never used; point it somewhere harmless
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(BENCH_DIR, 'unused.db')}")
+
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+
+from app.database import Base, create_engines, create_sessionmaker
+from app.models import Sermon
+from app.utils.ids import new_id
+
+SERMONS = 5000
+PAGE_SIZE = 20
+
+
+async def seed(sessionmaker) -> list:
+    ids = [new_id() for _ in range(SERMONS)]
+    async with sessionmaker() as db:
+        db.add_all(
+            Sermon(id=sermon_id, date=date(2000, 1, 2) + timedelta(days=n), speaker="Speaker", passage="John 1",
+                   title=f"Sermon {n}", description="Benchmark")
+            for n, sermon_id in enumerate(ids)
+        )
+        await db.commit()
+    return ids
+
+
+async def read(sessionmaker, ids: list) -> None:
+    async with sessionmaker() as db:
+        (await db.scalars(
+            select(Sermon).order_by(Sermon.date.desc(), Sermon.id.desc()).limit(PAGE_SIZE)
+        )).all()
+        await db.scalar(select(Sermon).where(Sermon.id == random.choice(ids)))
+
+
+async def write(sessionmaker, ids: list) -> None:
+    async with sessionmaker() as db:
+        sermon = await db.scalar(select(Sermon).where(Sermon.id == random.choice(ids)))
+        sermon.title = f"Edited {random.random():.6f}"
+        await db.commit()
+
+
+async def run(label: str, sqlite_profile: bool, workers: int, seconds: float, write_share: float) -> None:
+    url = f"sqlite:///{os.path.join(BENCH_DIR, label.replace(' ', '_'))}.db"
+    engine, writer = create_engines(url, sqlite_profile)
+    sessionmaker = create_sessionmaker(engine, writer)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    ids = await seed(sessionmaker)
+
+    reads, write_latencies, locked = 0, [], 0
+    deadline = time.perf_counter() + seconds
+
+    async def worker():
+        nonlocal reads, locked
+        while time.perf_counter() < deadline:
+            if random.random() < write_share:
+                started = time.perf_counter()
+                try:
+                    await write(sessionmaker, ids)
+                    write_latencies.append(time.perf_counter() - started)
+                except OperationalError:
+                    locked += 1
+            else:
+                await read(sessionmaker, ids)
+                reads += 1
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    for each in (engine, writer):
+        if each is not None:
+            await each.dispose()
+
+    print(f"   {label}")
+    print(f"      reads/s           {reads / seconds:10.1f}")
+    print(f"      writes/s          {len(write_latencies) / seconds:10.1f}")
+    if write_latencies:
+        ms = sorted(latency * 1000 for latency in write_latencies)
+        print(f"      write p50         {statistics.median(ms):10.2f} ms")
+        print(f"      write p99         {ms[int(len(ms) * 0.99) - 1]:10.2f} ms")
+    print(f"      locked errors     {locked:10d}")
+
+
+async def main(workers: int, seconds: float, write_percent: int) -> None:
+    print(f"\n🔍 SQLite benchmark: {workers} workers, {seconds:g}s each, {write_percent}% writes\n")
+    await run("default", False, workers, seconds, write_percent / 100)
+    await run("performance profile", True, workers, seconds, write_percent / 100)
+    print()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    try:
+        asyncio.run(main(
+            int(args[0]) if len(args) > 0 else 16,
+            float(args[1]) if len(args) > 1 else 10,
+            int(args[2]) if len(args) > 2 else 20,
+        ))
+    finally:
+        shutil.rmtree(BENCH_DIR, ignore_errors=True)
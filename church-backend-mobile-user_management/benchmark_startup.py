@@ -0,0 +1,84 @@
+"""
+Measure application startup cost.
+
+- import:   ``import app.main`` in a fresh interpreter (what every worker spawn,
+            test run and alembic invocation pays)
+- create:   ``create_app()`` in an already-imported process
+- lifespan: running the lifespan startup and shutdown against the configured
+            database (superadmin seeding, email filter build, background jobs)
+
+Usage: python benchmark_startup.py [runs]
+"""
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Add parent directory to path
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BASE_DIR)
+
+
+def time_import(runs: int):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "import app.main"], cwd=BASE_DIR, check=True)
+        samples.append(time.perf_counter() - started)
+    # Interpreter start-up alone, to subtract from the import figure
+    baseline = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        baseline.append(time.perf_counter() - started)
+    return samples, baseline
+
+
+def time_create_app(runs: int):
+    from app.main import create_app
+
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        create_app()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+async def time_lifespan(runs: int):
+    from app.main import create_app
+
+    startup, shutdown = [], []
+    for _ in range(runs):
+        app = create_app()
+        started = time.perf_counter()
+        context = app.router.lifespan_context(app)
+        await context.__aenter__()
+        startup.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        await context.__aexit__(None, None, None)
+        shutdown.append(time.perf_counter() - started)
+    return startup, shutdown
+
+
+def report(label: str, samples):
+    ms = [sample * 1000 for sample in samples]
+    print(f"   {label:<22} median {statistics.median(ms):8.1f} ms   min {min(ms):8.1f} ms   max {max(ms):8.1f} ms")
+
+
+def main(runs: int):
+    print(f"\n⏱️  Startup benchmark ({runs} runs each)\n")
+    imports, baseline = time_import(runs)
+    report("interpreter only", baseline)
+    report("import app.main", imports)
+    report("create_app()", time_create_app(runs))
+    startup, shutdown = asyncio.run(time_lifespan(runs))
+    report("lifespan startup", startup)
+    report("lifespan shutdown", shutdown)
+    print()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
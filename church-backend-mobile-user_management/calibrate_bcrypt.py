@@ -0,0 +1,45 @@
+"""
+Benchmark bcrypt on this machine and recommend a work factor.
+Run this once on production hardware; with --write the result is saved to
+.env as BCRYPT_ROUNDS, which every worker then uses. Existing passwords more
+than BCRYPT_ROUNDS_TOLERANCE rounds away are rehashed on the user's next login.
+
+Usage: python calibrate_bcrypt.py [target_ms] [--write]
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.auth.security import benchmark_bcrypt, calibrate_bcrypt_rounds
+from app.config import ENV_FILE, settings
+
+
+def write_env(rounds: int) -> None:
+    """Set BCRYPT_ROUNDS in .env, replacing an existing entry."""
+    lines = ENV_FILE.read_text().splitlines() if ENV_FILE.exists() else []
+    lines = [line for line in lines if not line.strip().startswith("BCRYPT_ROUNDS=")]
+    lines.append(f"BCRYPT_ROUNDS={rounds}")
+    ENV_FILE.write_text("\n".join(lines) + "\n")
+
+
+def main(target_ms: int, write: bool = False):
+    print(f"\n🔍 Benchmarking bcrypt (target: {target_ms} ms per hash)\n")
+    timings = benchmark_bcrypt(target_ms)
+    for rounds, elapsed_ms in timings:
+        print(f"   rounds={rounds:<3} {elapsed_ms:8.1f} ms")
+
+    rounds = calibrate_bcrypt_rounds(target_ms, timings)
+    print(f"\n✅ Recommended setting: BCRYPT_ROUNDS={rounds}")
+    if settings.bcrypt_rounds and settings.bcrypt_rounds != rounds:
+        print(f"   Currently configured: BCRYPT_ROUNDS={settings.bcrypt_rounds}")
+    if write:
+        write_env(rounds)
+        print(f"   Written to {ENV_FILE}; restart the workers to apply it")
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if arg != "--write"]
+    target = int(args[0]) if args else settings.bcrypt_target_ms
+    main(target, write="--write" in sys.argv[1:])
@@ -2,23 +2,25 @@
 Quick script to check user status in database.
 Run this to diagnose login issues.
 """
+import asyncio
 import sys
 import os
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from app.database import SessionLocal
+from sqlalchemy import select
+
+from app.database import SessionLocal, engine
 from app.models.user import User
 from app.models.user_management import UserManagement
 
-def check_user(email: str):
-    db = SessionLocal()
-    try:
+async def check_user(email: str):
+    async with SessionLocal() as db:
         print(f"\n🔍 Checking user: {email}\n")
         
         # Check users table
-        user = db.query(User).filter(User.email == email).first()
+        user = await db.scalar(select(User).where(User.email == email))
         if user:
             print("✅ Found in 'users' table:")
             print(f"   ID: {user.id}")
@@ -31,7 +33,7 @@ def check_user(email: str):
             return
         
         # Check user_management table
-        user_mgmt = db.query(UserManagement).filter(UserManagement.email == email).first()
+        user_mgmt = await db.scalar(select(UserManagement).where(UserManagement.email == email))
         if user_mgmt:
             print("✅ Found in 'user_management' table:")
             print(f"   ID: {user_mgmt.id}")
@@ -48,14 +50,18 @@ def check_user(email: str):
             return
         
         print("❌ User not found in either table")
-        
+
+
+async def main(email: str):
+    try:
+        await check_user(email)
     finally:
-        db.close()
+        await engine.dispose()
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("Usage: python check_user.py <email>")
         sys.exit(1)
     
-    check_user(sys.argv[1])
+    asyncio.run(main(sys.argv[1]))
 
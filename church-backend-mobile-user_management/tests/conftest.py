@@ -0,0 +1,121 @@
+"""
+Test Fixtures
+
+The application reads its settings at import time, so the environment is set
+here, before anything from ``app`` is imported: a throwaway SQLite database
+built by ``AUTO_CREATE_TABLES``, cheap bcrypt hashes, no rate limits
+and the login email filter on (tests run in a single worker).
+"""
+import os
+import tempfile
+import uuid
+
+_DB_DIR = tempfile.mkdtemp(prefix="church-tests-")
+
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{_DB_DIR}/test.db",
+    "JWT_SECRET_KEY": "test-secret-key-test-secret-key-1234",
+    "SMTP_SERVER": "localhost",
+    "SMTP_PORT": "2525",
+    "SMTP_USERNAME": "test",
+    "SMTP_PASSWORD": "test",
+    "FROM_EMAIL": "noreply@example.com",
+    "SUPERADMIN_EMAIL": "super@example.com",
+    "SUPERADMIN_USERNAME": "super",
+    "SUPERADMIN_PASSWORD": "superpass",
+    "AUTO_CREATE_TABLES": "true",
+    "BCRYPT_ROUNDS": "4",
+    "PASSWORD_HASH_WORKERS": "0",
+    "RATE_LIMIT_ENABLED": "false",
+    "EMAIL_FILTER_ENABLED": "true",
+    # Small pool, short wait: a request that needs two connections fails fast
+    "DB_POOL_SIZE": "2",
+    "DB_MAX_OVERFLOW": "0",
+    "DB_POOL_TIMEOUT": "3",
+})
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+import app.database as database
+from app.auth import otp_store
+from app.main import app
+
+OTP = "123456"
+
+
+@pytest.fixture(scope="session")
+def client():
+    """One application (and event loop) for the whole run; the lifespan builds the database."""
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(autouse=True)
+def fixed_otp(monkeypatch):
+    monkeypatch.setattr(otp_store, "generate_otp", lambda: OTP)
+
+
+@pytest.fixture
+def statements():
+    """SQL statements executed on the primary engine while the test runs."""
+    executed = []
+
+    def record(conn, cursor, statement, *args):
+        executed.append(statement)
+
+    sync_engine = database.engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", record)
+    try:
+        yield executed
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", record)
+
+
+def create_admin(client, password="adminpass"):
+    """Sign up and verify a new admin; returns its email."""
+    email = f"admin-{uuid.uuid4().hex[:12]}@example.com"
+    response = client.post("/api/v1/auth/admin/signup", json={
+        "email": email, "first_name": "Test", "last_name": "Admin", "password": password,
+    })
+    assert response.status_code == 201, response.text
+    response = client.post("/api/v1/auth/admin/verify-otp", json={"email": email, "otp_code": OTP})
+    assert response.status_code == 200, response.text
+    return email
+
+
+@pytest.fixture
+def admin(client):
+    """Email, password and access token of a fresh, verified admin."""
+    email = create_admin(client)
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": "adminpass"})
+    assert response.status_code == 200, response.text
+    return {"email": email, "password": "adminpass", "token": response.json()["access_token"]}
+
+
+@pytest.fixture
+def headers(admin):
+    return {"Authorization": f"Bearer {admin['token']}"}
+
+
+@pytest.fixture
+def create_sermon(client, headers):
+    """Factory for sermons owned by the ``admin`` fixture; returns the created sermon."""
+    def create(**fields):
+        body = {
+            "date": "2026-01-04", "speaker": "Speaker", "passage": "John 1:1",
+            "title": "Sermon", "description": "Description", **fields,
+        }
+        response = client.post("/api/v1/sermons/create", json=body, headers=headers)
+        assert response.status_code == 201, response.text
+        return response.json()
+
+    return create
+
+
+@pytest.fixture(scope="session")
+def superadmin_headers(client):
+    response = client.post("/api/v1/auth/superadmin/login", json={"email": "super@example.com", "password": "superpass"})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
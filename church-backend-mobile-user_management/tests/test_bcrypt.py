@@ -0,0 +1,22 @@
+"""bcrypt: work factor calibration and the hashing pool."""
+import os
+
+from app.auth.hashing import PasswordHasher
+from app.auth.security import BCRYPT_MIN_ROUNDS, calibrate_bcrypt_rounds
+
+
+def test_calibration_uses_the_given_timings():
+    timings = [(BCRYPT_MIN_ROUNDS, 60.0), (BCRYPT_MIN_ROUNDS + 1, 120.0), (BCRYPT_MIN_ROUNDS + 2, 240.0)]
+    assert calibrate_bcrypt_rounds(200, timings) == BCRYPT_MIN_ROUNDS + 1
+
+
+def test_calibration_never_goes_below_the_minimum():
+    assert calibrate_bcrypt_rounds(1, [(BCRYPT_MIN_ROUNDS, 5.0)]) == BCRYPT_MIN_ROUNDS
+
+
+def test_hash_pools_share_the_cpus_between_server_workers(monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 8)
+    assert PasswordHasher(workers=None, max_pending=1).workers == 8
+    assert PasswordHasher(workers=None, max_pending=1, server_workers=4).workers == 2
+    assert PasswordHasher(workers=None, max_pending=1, server_workers=16).workers == 1
+    assert PasswordHasher(workers=3, max_pending=1, server_workers=4).workers == 3
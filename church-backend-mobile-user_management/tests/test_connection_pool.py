@@ -0,0 +1,43 @@
+"""Authenticated reads hold at most one pooled connection per request."""
+import asyncio
+
+import httpx
+import pytest
+
+import app.database as database
+from app.auth.cache import principal_cache
+from app.auth.epochs import token_epochs
+from app.main import app
+
+CONCURRENT_REQUESTS = 40
+
+
+async def get_concurrently(path: str, token: str):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        headers = {"Authorization": f"Bearer {token}"}
+        return await asyncio.gather(*(client.get(path, headers=headers) for _ in range(CONCURRENT_REQUESTS)))
+
+
+@pytest.fixture
+def uncached_auth(monkeypatch):
+    """Every request misses both caches, so authentication itself queries the database."""
+    monkeypatch.setattr(principal_cache, "max_entries", 0)
+    monkeypatch.setattr(token_epochs, "ttl_seconds", 0)
+    token_epochs.clear()
+
+
+def test_concurrent_reads_do_not_exhaust_the_pool(client, admin, uncached_auth):
+    responses = client.portal.call(get_concurrently, "/api/v1/sermons/list", admin["token"])
+
+    assert [response.status_code for response in responses] == [200] * CONCURRENT_REQUESTS
+
+
+def test_auth_connection_is_released_before_replica_reads(client, admin, uncached_auth, monkeypatch):
+    # A "replica" sharing the primary's pool: the read session is a second
+    # session, so the authentication session must have let go of its connection
+    monkeypatch.setattr(database, "ReplicaSessionLocals", [database.create_sessionmaker(database.engine)])
+
+    responses = client.portal.call(get_concurrently, "/api/v1/sermons/list", admin["token"])
+
+    assert [response.status_code for response in responses] == [200] * CONCURRENT_REQUESTS
@@ -0,0 +1,52 @@
+"""Single devotional writes check the referenced sermon and answer with what was stored."""
+import uuid
+
+DEVOTIONAL = {"title": "Devotional", "date": "2026-01-05", "passage": "Psalm 23", "leader": "Leader"}
+
+
+def test_create_with_unknown_sermon_is_not_found(client, headers):
+    response = client.post(
+        "/api/v1/devotional/create", json={**DEVOTIONAL, "sermon_id": str(uuid.uuid4())}, headers=headers
+    )
+    assert response.status_code == 404
+
+
+def test_create_returns_the_stored_sermon_id(client, headers, create_sermon):
+    sermon = create_sermon()
+    response = client.post(
+        "/api/v1/devotional/create", json={**DEVOTIONAL, "sermon_id": sermon["id"].upper()}, headers=headers
+    )
+    assert response.status_code == 201, response.text
+    created = response.json()
+
+    stored = client.get(f"/api/v1/devotional/{created['id']}", headers=headers).json()
+    assert created["sermon_id"] == stored["sermon_id"] == sermon["id"]
+
+
+def test_update_with_unknown_sermon_is_not_found(client, headers, create_sermon):
+    sermon = create_sermon()
+    devotional = client.post(
+        "/api/v1/devotional/create", json={**DEVOTIONAL, "sermon_id": sermon["id"]}, headers=headers
+    ).json()
+
+    response = client.put(
+        f"/api/v1/devotional/update/{devotional['id']}", json={"sermon_id": str(uuid.uuid4())}, headers=headers
+    )
+    assert response.status_code == 404
+
+    stored = client.get(f"/api/v1/devotional/{devotional['id']}", headers=headers).json()
+    assert stored["sermon_id"] == sermon["id"]
+
+
+def test_update_returns_the_stored_sermon_id(client, headers, create_sermon):
+    first, second = create_sermon(), create_sermon()
+    devotional = client.post(
+        "/api/v1/devotional/create", json={**DEVOTIONAL, "sermon_id": first["id"]}, headers=headers
+    ).json()
+
+    response = client.put(
+        f"/api/v1/devotional/update/{devotional['id']}", json={"sermon_id": second["id"].upper()}, headers=headers
+    )
+    assert response.status_code == 200, response.text
+    stored = client.get(f"/api/v1/devotional/{devotional['id']}", headers=headers).json()
+    assert response.json()["sermon_id"] == stored["sermon_id"] == second["id"]
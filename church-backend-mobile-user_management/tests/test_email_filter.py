@@ -0,0 +1,60 @@
+"""Login email filter: accounts created by another worker become known on refresh."""
+import uuid
+from datetime import datetime
+
+from sqlalchemy import insert
+
+from app.auth.email_filter import KnownEmails, known_emails
+from app.auth.security import get_password_hash
+from app.database import SessionLocal
+from app.models.user import User
+from app.schemas.enums import UserRole
+
+
+async def insert_elsewhere(email: str) -> None:
+    """Insert an account the way another worker would: this worker's mapper events never see it."""
+    async with SessionLocal() as db:
+        await db.execute(insert(User).values(
+            id=str(uuid.uuid4()),
+            email=email,
+            first_name="Other",
+            last_name="Worker",
+            hashed_password=get_password_hash("otherpass"),
+            role=UserRole.ADMIN,
+            is_active=True,
+            is_verified=True,
+            created_at=datetime.utcnow(),
+        ))
+        await db.commit()
+
+
+def test_refresh_picks_up_accounts_created_elsewhere(client):
+    email = f"elsewhere-{uuid.uuid4().hex[:12]}@example.com"
+    client.portal.call(insert_elsewhere, email)
+    assert not known_emails.might_exist(email)
+
+    assert client.portal.call(known_emails.refresh) >= 1
+
+    assert known_emails.might_exist(email)
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": "otherpass"})
+    assert response.status_code == 200, response.text
+
+
+def test_refresh_reads_only_new_accounts(client, statements):
+    client.portal.call(known_emails.refresh)
+
+    (query,) = statements
+    assert query.count("created_at >") == 2
+
+
+def test_rereading_the_overlap_takes_no_room(client):
+    emails = KnownEmails(capacity=1000, error_rate=0.001)
+    client.portal.call(emails.rebuild)
+    room = emails._room
+    assert emails._seen_until is not None
+
+    # Every account was created within the overlap window, so both refreshes re-read them all
+    assert client.portal.call(emails.refresh) > 0
+    client.portal.call(emails.refresh)
+
+    assert emails._room == room
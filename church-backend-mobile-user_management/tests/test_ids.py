@@ -0,0 +1,60 @@
+"""ID references in request bodies: malformed IDs are rejected, others are compared canonically."""
+DEVOTIONAL = {"title": "Devotional", "date": "2026-01-05", "passage": "Psalm 23", "leader": "Leader"}
+SERIES = {"title": "Series", "from_date": "2026-01-01", "to_date": "2026-02-01", "passage": "John", "description": "D"}
+
+
+def test_devotional_create_rejects_malformed_sermon_id(client, headers):
+    response = client.post("/api/v1/devotional/create", json={**DEVOTIONAL, "sermon_id": "garbage"}, headers=headers)
+    assert response.status_code == 422
+
+
+def test_devotional_update_rejects_malformed_sermon_id(client, headers, create_sermon):
+    sermon = create_sermon()
+    created = client.post("/api/v1/devotional/create", json={**DEVOTIONAL, "sermon_id": sermon["id"]}, headers=headers)
+    assert created.status_code == 201, created.text
+    devotional_id = created.json()["id"]
+
+    response = client.put(f"/api/v1/devotional/update/{devotional_id}", json={"sermon_id": "garbage"}, headers=headers)
+    assert response.status_code == 422
+
+    stored = client.get(f"/api/v1/devotional/{devotional_id}", headers=headers).json()
+    assert stored["sermon_id"] == sermon["id"]
+
+
+def test_series_create_rejects_malformed_sermon_ids(client, headers):
+    response = client.post("/api/v1/series/create", json={**SERIES, "sermons_id": ["garbage"]}, headers=headers)
+    assert response.status_code == 422
+
+
+def test_series_create_links_each_sermon_once(client, headers, create_sermon):
+    sermon = create_sermon()
+    response = client.post(
+        "/api/v1/series/create",
+        json={**SERIES, "sermons_id": [sermon["id"], sermon["id"].upper()]},
+        headers=headers,
+    )
+    assert response.status_code == 201, response.text
+    assert [each["id"] for each in response.json()["sermons"]] == [sermon["id"]]
+
+
+def test_series_membership_is_case_insensitive(client, headers, create_sermon):
+    first, second = create_sermon(), create_sermon()
+    series = client.post("/api/v1/series/create", json={**SERIES, "sermons_id": [first["id"]]}, headers=headers).json()
+
+    # Already a member (spelled differently) and a new sermon given twice
+    response = client.post(
+        f"/api/v1/series/insert/{series['id']}/",
+        json={"sermons_id": [first["id"].upper(), second["id"], second["id"].upper()]},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    assert sorted(each["id"] for each in response.json()["sermons"]) == sorted([first["id"], second["id"]])
+
+    response = client.request(
+        "DELETE",
+        f"/api/v1/series/{series['id']}/sermons",
+        json={"sermons_id": [second["id"].upper(), second["id"]]},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    assert [each["id"] for each in response.json()["sermons"]] == [first["id"]]
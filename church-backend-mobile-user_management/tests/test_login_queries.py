@@ -0,0 +1,32 @@
+"""/auth/login database round trips: one principal query, then the refresh token."""
+import re
+
+from tests.conftest import create_admin
+
+
+def query_count(response) -> int:
+    """Queries the request ran, from the Server-Timing header (app.utils.sql_metrics)."""
+    match = re.search(r'desc="(\d+) queries"', response.headers["server-timing"])
+    return int(match.group(1))
+
+
+def test_login_runs_one_principal_query(client, statements):
+    email = create_admin(client)
+    statements.clear()
+
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": "adminpass"})
+
+    assert response.status_code == 200, response.text
+    assert query_count(response) == 2
+    principal, refresh_token = statements
+    assert principal.lstrip().upper().startswith("SELECT")
+    assert "users" in principal and "user_management" in principal
+    assert refresh_token.lstrip().upper().startswith("INSERT INTO REFRESH_TOKENS")
+
+
+def test_login_unknown_email_runs_no_query(client, statements):
+    response = client.post("/api/v1/auth/login", json={"email": "nobody@example.com", "password": "whatever"})
+
+    assert response.status_code == 401
+    assert query_count(response) == 0
+    assert statements == []
@@ -0,0 +1,61 @@
+"""Keyset pagination: every row on exactly one page, NULL sort keys excluded."""
+import asyncio
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select
+
+from app.models import Devotional
+from app.utils.pagination import PageParams, fetch_page
+from tests.conftest import create_admin
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+
+def all_pages(client, headers, path, limit):
+    seen, cursor = [], None
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        body = client.get(path, params=params, headers=headers).json()
+        seen.extend(item["id"] for item in body["items"])
+        cursor = body["next_cursor"]
+        if not cursor:
+            return seen
+
+
+def test_admin_pages_cover_every_admin(client, superadmin_headers):
+    for _ in range(5):
+        create_admin(client)
+    everyone = [admin["id"] for admin in client.get("/api/v1/superadmin/admins/list", headers=superadmin_headers).json()]
+
+    assert all_pages(client, superadmin_headers, "/api/v1/superadmin/admins/list", limit=2) == everyone
+
+
+def test_nullable_sort_keys_are_rejected():
+    page = PageParams(limit=10, cursor=None)
+    with pytest.raises(ValueError, match="sermon_id"):
+        asyncio.run(fetch_page(None, select(Devotional), (Devotional.sermon_id, Devotional.id), page))
+
+
+def alembic(database: Path, *args):
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{database}"}
+    subprocess.run([sys.executable, "-m", "alembic", *args], cwd=PROJECT_DIR, env=env, check=True, capture_output=True)
+
+
+def test_migration_backfills_null_created_at(tmp_path):
+    database = tmp_path / "migrated.db"
+    alembic(database, "upgrade", "0005")
+    with sqlite3.connect(database) as connection:
+        connection.execute(
+            "INSERT INTO users (id, email, first_name, last_name, hashed_password, role, is_active, is_verified) "
+            "VALUES (randomblob(16), 'legacy@example.com', 'Legacy', 'Admin', 'x', 'ADMIN', 1, 1)"
+        )
+
+    alembic(database, "upgrade", "head")
+
+    with sqlite3.connect(database) as connection:
+        assert connection.execute("SELECT count(*) FROM users WHERE created_at IS NULL").fetchone() == (0,)
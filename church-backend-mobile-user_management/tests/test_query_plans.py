@@ -0,0 +1,177 @@
+"""
+Every list and detail endpoint is served by indexes.
+
+Each GET endpoint is called through the app and every SELECT it issued is run
+again under EXPLAIN QUERY PLAN (with the same parameters). Paginated lists are
+checked on their first page and on the page after it, where the keyset
+condition applies. A plan fails when it reads a whole table without an index
+(a bare ``SCAN <table>``) or sorts in a temporary B-tree instead of reading an
+index in order.
+"""
+import sqlite3
+from datetime import date, timedelta
+from urllib.parse import quote
+
+import pytest
+from sqlalchemy import event, select
+
+from app.auth.security import get_password_hash
+from app.config import settings
+from app.database import SessionLocal, engine
+from app.models import Devotional, Role, Sermon, Series, User, UserManagement
+from app.schemas.enums import UserRole
+
+ADMIN_EMAIL = "plan-check-admin@example.com"
+ADMIN_PASSWORD = "plan-check-password"
+ROWS = 50
+PAGE_SIZE = 10
+
+# (token, path): paths are formatted with the seeded IDs
+PAGINATED = [
+    ("admin", "/api/v1/sermons/list"),
+    ("admin", "/api/v1/series/list"),
+    ("admin", "/api/v1/devotional/list"),
+    ("admin", "/api/v1/user_management/list"),
+    ("admin", "/api/v1/permissions/list"),
+    ("superadmin", "/api/v1/superadmin/admins/list"),
+]
+ENDPOINTS = [(token, f"{path}?limit={PAGE_SIZE}") for token, path in PAGINATED] + [
+    ("admin", "/api/v1/sermons/list"),
+    ("admin", "/api/v1/sermons/count"),
+    ("admin", "/api/v1/sermons/{sermon}"),
+    ("admin", "/api/v1/sermons/{sermon}/existing-series"),
+    ("admin", "/api/v1/series/list"),
+    ("admin", "/api/v1/series/count"),
+    ("admin", "/api/v1/series/{series}"),
+    ("admin", "/api/v1/series/{series}/sermons"),
+    ("admin", "/api/v1/devotional/list"),
+    ("admin", "/api/v1/devotional/count"),
+    ("admin", "/api/v1/user_management/list"),
+    ("admin", f"/api/v1/user_management/list/{UserRole.PASTOR_STAFF.value}"),
+    ("admin", "/api/v1/user_management/{member}"),
+    ("admin", "/api/v1/permissions/list"),
+    ("admin", "/api/v1/permissions/list/{member}"),
+    ("admin", f"/api/v1/permissions/by-role/{UserRole.PASTOR_STAFF.value}"),
+    ("superadmin", "/api/v1/superadmin/admins/list"),
+    ("superadmin", "/api/v1/superadmin/admins/count"),
+]
+
+
+async def seed() -> dict:
+    async with SessionLocal() as db:
+        admin = User(
+            email=ADMIN_EMAIL, first_name="Plan", last_name="Check",
+            hashed_password=get_password_hash(ADMIN_PASSWORD), role=UserRole.ADMIN,
+            is_active=True, is_verified=True,
+        )
+        db.add(admin)
+        await db.flush()
+
+        sermons = [
+            Sermon(date=date(2024, 1, 7) + timedelta(days=7 * n), speaker="Speaker", passage="John 1",
+                   title=f"Sermon {n}", description="Plan check", created_by_id=admin.id)
+            for n in range(ROWS)
+        ]
+        db.add_all(sermons)
+        series = [
+            Series(title=f"Series {n}", from_date=date(2024, 1, 1) + timedelta(days=30 * n),
+                   to_date=date(2024, 1, 29) + timedelta(days=30 * n), passage="John",
+                   description="Plan check", created_by_id=admin.id, sermons=sermons[n::10])
+            for n in range(ROWS // 5)
+        ]
+        db.add_all(series)
+        db.add_all(
+            Devotional(title=f"Devotional {n}", date=date(2024, 1, 1) + timedelta(days=n), passage="Psalm 1",
+                       leader="Leader", sermon_id=sermons[n].id, created_by_id=admin.id)
+            for n in range(ROWS)
+        )
+        if not await db.scalar(select(Role.id).where(Role.role == UserRole.PASTOR_STAFF)):
+            db.add(Role(role=UserRole.PASTOR_STAFF, permissions='["sermons:write"]', is_active=True))
+        members = [
+            UserManagement(first_name="Member", last_name=str(n), email=f"plan-member{n}@example.com",
+                           role=UserRole.PASTOR_STAFF if n % 2 else UserRole.TEACHING_TEAM, is_active=True)
+            for n in range(ROWS)
+        ]
+        db.add_all(members)
+        await db.commit()
+        return {"sermon": sermons[0].id, "series": series[0].id, "member": members[0].id}
+
+
+@pytest.fixture(scope="module")
+def seeded(client):
+    """Seeded IDs and a bearer header per token name."""
+    # Seed on the app's event loop, where the engine's connections live
+    ids = client.portal.call(seed)
+    logins = {
+        "admin": client.post("/api/v1/auth/login", json={"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD}),
+        "superadmin": client.post(
+            "/api/v1/auth/superadmin/login",
+            json={"email": settings.superadmin_email, "password": settings.superadmin_password},
+        ),
+    }
+    headers = {}
+    for name, response in logins.items():
+        assert response.status_code == 200, f"{name} login failed: {response.text}"
+        headers[name] = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return ids, headers
+
+
+@pytest.fixture(scope="module")
+def explain(seeded):
+    """EXPLAIN QUERY PLAN on a separate connection to the test database, with fresh statistics."""
+    connection = sqlite3.connect(engine.url.database)
+    connection.execute("ANALYZE")
+    yield lambda statement, parameters: connection.execute("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+    connection.close()
+
+
+@pytest.fixture
+def selects():
+    """(statement, parameters) of the SELECTs run on the primary engine during the test."""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        yield captured
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+
+def plan_problems(plan) -> list:
+    problems = []
+    for row in plan:
+        detail = row[-1]
+        if detail.startswith("SCAN ") and " USING " not in detail and "CONSTANT ROW" not in detail:
+            problems.append(detail)
+        # Also catches "RIGHT PART OF" / "LAST TERM OF ORDER BY": a partial sort
+        if "USE TEMP B-TREE FOR" in detail and "ORDER BY" in detail:
+            problems.append(detail)
+    return problems
+
+
+@pytest.mark.parametrize("token, path", ENDPOINTS, ids=[path for _, path in ENDPOINTS])
+def test_endpoint_plans_use_indexes(client, seeded, explain, selects, token, path):
+    ids, headers = seeded
+    pages = [path.format(**ids)]
+    problems = {}
+    while pages:
+        page = pages.pop()
+        selects.clear()
+        response = client.get(page, headers=headers[token])
+        assert response.status_code == 200, f"GET {page}: {response.text}"
+
+        for statement, parameters in selects:
+            found = plan_problems(explain(statement, parameters))
+            if found:
+                problems[" ".join(statement.split())] = found
+
+        # Follow one cursor: the second page is where the keyset condition applies
+        body = response.json()
+        if "cursor=" not in page and isinstance(body, dict) and body.get("next_cursor"):
+            pages.append(f"{page}&cursor={quote(body['next_cursor'])}")
+
+    assert problems == {}
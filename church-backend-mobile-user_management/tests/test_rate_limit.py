@@ -0,0 +1,37 @@
+"""In-memory token buckets."""
+import asyncio
+
+from app.auth.rate_limit import Limit, MemoryBackend
+
+LIMIT = Limit(burst=2, per_minute=1)
+
+
+def acquire(backend, key):
+    return asyncio.run(backend.acquire(key, LIMIT))
+
+
+def test_bucket_allows_burst_then_waits():
+    backend = MemoryBackend(shards=1)
+    assert acquire(backend, "ip:1") == 0
+    assert acquire(backend, "ip:1") == 0
+    assert acquire(backend, "ip:1") > 0
+
+
+def test_full_shard_evicts_least_recently_used():
+    backend = MemoryBackend(shards=1, max_entries_per_shard=3)
+    for key in ("a", "b", "c"):
+        acquire(backend, key)
+    acquire(backend, "a")  # most recently used again
+    acquire(backend, "d")  # evicts "b"
+
+    (_, buckets), = backend._shards
+    assert list(buckets) == ["c", "a", "d"]
+
+
+def test_rotating_keys_stay_within_the_shard_limit():
+    backend = MemoryBackend(shards=1, max_entries_per_shard=100)
+    for n in range(1000):
+        acquire(backend, f"email:{n}@example.com")
+
+    (_, buckets), = backend._shards
+    assert len(buckets) == 100
@@ -0,0 +1,20 @@
+"""Series write responses match what a later read returns."""
+SERIES = {"title": "Series", "from_date": "2026-01-01", "to_date": "2026-02-01", "passage": "John", "description": "D"}
+
+
+def test_create_and_update_responses_match_get(client, headers, create_sermon):
+    sermon = create_sermon()
+    created = client.post("/api/v1/series/create", json={**SERIES, "sermons_id": [sermon["id"]]}, headers=headers)
+    assert created.status_code == 201, created.text
+    series_id = created.json()["id"]
+
+    stored = client.get(f"/api/v1/series/{series_id}", headers=headers).json()
+    for field in ("created_at", "updated_at"):
+        assert created.json()[field] == stored[field]
+
+    updated = client.put(f"/api/v1/series/update/{series_id}", json={"title": "Renamed"}, headers=headers)
+    assert updated.status_code == 200, updated.text
+
+    stored = client.get(f"/api/v1/series/{series_id}", headers=headers).json()
+    for field in ("created_at", "updated_at"):
+        assert updated.json()[field] == stored[field]
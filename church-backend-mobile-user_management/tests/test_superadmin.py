@@ -0,0 +1,38 @@
+"""Superadmin management of admins by their (UUID) IDs."""
+from tests.conftest import create_admin
+
+
+def find_admin(client, superadmin_headers, email):
+    admins = client.get("/api/v1/superadmin/admins/list", headers=superadmin_headers).json()
+    return next(admin for admin in admins if admin["email"] == email)
+
+
+def test_get_update_and_delete_admin_by_id(client, superadmin_headers):
+    email = create_admin(client)
+    admin_id = find_admin(client, superadmin_headers, email)["id"]
+
+    response = client.get(f"/api/v1/superadmin/admins/{admin_id}", headers=superadmin_headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["email"] == email
+
+    response = client.put(
+        f"/api/v1/superadmin/admins/update/{admin_id}", json={"first_name": "Renamed"}, headers=superadmin_headers
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["first_name"] == "Renamed"
+
+    response = client.delete(f"/api/v1/superadmin/admins/delete/{admin_id}", headers=superadmin_headers)
+    assert response.status_code == 204, response.text
+    response = client.get(f"/api/v1/superadmin/admins/{admin_id}", headers=superadmin_headers)
+    assert response.status_code == 404
+
+
+def test_deleted_admin_token_is_rejected(client, superadmin_headers, admin):
+    admin_id = find_admin(client, superadmin_headers, admin["email"])["id"]
+    admin_headers = {"Authorization": f"Bearer {admin['token']}"}
+    assert client.get("/api/v1/sermons/list", headers=admin_headers).status_code == 200
+
+    response = client.delete(f"/api/v1/superadmin/admins/delete/{admin_id}", headers=superadmin_headers)
+    assert response.status_code == 204, response.text
+
+    assert client.get("/api/v1/sermons/list", headers=admin_headers).status_code == 401